@@ -2,19 +2,41 @@ import os
 import httpx
 
 BASE_URL = os.getenv("FITWIN_API_URL", "http://127.0.0.1:8000")
+API_KEY = os.getenv("X_API_KEY", "staging-secret-key")
+
+# Last (etag, payload) from /dmaas/latest; polls send the ETag and reuse the
+# payload on 304 Not Modified.
+_latest = {"etag": None, "payload": None}
 
 def dmaas_latest() -> dict:
     """Fetch latest DMAAS payload from the running FastAPI service."""
+    headers = {"X-API-Key": API_KEY}
+    if _latest["etag"]:
+        headers["If-None-Match"] = _latest["etag"]
     with httpx.Client(timeout=10.0) as c:
-        r = c.get(f"{BASE_URL}/dmaas/latest")
+        r = c.get(f"{BASE_URL}/dmaas/latest", headers=headers)
+        if r.status_code == 304:
+            return _latest["payload"]
         r.raise_for_status()
-        return r.json()
+        payload = r.json()
+        _latest.update(etag=r.headers.get("ETag"), payload=payload)
+        return payload
 import os, httpx
 
 BASE_URL = os.getenv("FITWIN_API_URL", "http://127.0.0.1:8000")
+API_KEY = os.getenv("X_API_KEY", "staging-secret-key")
+
+_latest = {"etag": None, "payload": None}
 
 def dmaas_latest() -> dict:
+    headers = {"X-API-Key": API_KEY}
+    if _latest["etag"]:
+        headers["If-None-Match"] = _latest["etag"]
     with httpx.Client(timeout=10.0) as c:
-        r = c.get(f"{BASE_URL}/dmaas/latest")
+        r = c.get(f"{BASE_URL}/dmaas/latest", headers=headers)
+        if r.status_code == 304:
+            return _latest["payload"]
         r.raise_for_status()
-        return r.json()
+        payload = r.json()
+        _latest.update(etag=r.headers.get("ETag"), payload=payload)
+        return payload
@@ -14,6 +14,7 @@ logic as recommended by ChatGPT for robust agent-backend integration.
 
 import os
 import time
+import uuid
 from typing import Dict
 
 import requests
@@ -64,10 +65,17 @@ class CircuitBreaker:
 
 validate_breaker = CircuitBreaker()
 recommend_breaker = CircuitBreaker()
+validate_and_recommend_breaker = CircuitBreaker()
 
 
 def _post_with_retry(url: str, payload: Dict, breaker: CircuitBreaker) -> requests.Response:
-    headers = {"X-API-Key": API_KEY, "Content-Type": "application/json"}
+    # One Idempotency-Key per logical call so the backend replays (rather than
+    # recomputes) when a retry follows a timeout.
+    headers = {
+        "X-API-Key": API_KEY,
+        "Content-Type": "application/json",
+        "Idempotency-Key": str(uuid.uuid4()),
+    }
     last_error: Exception | None = None
 
     for attempt in range(MAX_RETRIES + 1):
@@ -197,3 +205,60 @@ def recommend_sizes(normalized_measurements: Dict) -> Dict:
         "type": "unexpected_error",
     }
 
+
+@tool("validate_and_recommend")
+def validate_and_recommend(measurement_data: Dict) -> Dict:
+    """Validate raw measurements and recommend sizes in a single backend call.
+
+    Prefer this over ``validate_measurements`` followed by ``recommend_sizes``:
+    the backend hands the normalized measurements straight to the recommender,
+    so there is one round trip and no re-parse. The normalized measurements
+    are returned under ``processed_measurements``.
+    """
+
+    if not validate_and_recommend_breaker.can_proceed():
+        return {
+            "error": "Circuit breaker is open. Too many recent failures.",
+            "type": "circuit_breaker_error",
+        }
+
+    url = f"{API_BASE_URL}/measurements/validate-and-recommend"
+
+    try:
+        response = _post_with_retry(url, measurement_data, validate_and_recommend_breaker)
+    except requests.exceptions.Timeout:
+        validate_and_recommend_breaker.call_failed()
+        return {"error": "Request timed out", "type": "timeout_error"}
+    except requests.exceptions.RequestException as exc:
+        validate_and_recommend_breaker.call_failed()
+        return {"error": f"Request failed: {exc}", "type": "connection_error"}
+
+    if response.status_code == 200:
+        validate_and_recommend_breaker.call_succeeded()
+        return response.json()
+
+    if response.status_code == 422:
+        validate_and_recommend_breaker.call_succeeded()
+        return {"error": response.json().get("detail", {}), "status_code": 422}
+
+    if response.status_code in {500, 502, 503, 504}:
+        validate_and_recommend_breaker.call_failed()
+        return {
+            "error": f"Server error after {MAX_RETRIES + 1} attempts",
+            "status_code": response.status_code,
+            "type": "server_error",
+        }
+
+    if response.status_code == 429:
+        return {
+            "error": "Rate limit exceeded",
+            "status_code": 429,
+            "type": "rate_limit_error",
+        }
+
+    validate_and_recommend_breaker.call_failed()
+    return {
+        "error": f"Unexpected status code: {response.status_code}",
+        "status_code": response.status_code,
+        "type": "unexpected_error",
+    }
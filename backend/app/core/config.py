@@ -5,6 +5,79 @@ from dataclasses import dataclass
 class Settings:
     env: str = os.getenv("ENV", "dev")
     vendor_mode: str = os.getenv("VENDOR_MODE", "stub")
+    # Calibration vendor API (GET /v1/measurements/{session_id}); empty disables
+    vendor_api_url: str = os.getenv("VENDOR_API_URL", "")
+    vendor_api_key: str = os.getenv("VENDOR_API_KEY", "")
+    vendor_name: str = os.getenv("VENDOR_NAME", "vendor")
+    # Concurrent vendor calls (and pooled connections), per-call timeout and price
+    vendor_max_concurrency: int = int(os.getenv("VENDOR_MAX_CONCURRENCY", "8"))
+    vendor_timeout_seconds: float = float(os.getenv("VENDOR_TIMEOUT_SECONDS", "30"))
+    vendor_cost_per_call_usd: float = float(os.getenv("VENDOR_COST_PER_CALL_USD", "0"))
+    # Content-addressed cache in front of normalize_and_validate
+    result_cache_size: int = int(os.getenv("RESULT_CACHE_SIZE", "4096"))
+    result_cache_ttl_seconds: float = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "600"))
+    # Completed responses replayed for retried Idempotency-Key headers
+    idempotency_cache_size: int = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+    idempotency_ttl_seconds: float = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "3600"))
+    # Worker pool for landmark math ("thread" or "process") and its admission queue
+    compute_executor: str = os.getenv("COMPUTE_EXECUTOR", "thread")
+    compute_workers: int = int(os.getenv("COMPUTE_WORKERS", str(min(4, os.cpu_count() or 1))))
+    compute_queue_size: int = int(os.getenv("COMPUTE_QUEUE_SIZE", "64"))
+    # /measurements/stream publishes once the relative standard error settles
+    stream_min_frames: int = int(os.getenv("STREAM_MIN_FRAMES", "5"))
+    stream_convergence_tolerance: float = float(
+        os.getenv("STREAM_CONVERGENCE_TOLERANCE", "0.01")
+    )
+    # ...or the standard error is below this many centimeters (for means near zero)
+    stream_convergence_floor_cm: float = float(os.getenv("STREAM_CONVERGENCE_FLOOR_CM", "0.05"))
+    # Directory of size chart JSON files (defaults to backend/app/data/size_charts)
+    size_chart_dir: str = os.getenv("SIZE_CHART_DIR", "")
+    # Garment catalog scored by /measurements/recommend and how many SKUs to return
+    catalog_path: str = os.getenv("CATALOG_PATH", "")
+    recommend_top_k: int = int(os.getenv("RECOMMEND_TOP_K", "5"))
+    # Declarative fit-note rules (defaults to backend/app/data/fit_notes/default.json)
+    fit_notes_path: str = os.getenv("FIT_NOTES_PATH", "")
+    # Seconds between checks for changed charts/catalog/fit notes (0 disables)
+    reference_reload_interval_seconds: float = float(
+        os.getenv("REFERENCE_RELOAD_INTERVAL_SECONDS", "30")
+    )
+    # Catalog recommendations cached per body-measurement bucket of this width
+    recommend_cache_size: int = int(os.getenv("RECOMMEND_CACHE_SIZE", "4096"))
+    recommend_cache_step_cm: float = float(os.getenv("RECOMMEND_CACHE_STEP_CM", "0.5"))
+    # Profiles scored per vectorized pass by /measurements/recommend/bulk
+    recommend_bulk_chunk_size: int = int(os.getenv("RECOMMEND_BULK_CHUNK_SIZE", "256"))
+    # Longest NDJSON line /measurements/recommend/bulk buffers before rejecting it
+    recommend_bulk_max_line_bytes: int = int(
+        os.getenv("RECOMMEND_BULK_MAX_LINE_BYTES", "65536")
+    )
+    # Nearest-neighbor fit history: optional JSONL seed, vote size, buffer size
+    fit_history_path: str = os.getenv("FIT_HISTORY_PATH", "")
+    fit_index_neighbors: int = int(os.getenv("FIT_INDEX_NEIGHBORS", "15"))
+    fit_index_compact_threshold: int = int(os.getenv("FIT_INDEX_COMPACT_THRESHOLD", "1024"))
+    # Sessions whose latest normalized result GET /dmaas/latest can serve
+    latest_results_size: int = int(os.getenv("LATEST_RESULTS_SIZE", "10000"))
+    # Provenance database (postgresql://... or sqlite:///path.db; empty disables)
+    database_url: str = os.getenv("DATABASE_URL", "")
+    # Shared connection pool: max/min connections and waits/timeouts in seconds
+    database_pool_size: int = int(os.getenv("DATABASE_POOL_SIZE", "4"))
+    database_pool_min_size: int = int(os.getenv("DATABASE_POOL_MIN_SIZE", "1"))
+    database_acquire_timeout_seconds: float = float(
+        os.getenv("DATABASE_ACQUIRE_TIMEOUT_SECONDS", "5")
+    )
+    database_query_timeout_seconds: float = float(
+        os.getenv("DATABASE_QUERY_TIMEOUT_SECONDS", "10")
+    )
+    database_statement_cache_size: int = int(os.getenv("DATABASE_STATEMENT_CACHE_SIZE", "128"))
+    # Seconds between background database readiness checks served by /health
+    database_health_interval_seconds: float = float(
+        os.getenv("DATABASE_HEALTH_INTERVAL_SECONDS", "15")
+    )
+    # Write-behind provenance queue: rows per batch, max wait, queued sessions
+    provenance_batch_size: int = int(os.getenv("PROVENANCE_BATCH_SIZE", "100"))
+    provenance_flush_interval_seconds: float = float(
+        os.getenv("PROVENANCE_FLUSH_INTERVAL_SECONDS", "1.0")
+    )
+    provenance_queue_size: int = int(os.getenv("PROVENANCE_QUEUE_SIZE", "10000"))
 
 
 settings = Settings()
@@ -0,0 +1,373 @@
+"""Shared pooled database access and the cached readiness probe.
+
+``database`` is the one ``ConnectionPool`` that every in-process persistence
+path borrows connections from: the provenance writer and the vendor response
+cache. Offline jobs build their own pool with ``connection_pool``.
+
+The pool opens connections on demand up to ``DATABASE_POOL_SIZE``, and
+``warm()`` pre-opens ``DATABASE_POOL_MIN_SIZE`` of them. Waiting for a free
+connection is bounded by ``DATABASE_ACQUIRE_TIMEOUT_SECONDS`` (``PoolTimeout``).
+Each statement is bounded by ``DATABASE_QUERY_TIMEOUT_SECONDS``, which is
+Postgres ``statement_timeout`` or the SQLite busy timeout. SQLite connections
+keep ``DATABASE_STATEMENT_CACHE_SIZE`` compiled statements each. psycopg2 has
+no client-side statement cache, so on Postgres pooled connections simply reuse
+their server sessions. Acquisitions, wait times and utilization are reported
+in ``stats()``.
+
+Coroutines use ``await pool.run(fn)``: ``fn(connection)`` runs on a worker
+thread inside one transaction, so the event loop never blocks on the driver.
+
+``DatabaseHealth`` runs ``select 1`` every ``DATABASE_HEALTH_INTERVAL_SECONDS``
+from a lifespan task. ``/health`` only reads the cached result, so probes
+never add database load.
+
+``DATABASE_URL`` selects the backend: ``postgresql://...`` uses psycopg2 (an
+optional dependency), ``sqlite:///path.db`` is a local stand-in that creates
+the provenance tables on first use. Without ``DATABASE_URL`` nothing is
+persisted and ``database`` is ``None``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+from backend.app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# SQLite stand-in for the tables in data/supabase/migrations (002-006).
+SQLITE_SCHEMA = """
+create table if not exists measurement_sessions (
+    id text primary key default (lower(hex(randomblob(16)))),
+    session_id text unique not null,
+    source_type text default 'mediapipe_web',
+    platform text default 'web_mobile',
+    device_id text,
+    front_photo_url text,
+    side_photo_url text,
+    created_at text default current_timestamp
+);
+create table if not exists mediapipe_landmarks (
+    id text primary key default (lower(hex(randomblob(16)))),
+    session_id text not null references measurement_sessions(session_id) on delete cascade,
+    view text not null check (view in ('front', 'side')),
+    landmarks text,
+    landmarks_f32 blob check (landmarks_f32 is null or length(landmarks_f32) % 16 = 0),
+    image_width integer,
+    image_height integer,
+    timestamp text,
+    created_at text default current_timestamp,
+    check (landmarks is not null or landmarks_f32 is not null)
+);
+create table if not exists normalized_measurements (
+    id text primary key default (lower(hex(randomblob(16)))),
+    session_id text not null references measurement_sessions(session_id) on delete cascade,
+    payload text not null,
+    source text default 'mediapipe',
+    model_version text default 'v1.0-mediapipe',
+    confidence numeric,
+    accuracy_estimate numeric,
+    created_at text default current_timestamp
+);
+create table if not exists measurements_vendor (
+    id text primary key default (lower(hex(randomblob(16)))),
+    session_id text not null,
+    vendor_name text not null,
+    vendor_version text,
+    measurements text not null,
+    confidence real,
+    cost_usd real,
+    called_at text default current_timestamp,
+    used_for_calibration integer default 1,
+    excluded_from_live integer default 1
+);
+create unique index if not exists idx_measurements_vendor_session_vendor
+    on measurements_vendor (session_id, vendor_name);
+create table if not exists measurement_replays (
+    model_version text primary key,
+    last_session_id text not null,
+    sessions integer not null default 0,
+    updated_at text default current_timestamp
+);
+"""
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection frees up within the acquire timeout."""
+
+
+class ConnectionPool:
+    """Bounded pool of DB-API connections with wait-time accounting."""
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        max_size: int,
+        placeholder: str,
+        named_cursors: bool = False,
+        min_size: int = 0,
+        acquire_timeout: Optional[float] = None,
+        dialect: str = "sqlite",
+    ) -> None:
+        self._connect = connect
+        self.dialect = dialect
+        self.placeholder = placeholder
+        self.named_cursors = named_cursors
+        self.max_size = max(1, max_size)
+        self.min_size = min(min_size, self.max_size)
+        self.acquire_timeout = acquire_timeout
+        self._idle: "queue.LifoQueue" = queue.LifoQueue(maxsize=self.max_size)
+        self._slots = threading.Semaphore(self.max_size)
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.in_use = 0
+        self.acquisitions = 0
+        self.timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _open(self):
+        connection = self._connect()
+        with self._lock:
+            self.opened += 1
+        return connection
+
+    def warm(self) -> None:
+        """Open idle connections until ``min_size`` exist."""
+
+        while self.opened < self.min_size and not self._idle.full():
+            self._idle.put_nowait(self._open())
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Borrow a connection, opening one if none is idle.
+
+        Raises:
+            PoolTimeout: If every connection stays busy past the timeout
+        """
+
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=timeout):
+            with self._lock:
+                self.timeouts += 1
+            raise PoolTimeout(f"no database connection free within {timeout}s")
+        waited = time.perf_counter() - started
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            try:
+                connection = self._open()
+            except Exception:
+                self._slots.release()
+                raise
+        with self._lock:
+            self.in_use += 1
+            self.acquisitions += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return connection
+
+    def release(self, connection, broken: bool = False) -> None:
+        if broken:
+            try:
+                connection.close()
+            except Exception:  # pragma: no cover - best effort
+                pass
+            with self._lock:
+                self.opened -= 1
+        else:
+            self._idle.put_nowait(connection)
+        with self._lock:
+            self.in_use -= 1
+        self._slots.release()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """Borrowed connection whose work is committed, or rolled back on error."""
+
+        connection = self.acquire(timeout)
+        broken = False
+        try:
+            yield connection
+            connection.commit()
+        except BaseException:
+            try:
+                connection.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            self.release(connection, broken=broken)
+
+    async def run(self, fn: Callable[[Any], Any], timeout: Optional[float] = None) -> Any:
+        """Run ``fn(connection)`` in one transaction on a worker thread."""
+
+        def call():
+            with self.connection(timeout) as connection:
+                return fn(connection)
+
+        return await asyncio.to_thread(call)
+
+    def streaming_cursor(self, connection, name: str, fetch_size: int):
+        """Cursor that fetches rows in ``fetch_size`` chunks as they are read.
+
+        On Postgres this is a server-side (named) cursor, so large scans never
+        materialize in the client; SQLite cursors already step lazily.
+        """
+
+        if self.named_cursors:
+            cursor = connection.cursor(name=name)
+            cursor.itersize = fetch_size
+            return cursor
+        cursor = connection.cursor()
+        cursor.arraysize = fetch_size
+        return cursor
+
+    def close(self) -> None:
+        while True:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            connection.close()
+            with self._lock:
+                self.opened -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            acquisitions = self.acquisitions
+            return {
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+                "open": self.opened,
+                "in_use": self.in_use,
+                "utilization": self.in_use / self.max_size,
+                "acquisitions": acquisitions,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": 1000 * self._wait_total / acquisitions if acquisitions else 0.0,
+                "wait_max_ms": 1000 * self._wait_max,
+            }
+
+
+def connection_pool(
+    database_url: str,
+    max_size: int,
+    min_size: int = 0,
+    acquire_timeout: Optional[float] = None,
+    query_timeout: Optional[float] = None,
+    statement_cache_size: int = 128,
+) -> ConnectionPool:
+    """Pool for a ``sqlite:///`` or ``postgresql://`` URL.
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+
+    options = {"min_size": min_size, "acquire_timeout": acquire_timeout}
+
+    if database_url.startswith("sqlite:///"):
+        path = database_url[len("sqlite:///"):]
+
+        def connect():
+            connection = sqlite3.connect(
+                path,
+                check_same_thread=False,
+                timeout=query_timeout or 5.0,
+                cached_statements=statement_cache_size,
+            )
+            connection.execute("pragma foreign_keys = on")
+            # WAL lets long replay scans read while batches are committed.
+            connection.execute("pragma journal_mode = wal")
+            connection.executescript(SQLITE_SCHEMA)
+            return connection
+
+        return ConnectionPool(connect, max_size, "?", **options)
+
+    if database_url.startswith(("postgres://", "postgresql://")):
+        import psycopg2  # optional dependency, only needed for Postgres
+
+        connect_options = {}
+        if query_timeout:
+            connect_options["options"] = f"-c statement_timeout={int(query_timeout * 1000)}"
+        return ConnectionPool(
+            lambda: psycopg2.connect(database_url, **connect_options),
+            max_size,
+            "%s",
+            named_cursors=True,
+            dialect="postgresql",
+            **options,
+        )
+
+    raise ValueError(f"unsupported DATABASE_URL scheme: {database_url.split(':', 1)[0]}")
+
+
+class DatabaseHealth:
+    """Latest result of a periodic ``select 1`` against the pool."""
+
+    def __init__(self, pool: Optional[ConnectionPool], timeout: float = 2.0) -> None:
+        self.pool = pool
+        self.timeout = timeout
+        self.status = "not_configured" if pool is None else "unknown"
+        self.latency_ms: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def check(self) -> str:
+        """Probe the database once and cache the outcome."""
+
+        if self.pool is None:
+            return self.status
+        started = time.perf_counter()
+        try:
+            self.pool.warm()
+            with self.pool.connection(self.timeout) as connection:
+                cursor = connection.cursor()
+                cursor.execute("select 1")
+                cursor.fetchone()
+        except Exception as exc:
+            if self.status != "unavailable":
+                logger.warning("database readiness check failed: %s", exc)
+            self.status = "unavailable"
+            self.error = f"{type(exc).__name__}: {exc}"
+        else:
+            self.status = "connected"
+            self.error = None
+        self.latency_ms = 1000 * (time.perf_counter() - started)
+        self.checked_at = time.time()
+        return self.status
+
+    async def watch(self, interval_seconds: float) -> None:
+        """Re-check every ``interval_seconds`` until cancelled."""
+
+        while True:
+            await asyncio.to_thread(self.check)
+            await asyncio.sleep(interval_seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            "status": self.status,
+            "latency_ms": self.latency_ms,
+            "checked_at": self.checked_at,
+            "error": self.error,
+        }
+
+
+database: Optional[ConnectionPool] = None
+if settings.database_url:
+    database = connection_pool(
+        settings.database_url,
+        settings.database_pool_size,
+        min_size=settings.database_pool_min_size,
+        acquire_timeout=settings.database_acquire_timeout_seconds,
+        query_timeout=settings.database_query_timeout_seconds,
+        statement_cache_size=settings.database_statement_cache_size,
+    )
+database_health = DatabaseHealth(database)
@@ -0,0 +1,131 @@
+"""Bounded worker pool for CPU-bound measurement math.
+
+Keeps landmark computation off the event loop so one slow payload does not
+stall every other request on the worker. Admission is bounded: once all
+workers are busy and ``max_queue`` submissions are waiting, new work is
+rejected immediately with ``ExecutorSaturated`` so the API can shed load
+with a 503 instead of letting latency grow without limit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from backend.app.core.config import settings
+
+
+EXECUTOR_KINDS = ("thread", "process")
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the pool and its queue are both full."""
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("compute executor saturated")
+        self.retry_after = retry_after
+
+
+def _timed_call(submitted_at: float, fn: Callable, args: tuple) -> tuple:
+    """Run ``fn`` in the worker and report how long it waited to start.
+
+    Wall-clock time is used because process workers do not share a
+    monotonic clock with the parent.
+    """
+
+    started_at = time.time()
+    return started_at - submitted_at, fn(*args)
+
+
+class BoundedExecutor:
+    """Thread or process pool with bounded admission and wait-time metrics."""
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_queue: int = 64,
+        retry_after_seconds: int = 1,
+    ) -> None:
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"executor kind must be one of {EXECUTOR_KINDS}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after_seconds = retry_after_seconds
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            pool_cls = ThreadPoolExecutor if self.kind == "thread" else ProcessPoolExecutor
+            self._pool = pool_cls(max_workers=self.max_workers)
+        return self._pool
+
+    async def run(self, fn: Callable, *args: Any) -> Any:
+        """Run ``fn(*args)`` in the pool, or raise ``ExecutorSaturated``.
+
+        With a process pool ``fn`` and ``args`` must be picklable.
+        """
+
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturated(self.retry_after_seconds)
+            self._pending += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            waited, result = await loop.run_in_executor(
+                self._executor(), _timed_call, time.time(), fn, args
+            )
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+        waited = max(waited, 0.0)
+        with self._lock:
+            self.completed += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the pool; a later ``run`` starts a fresh one."""
+
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        """Queue depth, rejections and wait-time accounting for ``/metrics``."""
+
+        with self._lock:
+            pending = self._pending
+            average = self._wait_total / self.completed if self.completed else 0.0
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": min(pending, self.max_workers),
+                "queue_depth": max(pending - self.max_workers, 0),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_ms_avg": round(average * 1000, 3),
+                "wait_ms_max": round(self._wait_max * 1000, 3),
+            }
+
+
+compute_executor = BoundedExecutor(
+    kind=settings.compute_executor,
+    max_workers=settings.compute_workers,
+    max_queue=settings.compute_queue_size,
+)
@@ -0,0 +1,104 @@
+"""Idempotency-Key support with single-flight deduplication.
+
+Completed responses are kept in a bounded TTL cache and replayed for retried
+keys. Concurrent requests that share a key await the first request's
+computation instead of repeating it. State is per worker process, which
+covers client retries that land on the same worker; cross-worker dedup needs a
+shared store.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from backend.app.core.cache import TTLCache
+from backend.app.core.config import settings
+
+
+class IdempotencyConflict(Exception):
+    """Raised when a key is reused with a different request payload."""
+
+
+class IdempotencyStore:
+    """Replay completed results and coalesce in-flight work per key."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self._completed = TTLCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+        self._inflight: Dict[str, Tuple[str, asyncio.Future]] = {}
+        self.replays = 0
+        self.coalesced = 0
+
+    async def run(
+        self,
+        key: str,
+        fingerprint: str,
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Tuple[Any, bool]:
+        """Return ``(result, replayed)`` for ``key``, computing at most once.
+
+        Failures are not stored: waiters coalesced onto a failing computation
+        receive the same exception and a later retry computes afresh.
+
+        Raises:
+            IdempotencyConflict: If ``key`` was used with another fingerprint
+        """
+
+        while True:
+            completed = self._completed.get(key)
+            if completed is not None:
+                stored_fingerprint, value = completed
+                if stored_fingerprint != fingerprint:
+                    raise IdempotencyConflict(key)
+                self.replays += 1
+                return value, True
+
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            stored_fingerprint, future = inflight
+            if stored_fingerprint != fingerprint:
+                raise IdempotencyConflict(key)
+            try:
+                value = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # The leading request was abandoned; take over the work.
+                    continue
+                raise
+            self.coalesced += 1
+            return value, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (fingerprint, future)
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when nobody is waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        self._completed.set(key, (fingerprint, value))
+        future.set_result(value)
+        return value, False
+
+    def stats(self) -> dict:
+        """Replay and coalescing counters for ``/metrics``."""
+
+        return {
+            "stored": len(self._completed),
+            "in_flight": len(self._inflight),
+            "replays": self.replays,
+            "coalesced": self.coalesced,
+        }
+
+
+idempotency_store = IdempotencyStore(
+    maxsize=settings.idempotency_cache_size,
+    ttl_seconds=settings.idempotency_ttl_seconds,
+)
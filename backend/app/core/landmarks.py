@@ -0,0 +1,284 @@
+"""Array-backed MediaPipe landmark engine.
+
+Each view is held as a single ``(33, 4)`` float array of ``x, y, z, visibility``
+columns so denormalization is one broadcast and every measurement is plain
+array indexing. All functions accept leading batch dimensions, i.e. arrays of
+shape ``(..., 33, 4)``, which lets single requests and batches share the same
+formulas.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+LANDMARK_COUNT = 33
+LANDMARK_COLUMNS = ("x", "y", "z", "visibility")
+
+# MediaPipe Pose landmark indices used by the measurement formulas.
+NOSE = 0
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+LEFT_ELBOW = 13
+LEFT_WRIST = 15
+LEFT_HIP, RIGHT_HIP = 23, 24
+LEFT_KNEE = 25
+LEFT_ANKLE, RIGHT_ANKLE = 27, 28
+
+# Assume an average person height of 170cm for pixel-to-cm scaling until
+# user-provided height or calibration data refines it.
+REFERENCE_HEIGHT_CM = 170.0
+
+# Output order of ``compute_measurements``; matches ``MeasurementNormalized``.
+MEASUREMENT_KEYS: Tuple[str, ...] = (
+    "height_cm",
+    "neck_cm",
+    "shoulder_cm",
+    "chest_cm",
+    "underbust_cm",
+    "waist_natural_cm",
+    "sleeve_cm",
+    "bicep_cm",
+    "forearm_cm",
+    "hip_low_cm",
+    "thigh_cm",
+    "knee_cm",
+    "calf_cm",
+    "ankle_cm",
+    "front_rise_cm",
+    "back_rise_cm",
+    "inseam_cm",
+    "outseam_cm",
+)
+
+
+def landmarks_to_array(landmarks: Sequence) -> np.ndarray:
+    """Pack a sequence of landmark objects into a ``(N, 4)`` float array."""
+
+    values = [v for lm in landmarks for v in (lm.x, lm.y, lm.z, lm.visibility)]
+    return np.fromiter(values, dtype=np.float64, count=len(values)).reshape(-1, 4)
+
+
+def landmarks_to_bytes(points: np.ndarray) -> bytes:
+    """Raw little-endian float32 bytes of ``(N, 4)`` landmarks, point by point."""
+
+    return np.ascontiguousarray(points, dtype="<f4").tobytes()
+
+
+def landmarks_from_bytes(raw: bytes | memoryview) -> np.ndarray:
+    """Decode raw packed float32 landmarks to a ``(N, 4)`` float64 array.
+
+    Raises:
+        ValueError: If the buffer does not hold whole points
+    """
+
+    if len(raw) % (4 * len(LANDMARK_COLUMNS)):
+        raise ValueError(
+            "packed landmarks must contain whole float32 x, y, z, visibility points"
+        )
+    return np.frombuffer(raw, dtype="<f4").astype(np.float64).reshape(-1, 4)
+
+
+def pack_landmarks(points: np.ndarray) -> str:
+    """Encode ``(N, 4)`` landmarks as base64 packed little-endian float32."""
+
+    return base64.b64encode(landmarks_to_bytes(points)).decode("ascii")
+
+
+def unpack_landmarks(data: str | bytes) -> np.ndarray:
+    """Decode base64 packed little-endian float32 landmarks to ``(N, 4)``.
+
+    Raises:
+        ValueError: If the payload is not valid base64 or not whole points
+    """
+
+    try:
+        raw = base64.b64decode(data, validate=True)
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError("packed landmarks must be valid base64") from exc
+    return landmarks_from_bytes(raw)
+
+
+def denormalize(points: np.ndarray, width, height) -> np.ndarray:
+    """Scale normalized coordinates to pixels (z shares the width scale).
+
+    ``width`` and ``height`` may be scalars or arrays matching the batch
+    dimensions of ``points``.
+    """
+
+    if np.ndim(width) == 0 and np.ndim(height) == 0:
+        return points * np.array((width, height, width, 1.0))
+
+    width = np.asarray(width, dtype=np.float64)
+    height = np.asarray(height, dtype=np.float64)
+    scale = np.stack(
+        np.broadcast_arrays(width, height, width, np.ones_like(width)), axis=-1
+    )
+    return points * scale[..., np.newaxis, :]
+
+
+# Front-view segments whose 3D pixel length feeds the formulas.
+_SEGMENTS = (
+    ("shoulder", LEFT_SHOULDER, RIGHT_SHOULDER),
+    ("hip", LEFT_HIP, RIGHT_HIP),
+    ("inseam", LEFT_ANKLE, LEFT_HIP),
+    ("sleeve", LEFT_SHOULDER, LEFT_WRIST),
+    ("upper_arm", LEFT_SHOULDER, LEFT_ELBOW),
+    ("forearm", LEFT_ELBOW, LEFT_WRIST),
+    ("thigh", LEFT_HIP, LEFT_KNEE),
+    ("calf", LEFT_KNEE, LEFT_ANKLE),
+)
+_SEG_START = np.array([start for _, start, _ in _SEGMENTS])
+_SEG_END = np.array([end for _, _, end in _SEGMENTS])
+
+# Vertical spans as weighted sums of front-view y coordinates. The ankle level
+# is the mean of both ankles and the waist level the mean of shoulders + hips.
+_Y_INDICES = np.array(
+    [NOSE, LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP, LEFT_ANKLE, RIGHT_ANKLE]
+)
+_VERTICAL_SPANS = np.array(
+    [
+        # height: ankle level - nose
+        [-1.0, 0.0, 0.0, 0.0, 0.0, 0.5, 0.5],
+        # outseam: ankle level - waist level
+        [0.0, -0.25, -0.25, -0.25, -0.25, 0.5, 0.5],
+        # front rise: waist level - left hip
+        [0.0, 0.25, 0.25, -0.75, 0.25, 0.0, 0.0],
+    ]
+).T
+
+# Side-view depths come from left/right z separation at shoulders and hips.
+_DEPTH_LEFT = np.array([LEFT_SHOULDER, LEFT_HIP])
+_DEPTH_RIGHT = np.array([RIGHT_SHOULDER, RIGHT_HIP])
+
+_FEATURES = tuple(name for name, _, _ in _SEGMENTS) + (
+    "height",
+    "outseam",
+    "front_rise",
+    "chest_depth",
+    "waist_depth",
+    "hip_depth",
+)
+
+# Every measurement is a linear combination of the scaled features; the
+# circumferences use the ellipse approximation π * (width + depth) / 2.
+_HALF_PI = np.pi / 2
+_LINEAR_TERMS: Dict[str, Dict[str, float]] = {
+    "height_cm": {"height": 1.0},
+    "neck_cm": {"shoulder": 0.4},
+    "shoulder_cm": {"shoulder": 1.0},
+    "chest_cm": {"shoulder": _HALF_PI * 1.05, "chest_depth": _HALF_PI},
+    "underbust_cm": {
+        "shoulder": 0.475 * _HALF_PI * 1.05,
+        "chest_depth": 0.475 * _HALF_PI,
+        "hip": 0.475 * _HALF_PI * 0.85,
+        "waist_depth": 0.475 * _HALF_PI,
+    },
+    "waist_natural_cm": {"hip": _HALF_PI * 0.85, "waist_depth": _HALF_PI},
+    "sleeve_cm": {"sleeve": 1.0},
+    "bicep_cm": {"upper_arm": 0.9},
+    "forearm_cm": {"forearm": 0.85},
+    "hip_low_cm": {"hip": _HALF_PI, "hip_depth": _HALF_PI},
+    "thigh_cm": {"thigh": 1.3},
+    "knee_cm": {"thigh": 1.3 * 0.7},
+    "calf_cm": {"calf": 0.9},
+    "ankle_cm": {"calf": 0.9 * 0.65},
+    "front_rise_cm": {"front_rise": 1.0},
+    "back_rise_cm": {"front_rise": 1.2},
+    "inseam_cm": {"inseam": 1.0},
+    "outseam_cm": {"outseam": 1.0},
+}
+_WEIGHTS = np.zeros((len(_FEATURES), len(MEASUREMENT_KEYS)))
+for _col, _key in enumerate(MEASUREMENT_KEYS):
+    for _feature, _weight in _LINEAR_TERMS[_key].items():
+        _WEIGHTS[_FEATURES.index(_feature), _col] = _weight
+
+_SHOULDER = _FEATURES.index("shoulder")
+_HIP = _FEATURES.index("hip")
+_HEIGHT = _FEATURES.index("height")
+# Depth fallbacks when the side view shows no z separation: waist uses 80% of
+# the hip depth (else half of 85% hip width), hips use 55% of hip width.
+_WAIST_HIP_DEPTH_SCALE = np.array([0.8, 1.0])
+_WAIST_HIP_WIDTH_FALLBACK = np.array([0.85 * 0.5, 0.55])
+
+
+def compute_measurements(front_px: np.ndarray, side_px: np.ndarray) -> np.ndarray:
+    """Compute the 18 anthropometric measurements from denormalized views.
+
+    Args:
+        front_px: Pixel-space front landmarks, shape ``(..., 33, 4)``
+        side_px: Pixel-space side landmarks, shape ``(..., 33, 4)``
+
+    Returns:
+        Array of shape ``(..., 18)`` ordered as ``MEASUREMENT_KEYS`` (cm)
+    """
+
+    front_xyz = front_px[..., :3]
+    delta = front_xyz[..., _SEG_END, :] - front_xyz[..., _SEG_START, :]
+    lengths = np.sqrt(np.sum(delta * delta, axis=-1))
+    spans = np.abs(front_px[..., _Y_INDICES, 1] @ _VERTICAL_SPANS)
+    depths = np.abs(side_px[..., _DEPTH_LEFT, 2] - side_px[..., _DEPTH_RIGHT, 2])
+    pixels = np.concatenate([lengths, spans, depths], axis=-1)
+
+    height_px = pixels[..., _HEIGHT : _HEIGHT + 1]
+    px_per_cm = np.where(height_px > 0, height_px / REFERENCE_HEIGHT_CM, 1.0)
+    cm = pixels / px_per_cm
+
+    shoulder = cm[..., _SHOULDER : _SHOULDER + 1]
+    hip_width = cm[..., _HIP : _HIP + 1]
+    chest_depth = np.maximum(cm[..., -2:-1], shoulder * (1.05 * 0.5))
+    hip_depth = cm[..., -1:]
+    waist_hip_depth = np.where(
+        hip_depth > 0,
+        hip_depth * _WAIST_HIP_DEPTH_SCALE,
+        hip_width * _WAIST_HIP_WIDTH_FALLBACK,
+    )
+    features = np.concatenate([cm[..., :-2], chest_depth, waist_hip_depth], axis=-1)
+    return features @ _WEIGHTS
+
+
+def measurements_to_dict(values: np.ndarray) -> Dict[str, float]:
+    """Map a single ``(18,)`` measurement vector to its named fields."""
+
+    return dict(zip(MEASUREMENT_KEYS, values.tolist()))
+
+
+# Landmarks whose visibility gates pose quality: shoulders, hips, knees, ankles.
+KEY_VISIBILITY_INDICES = np.array([11, 12, 23, 24, 25, 26, 27, 28])
+
+# (min average visibility, min key visibility, accuracy), best tier first.
+ACCURACY_TIERS = ((0.85, 0.9, 0.95), (0.7, 0.75, 0.90), (0.5, 0.6, 0.85))
+BASELINE_ACCURACY = 0.80
+
+# Per-view visibility weights: column 0 averages all 66 points of both views,
+# column 1 averages the key landmarks of both views.
+_VISIBILITY_WEIGHTS = np.zeros((LANDMARK_COUNT, 2))
+_VISIBILITY_WEIGHTS[:, 0] = 1.0 / (2 * LANDMARK_COUNT)
+_VISIBILITY_WEIGHTS[KEY_VISIBILITY_INDICES, 1] = 1.0 / (2 * len(KEY_VISIBILITY_INDICES))
+
+
+def visibility_stats(front: np.ndarray, side: np.ndarray) -> np.ndarray:
+    """Average and key-landmark visibility, shape ``(..., 2)``."""
+
+    return front[..., 3] @ _VISIBILITY_WEIGHTS + side[..., 3] @ _VISIBILITY_WEIGHTS
+
+
+def estimate_accuracy_array(front: np.ndarray, side: np.ndarray) -> np.ndarray:
+    """Visibility-based accuracy estimate for ``(..., 33, 4)`` landmark views.
+
+    Overall and key-landmark visibility are compared against
+    ``ACCURACY_TIERS``; views below every tier get ``BASELINE_ACCURACY``.
+    """
+
+    stats = visibility_stats(front, side)
+    average, key = stats[..., 0], stats[..., 1]
+    return np.select(
+        [
+            (average > min_avg) & (key > min_key)
+            for min_avg, min_key, _ in ACCURACY_TIERS
+        ],
+        [accuracy for _, _, accuracy in ACCURACY_TIERS],
+        default=BASELINE_ACCURACY,
+    )
@@ -0,0 +1,97 @@
+"""Latest normalized result per session, served by ``GET /dmaas/latest``.
+
+Every validation records its ``MeasurementNormalized`` here, so polling the
+latest result never touches the database. Entries are ordered by write time,
+which makes the newest result overall the last entry. The least recently
+written sessions are evicted beyond ``LATEST_RESULTS_SIZE``.
+
+Recording only stores a reference. The JSON body (the shape
+``/measurements/validate`` returns) and its ETag (a hash of the body, stable
+across restarts) are rendered on the first read of an entry and reused until
+the session is written again. An unchanged poll is then a dictionary lookup
+and a string comparison.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from backend.app.core.config import settings
+from backend.app.schemas.measure_schema import MeasurementNormalized
+
+
+class LatestResult:
+    """One stored result with its lazily rendered body and ETag."""
+
+    __slots__ = ("normalized", "_rendered")
+
+    def __init__(self, normalized: MeasurementNormalized) -> None:
+        self.normalized = normalized
+        self._rendered: Optional[Tuple[bytes, str]] = None
+
+    def rendered(self) -> Tuple[bytes, str]:
+        """``(json_body, etag)``; computed once per entry."""
+
+        if self._rendered is None:
+            payload = self.normalized.model_dump(mode="json")
+            body = json.dumps(payload, separators=(",", ":")).encode()
+            etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+            self._rendered = (body, etag)
+        return self._rendered
+
+
+class LatestResults:
+    """Bounded map of session id to its most recent ``LatestResult``."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, LatestResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.updates = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, normalized: MeasurementNormalized) -> None:
+        """Make ``normalized`` the latest result for its session and overall."""
+
+        if self.maxsize <= 0:
+            return
+        entry = LatestResult(normalized)
+        with self._lock:
+            self._entries[normalized.session_id] = entry
+            self._entries.move_to_end(normalized.session_id)
+            self.updates += 1
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, session_id: Optional[str] = None) -> Optional[LatestResult]:
+        """Latest result for ``session_id``, or the newest overall."""
+
+        with self._lock:
+            if session_id is not None:
+                return self._entries.get(session_id)
+            if not self._entries:
+                return None
+            return self._entries[next(reversed(self._entries))]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "updates": self.updates,
+            "evictions": self.evictions,
+        }
+
+
+latest_results = LatestResults(maxsize=settings.latest_results_size)
@@ -0,0 +1,328 @@
+"""Write-behind persistence of measurement provenance.
+
+Every validated session is recorded in the three provenance tables from
+``data/supabase/migrations/002_measurement_provenance.sql``:
+``measurement_sessions``, ``mediapipe_landmarks`` (one row per view, keyed by
+the ``front_landmarks_id``/``side_landmarks_id`` returned to the caller) and
+``normalized_measurements``.
+
+The request path only appends the validated models to a bounded in-memory
+queue and never waits on the database. A single writer thread turns queued
+records into rows and inserts them in batches, one transaction per batch,
+through the shared ``database`` pool. A batch is flushed once it reaches
+``PROVENANCE_BATCH_SIZE`` records or ``PROVENANCE_FLUSH_INTERVAL_SECONDS``
+after its first record, whichever comes first. ``close()`` drains the queue
+before returning. When the queue is full the record is dropped and counted
+rather than slowing the request.
+
+Landmarks are stored in ``mediapipe_landmarks.landmarks_f32`` as packed
+little-endian float32 ``x, y, z, visibility`` points (528 bytes per view,
+see ``003_packed_landmarks.sql``) rather than as JSON objects.
+``decode_landmarks`` reads a batch of stored rows straight into one
+``(rows, 33, 4)`` array, and ``backfill_packed_landmarks`` converts rows
+written in the older JSON form.
+
+Without ``DATABASE_URL`` (see ``backend.app.core.database``) nothing is
+recorded.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from backend.app.core.config import settings
+from backend.app.core.database import ConnectionPool, database
+from backend.app.core.landmarks import (
+    LANDMARK_COLUMNS,
+    LANDMARK_COUNT,
+    landmarks_from_bytes,
+    landmarks_to_bytes,
+)
+
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+# ``MeasurementNormalized.source`` -> ``measurement_sessions.source_type``
+_SOURCE_TYPES = {"mediapipe": "mediapipe_web"}
+
+# Partitioned tables cannot keep a unique index on session_id alone
+# (005_partition_measurement_tables.sql), so repeat sessions are skipped with
+# an existence check instead of ON CONFLICT.
+_INSERT_SESSION = (
+    "insert into measurement_sessions "
+    "(session_id, source_type, front_photo_url, side_photo_url) "
+    "select {p}, {p}, {p}, {p} where not exists "
+    "(select 1 from measurement_sessions where session_id = {p})"
+)
+_INSERT_LANDMARKS = (
+    "insert into mediapipe_landmarks "
+    "(id, session_id, view, landmarks_f32, image_width, image_height, timestamp) "
+    "values ({p}, {p}, {p}, {p}, {p}, {p}, {p})"
+)
+_INSERT_NORMALIZED = (
+    "insert into normalized_measurements "
+    "(session_id, payload, source, model_version, confidence, accuracy_estimate) "
+    "values ({p}, {p}, {p}, {p}, {p}, {p})"
+)
+
+
+def provenance_rows(input_data, normalized) -> Tuple[tuple, List[tuple], tuple]:
+    """Session, landmark and normalized-measurement rows for one validation."""
+
+    session = (
+        normalized.session_id,
+        _SOURCE_TYPES.get(normalized.source, normalized.source),
+        normalized.front_photo_url,
+        normalized.side_photo_url,
+        normalized.session_id,
+    )
+    landmarks = []
+    for view, landmarks_id, capture in (
+        ("front", normalized.front_landmarks_id, input_data.front_landmarks),
+        ("side", normalized.side_landmarks_id, input_data.side_landmarks),
+    ):
+        if landmarks_id and capture is not None:
+            landmarks.append(
+                (
+                    landmarks_id,
+                    normalized.session_id,
+                    view,
+                    landmarks_to_bytes(capture.points()),
+                    capture.image_width,
+                    capture.image_height,
+                    capture.timestamp,
+                )
+            )
+    measurement = (
+        normalized.session_id,
+        normalized.model_dump_json(exclude_none=True),
+        normalized.source,
+        normalized.model_version,
+        normalized.confidence,
+        normalized.accuracy_estimate,
+    )
+    return session, landmarks, measurement
+
+
+def decode_landmarks(rows: Iterable[tuple]) -> np.ndarray:
+    """Decode stored ``(landmarks_f32, landmarks)`` pairs into ``(rows, 33, 4)``.
+
+    Packed rows are joined and decoded with a single ``frombuffer``; rows that
+    still hold only the JSON form are converted one by one.
+
+    Raises:
+        ValueError: If a row holds neither form or not exactly 33 points
+    """
+
+    rows = list(rows)
+    shape = (LANDMARK_COUNT, len(LANDMARK_COLUMNS))
+    points = np.empty((len(rows), *shape))
+    packed = [index for index, (blob, _) in enumerate(rows) if blob is not None]
+    if packed:
+        raw = b"".join(bytes(rows[index][0]) for index in packed)
+        decoded = landmarks_from_bytes(raw)
+        if decoded.shape[0] != len(packed) * LANDMARK_COUNT:
+            raise ValueError(f"packed landmark rows must hold {LANDMARK_COUNT} points each")
+        points[packed] = decoded.reshape(len(packed), *shape)
+    for index, (blob, document) in enumerate(rows):
+        if blob is not None:
+            continue
+        if document is None:
+            raise ValueError("landmark row has neither landmarks_f32 nor landmarks")
+        if isinstance(document, (str, bytes)):
+            document = json.loads(document)
+        values = np.array(
+            [[point[column] for column in LANDMARK_COLUMNS] for point in document],
+            dtype=np.float64,
+        )
+        if values.shape != shape:
+            raise ValueError(f"landmark rows must hold {LANDMARK_COUNT} points each")
+        points[index] = values
+    return points
+
+
+def backfill_packed_landmarks(pool: ConnectionPool, batch_size: int = 500) -> int:
+    """Re-encode JSON-only ``mediapipe_landmarks`` rows as packed float32.
+
+    Works in batches of ``batch_size`` rows, one transaction each, and clears
+    the JSON column of every converted row. Safe to re-run: converted rows are
+    skipped. Returns the number of rows converted.
+    """
+
+    p = pool.placeholder
+    converted = 0
+    while True:
+        with pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(
+                "select id, landmarks from mediapipe_landmarks "
+                f"where landmarks_f32 is null and landmarks is not null limit {p}",
+                (batch_size,),
+            )
+            rows = cursor.fetchall()
+            if rows:
+                points = decode_landmarks((None, document) for _, document in rows)
+                cursor.executemany(
+                    "update mediapipe_landmarks "
+                    f"set landmarks_f32 = {p}, landmarks = null where id = {p}",
+                    [
+                        (landmarks_to_bytes(view), row_id)
+                        for (row_id, _), view in zip(rows, points)
+                    ],
+                )
+        if not rows:
+            return converted
+        converted += len(rows)
+
+
+class ProvenanceWriter:
+    """Bounded queue drained into the database by one background thread."""
+
+    def __init__(
+        self,
+        pool: ConnectionPool,
+        batch_size: int = 100,
+        flush_interval_seconds: float = 1.0,
+        max_queue: int = 10000,
+    ) -> None:
+        self.pool = pool
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="provenance-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, input_data, normalized) -> bool:
+        """Queue one validated session without blocking; False if dropped."""
+
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait((input_data, normalized))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def _collect(self) -> Tuple[list, bool]:
+        """Block for the next batch; also report whether close was requested."""
+
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval_seconds
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect()
+            if batch:
+                self._flush(batch)
+        # Close was requested: drain whatever is still queued.
+        remaining = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                remaining.append(item)
+        for start in range(0, len(remaining), self.batch_size):
+            self._flush(remaining[start:start + self.batch_size])
+
+    def _flush(self, batch: list) -> None:
+        """Insert a batch in one transaction."""
+
+        sessions, landmarks, measurements = [], [], []
+        try:
+            for input_data, normalized in batch:
+                session, views, measurement = provenance_rows(input_data, normalized)
+                sessions.append(session)
+                landmarks.extend(views)
+                measurements.append(measurement)
+        except Exception:
+            logger.exception("could not serialize provenance batch")
+            with self._lock:
+                self.failed += len(batch)
+            return
+
+        p = self.pool.placeholder
+        try:
+            with self.pool.connection() as connection:
+                cursor = connection.cursor()
+                cursor.executemany(_INSERT_SESSION.format(p=p), sessions)
+                if landmarks:
+                    cursor.executemany(_INSERT_LANDMARKS.format(p=p), landmarks)
+                cursor.executemany(_INSERT_NORMALIZED.format(p=p), measurements)
+        except Exception:
+            logger.exception("provenance batch of %d sessions failed", len(batch))
+            with self._lock:
+                self.failed += len(batch)
+        else:
+            with self._lock:
+                self.written += len(batch)
+                self.batches += 1
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting records and flush everything queued.
+
+        The pool belongs to the caller and stays open.
+        """
+
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "queue_depth": self._queue.qsize(),
+        }
+
+
+provenance_writer: Optional[ProvenanceWriter] = None
+if database is not None:
+    provenance_writer = ProvenanceWriter(
+        database,
+        batch_size=settings.provenance_batch_size,
+        flush_interval_seconds=settings.provenance_flush_interval_seconds,
+        max_queue=settings.provenance_queue_size,
+    )
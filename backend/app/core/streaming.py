@@ -0,0 +1,120 @@
+"""Incremental measurement estimates for live capture sessions.
+
+A stream session folds per-frame landmark measurements into running
+statistics (Welford's online mean/variance) so memory stays constant no
+matter how many frames a camera sends. An estimate is published only once
+the standard error of every measurement drops below the configured relative
+tolerance of its mean, or below an absolute floor in centimeters. The floor
+lets measurements whose mean is near zero converge at all.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from backend.app.core.config import settings
+from backend.app.core.landmarks import MEASUREMENT_KEYS
+from backend.app.core.validation import MODEL_VERSION
+from backend.app.schemas.measure_schema import MeasurementNormalized
+
+
+class RunningStats:
+    """Welford accumulator over a fixed-width vector of samples."""
+
+    def __init__(self, width: int) -> None:
+        self.count = 0
+        self.mean = np.zeros(width)
+        self._m2 = np.zeros(width)
+
+    def update(self, sample: np.ndarray) -> None:
+        """Fold one sample into the running mean and variance."""
+
+        self.count += 1
+        delta = sample - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (sample - self.mean)
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Unbiased sample variance (zeros until two samples are seen)."""
+
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return self._m2 / (self.count - 1)
+
+    def standard_error(self) -> np.ndarray:
+        """Standard error of each component of the mean."""
+
+        return np.sqrt(self.variance / max(self.count, 1))
+
+    def relative_standard_error(self) -> float:
+        """Largest standard error of the mean relative to its magnitude."""
+
+        if self.count < 2:
+            return float("inf")
+        standard_error = self.standard_error()
+        scale = np.maximum(np.abs(self.mean), 1e-9)
+        return float(np.max(standard_error / scale))
+
+
+class MeasurementStream:
+    """Running estimate for one streaming capture session."""
+
+    def __init__(
+        self,
+        session_id: str,
+        min_frames: int = settings.stream_min_frames,
+        tolerance: float = settings.stream_convergence_tolerance,
+        floor_cm: float = settings.stream_convergence_floor_cm,
+    ) -> None:
+        self.session_id = session_id
+        self.min_frames = min_frames
+        self.tolerance = tolerance
+        self.floor_cm = floor_cm
+        self._measurements = RunningStats(len(MEASUREMENT_KEYS))
+        self._accuracy = RunningStats(1)
+
+    @property
+    def frames(self) -> int:
+        return self._measurements.count
+
+    def add_frame(self, measurements: Dict[str, float], accuracy: float) -> None:
+        """Fold one frame's measurements and accuracy into the estimate."""
+
+        self._measurements.update(
+            np.fromiter(
+                (measurements[key] for key in MEASUREMENT_KEYS),
+                dtype=np.float64,
+                count=len(MEASUREMENT_KEYS),
+            )
+        )
+        self._accuracy.update(np.array([accuracy]))
+
+    def relative_error(self) -> float:
+        return self._measurements.relative_standard_error()
+
+    def converged(self) -> bool:
+        """True once enough frames agree within the tolerance or the floor."""
+
+        if self.frames < self.min_frames:
+            return False
+        stats = self._measurements
+        allowed = np.maximum(self.tolerance * np.abs(stats.mean), self.floor_cm)
+        return bool(np.all(stats.standard_error() <= allowed))
+
+    def estimate(self) -> Optional[MeasurementNormalized]:
+        """Current normalized estimate, or ``None`` before convergence."""
+
+        if not self.converged():
+            return None
+        accuracy = float(self._accuracy.mean[0])
+        return MeasurementNormalized(
+            **dict(zip(MEASUREMENT_KEYS, self._measurements.mean.tolist())),
+            source="mediapipe",
+            model_version=MODEL_VERSION,
+            confidence=accuracy,
+            accuracy_estimate=accuracy,
+            session_id=self.session_id,
+        )
@@ -7,12 +7,28 @@ Derived from the Manus implementation package.
 
 from __future__ import annotations
 
-import math
+import hashlib
+import struct
 import uuid
-from typing import Dict
+from typing import Dict, List, Sequence
 
+import numpy as np
 from fastapi import HTTPException
 
+from backend.app.core import provenance
+from backend.app.core.cache import TTLCache
+from backend.app.core.config import settings
+from backend.app.core.executor import BoundedExecutor
+from backend.app.core.latest_results import latest_results
+from backend.app.core.landmarks import (
+    ACCURACY_TIERS,
+    BASELINE_ACCURACY,
+    compute_measurements,
+    denormalize,
+    estimate_accuracy_array,
+    measurements_to_dict,
+    visibility_stats,
+)
 from backend.app.schemas.errors import ErrorDetail, ErrorResponse
 from backend.app.schemas.measure_schema import (
     MeasurementInput,
@@ -43,6 +59,8 @@ CANONICAL_FIELDS = {
     "outseam",
 }
 
+_SORTED_FIELDS = sorted(CANONICAL_FIELDS)
+
 ALLOWED_META_FIELDS = {
     "unit",
     "session_id",
@@ -60,28 +78,21 @@ ALLOWED_META_FIELDS = {
 }
 
 
+MODEL_VERSION = "v1.0-mediapipe"
+
+# Content-addressed cache of (measurements, source, accuracy) keyed by
+# ``result_cache_key``; resubmitted payloads skip recomputation entirely.
+result_cache = TTLCache(
+    maxsize=settings.result_cache_size,
+    ttl_seconds=settings.result_cache_ttl_seconds,
+)
+
+
 def inches_to_cm(inches: float) -> float:
     """Convert inches to centimeters."""
     return inches * 2.54
 
 
-def calculate_distance(p1: Dict[str, float], p2: Dict[str, float]) -> float:
-    """
-    Calculate Euclidean distance between two 3D points.
-    
-    Args:
-        p1: First point with x, y, z coordinates
-        p2: Second point with x, y, z coordinates
-        
-    Returns:
-        Distance in the same units as input coordinates
-    """
-    dx = p2['x'] - p1['x']
-    dy = p2['y'] - p1['y']
-    dz = p2['z'] - p1['z']
-    return math.sqrt(dx*dx + dy*dy + dz*dz)
-
-
 def calculate_measurements_from_landmarks(
     front_landmarks: MediaPipeLandmarks,
     side_landmarks: MediaPipeLandmarks,
@@ -97,6 +108,9 @@ def calculate_measurements_from_landmarks(
     - 0: nose, 11-12: shoulders, 13-14: elbows, 15-16: wrists
     - 23-24: hips, 25-26: knees, 27-28: ankles, 29-30: heels, 31-32: foot index
     
+    Each view is packed into one (33, 4) array and evaluated by the vectorized
+    engine in ``backend.app.core.landmarks``.
+    
     Args:
         front_landmarks: MediaPipe landmarks from front-facing photo
         side_landmarks: MediaPipe landmarks from side-facing photo
@@ -104,197 +118,17 @@ def calculate_measurements_from_landmarks(
     Returns:
         Dictionary of measurement names to values in centimeters
     """
-    # Convert landmarks to list of dicts for easier access
-    front_pts = [{'x': lm.x, 'y': lm.y, 'z': lm.z, 'visibility': lm.visibility} 
-                 for lm in front_landmarks.landmarks]
-    side_pts = [{'x': lm.x, 'y': lm.y, 'z': lm.z, 'visibility': lm.visibility} 
-                for lm in side_landmarks.landmarks]
-    
-    # MediaPipe coordinates are normalized (0-1 range)
-    # We need to scale them to real-world measurements
-    # Using image dimensions to get pixel-based distances, then scale to cm
-    
-    # Get image dimensions for scaling
-    img_height_front = front_landmarks.image_height
-    img_width_front = front_landmarks.image_width
-    img_height_side = side_landmarks.image_height
-    img_width_side = side_landmarks.image_width
-    
-    # Calculate pixel-based distances by denormalizing coordinates
-    def denormalize_point(pt: Dict[str, float], img_width: int, img_height: int) -> Dict[str, float]:
-        """Convert normalized coordinates to pixel coordinates."""
-        return {
-            'x': pt['x'] * img_width,
-            'y': pt['y'] * img_height,
-            'z': pt['z'] * img_width,  # z is in same scale as width
-            'visibility': pt['visibility']
-        }
-    
-    # Denormalize all points
-    front_px = [denormalize_point(pt, img_width_front, img_height_front) for pt in front_pts]
-    side_px = [denormalize_point(pt, img_width_side, img_height_side) for pt in side_pts]
-    
-    # --- HEIGHT CALCULATION ---
-    # Height: Distance from ankle to top of head (nose is proxy for head top)
-    # Use average of left and right ankle
-    left_ankle = front_px[27]
-    right_ankle = front_px[28]
-    nose = front_px[0]
-    
-    ankle_y = (left_ankle['y'] + right_ankle['y']) / 2
-    head_y = nose['y']
-    height_pixels = abs(ankle_y - head_y)
-    
-    # Assume average person height is 170cm and use this as scaling factor
-    # This will be refined with user-provided height or calibration data
-    REFERENCE_HEIGHT_CM = 170.0
-    pixels_per_cm = height_pixels / REFERENCE_HEIGHT_CM if height_pixels > 0 else 1.0
-    
-    # --- SHOULDER WIDTH ---
-    left_shoulder = front_px[11]
-    right_shoulder = front_px[12]
-    shoulder_width_px = calculate_distance(left_shoulder, right_shoulder)
-    shoulder_width_cm = shoulder_width_px / pixels_per_cm
-    
-    # --- CHEST MEASUREMENT ---
-    # Chest circumference estimate: Use shoulder width from front + depth from side
-    # Simplified approach: chest_circumference ≈ π * average_diameter
-    left_shoulder_side = side_px[11]
-    right_shoulder_side = side_px[12]
-    chest_depth_px = abs(left_shoulder_side['z'] - right_shoulder_side['z'])
-    chest_depth_cm = chest_depth_px / pixels_per_cm if chest_depth_px > 0 else shoulder_width_cm * 0.5
-    
-    # Chest is typically at shoulder level, use shoulder measurements as proxy
-    chest_width_cm = shoulder_width_cm * 1.05  # Chest is slightly wider than shoulders
-    chest_depth_cm = max(chest_depth_cm, chest_width_cm * 0.5)  # Ensure reasonable depth
-    
-    # Simplified circumference: average of width and depth * π
-    chest_cm = math.pi * (chest_width_cm + chest_depth_cm) / 2
-    
-    # --- WAIST MEASUREMENT ---
-    # Waist is approximately midway between shoulders and hips
-    left_hip = front_px[23]
-    right_hip = front_px[24]
-    
-    waist_y = (left_shoulder['y'] + right_shoulder['y'] + left_hip['y'] + right_hip['y']) / 4
-    waist_width_px = calculate_distance(left_hip, right_hip) * 0.85  # Waist is narrower than hips
-    waist_width_cm = waist_width_px / pixels_per_cm
-    
-    # Get waist depth from side view
-    left_hip_side = side_px[23]
-    right_hip_side = side_px[24]
-    waist_depth_px = abs(left_hip_side['z'] - right_hip_side['z']) * 0.8
-    waist_depth_cm = waist_depth_px / pixels_per_cm if waist_depth_px > 0 else waist_width_cm * 0.5
-    
-    # Simplified circumference
-    waist_cm = math.pi * (waist_width_cm + waist_depth_cm) / 2
-    
-    # --- HIP MEASUREMENT ---
-    hip_width_px = calculate_distance(left_hip, right_hip)
-    hip_width_cm = hip_width_px / pixels_per_cm
-    
-    hip_depth_px = abs(left_hip_side['z'] - right_hip_side['z'])
-    hip_depth_cm = hip_depth_px / pixels_per_cm if hip_depth_px > 0 else hip_width_cm * 0.55
-    
-    # Simplified circumference
-    hip_cm = math.pi * (hip_width_cm + hip_depth_cm) / 2
-    
-    # --- INSEAM ---
-    # Distance from ankle to hip (crotch level)
-    left_ankle_front = front_px[27]
-    left_hip_front = front_px[23]
-    inseam_px = calculate_distance(left_ankle_front, left_hip_front)
-    inseam_cm = inseam_px / pixels_per_cm
-    
-    # --- OUTSEAM ---
-    # Distance from ankle to waist level
-    outseam_px = abs(ankle_y - waist_y)
-    outseam_cm = outseam_px / pixels_per_cm
-    
-    # --- SLEEVE LENGTH ---
-    # Distance from shoulder to wrist
-    left_wrist = front_px[15]
-    sleeve_px = calculate_distance(left_shoulder, left_wrist)
-    sleeve_cm = sleeve_px / pixels_per_cm
-    
-    # --- BICEP ---
-    # Distance from shoulder to elbow
-    left_elbow = front_px[13]
-    bicep_length_px = calculate_distance(left_shoulder, left_elbow)
-    bicep_length_cm = bicep_length_px / pixels_per_cm
-    # Bicep circumference is estimated from upper arm length
-    # Typical ratio: bicep_circumference ≈ 0.9 * upper_arm_length
-    bicep_cm = bicep_length_cm * 0.9
-    
-    # --- FOREARM ---
-    # Distance from elbow to wrist
-    forearm_length_px = calculate_distance(left_elbow, left_wrist)
-    forearm_length_cm = forearm_length_px / pixels_per_cm
-    # Forearm circumference is estimated from forearm length
-    # Typical ratio: forearm_circumference ≈ 0.85 * forearm_length
-    forearm_cm = forearm_length_cm * 0.85
-    
-    # --- THIGH ---
-    # Distance from hip to knee
-    left_knee = front_px[25]
-    thigh_length_px = calculate_distance(left_hip_front, left_knee)
-    thigh_length_cm = thigh_length_px / pixels_per_cm
-    # Thigh circumference is estimated from thigh length
-    # Typical ratio: thigh_circumference ≈ 1.3 * thigh_length
-    thigh_cm = thigh_length_cm * 1.3
-    
-    # --- KNEE ---
-    # Knee circumference estimated from thigh and calf
-    knee_cm = thigh_cm * 0.7  # Knee is ~70% of thigh circumference
-    
-    # --- CALF ---
-    # Distance from knee to ankle
-    calf_length_px = calculate_distance(left_knee, left_ankle_front)
-    calf_length_cm = calf_length_px / pixels_per_cm
-    # Calf circumference is estimated from calf length
-    # Typical ratio: calf_circumference ≈ 0.9 * calf_length
-    calf_cm = calf_length_cm * 0.9
-    
-    # --- ANKLE ---
-    # Ankle circumference estimated as smaller than calf
-    ankle_cm = calf_cm * 0.65  # Ankle is ~65% of calf circumference
-    
-    # --- NECK ---
-    # Neck is estimated from shoulder width
-    neck_cm = shoulder_width_cm * 0.4  # Neck is ~40% of shoulder width
-    
-    # --- UNDERBUST ---
-    # Underbust is between chest and waist
-    underbust_cm = (chest_cm + waist_cm) / 2 * 0.95
-    
-    # --- FRONT RISE & BACK RISE ---
-    # Rise measurements from hip to waist
-    front_rise_cm = abs(waist_y - left_hip['y']) / pixels_per_cm
-    back_rise_cm = front_rise_cm * 1.2  # Back rise is typically longer
-    
-    # Return all measurements in centimeters
-    measurements = {
-        "height_cm": height_pixels / pixels_per_cm,
-        "neck_cm": neck_cm,
-        "shoulder_cm": shoulder_width_cm,
-        "chest_cm": chest_cm,
-        "underbust_cm": underbust_cm,
-        "waist_natural_cm": waist_cm,
-        "sleeve_cm": sleeve_cm,
-        "bicep_cm": bicep_cm,
-        "forearm_cm": forearm_cm,
-        "hip_low_cm": hip_cm,
-        "thigh_cm": thigh_cm,
-        "knee_cm": knee_cm,
-        "calf_cm": calf_cm,
-        "ankle_cm": ankle_cm,
-        "front_rise_cm": front_rise_cm,
-        "back_rise_cm": back_rise_cm,
-        "inseam_cm": inseam_cm,
-        "outseam_cm": outseam_cm,
-    }
-    
-    return measurements
+    front_px = denormalize(
+        front_landmarks.points(),
+        front_landmarks.image_width,
+        front_landmarks.image_height,
+    )
+    side_px = denormalize(
+        side_landmarks.points(),
+        side_landmarks.image_width,
+        side_landmarks.image_height,
+    )
+    return measurements_to_dict(compute_measurements(front_px, side_px))
 
 
 def estimate_accuracy(
@@ -305,29 +139,194 @@ def estimate_accuracy(
     """
     Estimate accuracy of MediaPipe-derived measurements (0-1 scale).
 
-    Uses visibility heuristics and pose quality checks.
+    Uses visibility heuristics and pose quality checks: overall and key
+    landmark (shoulders, hips, knees, ankles) visibility are compared against
+    fixed accuracy tiers.
+    """
+    return _visibility_accuracy(front_landmarks.points(), side_landmarks.points())
+
+
+def _visibility_accuracy(front_points: np.ndarray, side_points: np.ndarray) -> float:
+    """First accuracy tier whose visibility thresholds both views clear."""
+
+    average, key = visibility_stats(front_points, side_points).tolist()
+    for min_average, min_key, accuracy in ACCURACY_TIERS:
+        if average > min_average and key > min_key:
+            return accuracy
+    return BASELINE_ACCURACY
+
+
+def _unknown_field_errors(keys) -> List[ErrorDetail]:
+    """Report payload keys that are neither canonical nor allowed metadata."""
+
+    errors = []
+    for field_name in keys:
+        if field_name not in CANONICAL_FIELDS and field_name not in ALLOWED_META_FIELDS:
+            errors.append(
+                ErrorDetail(
+                    field=field_name,
+                    message=f"Unknown field: {field_name}",
+                    hint=f"Did you mean one of: {', '.join(sorted(CANONICAL_FIELDS))}?",
+                )
+            )
+    return errors
+
+
+def _payload_keys(input_data: MeasurementInput, raw_payload: Dict | None) -> set:
+    """Keys submitted by the client.
+
+    Read from the parsed model (explicitly set fields plus ``extra="allow"``
+    extras) so callers never decode the request body a second time. A raw
+    payload dict still wins when one is supplied.
     """
-    front_scores = [lm.visibility for lm in front_landmarks.landmarks]
-    side_scores = [lm.visibility for lm in side_landmarks.landmarks]
-    avg_visibility = (sum(front_scores) + sum(side_scores)) / (
-        len(front_scores) + len(side_scores)
+
+    if raw_payload is not None:
+        return set(raw_payload.keys())
+    extras = getattr(input_data, "model_extra", None)
+    if extras is not None:
+        return set(input_data.model_fields_set).union(extras)
+    return set(input_data.dict(exclude_unset=True).keys())
+
+
+def _user_input_measurements(input_data: MeasurementInput) -> Dict[str, float]:
+    """Convert user-provided measurements to centimeters."""
+
+    unit = input_data.unit or Unit.CM
+    measurements = {}
+
+    for field in CANONICAL_FIELDS:
+        value = getattr(input_data, field, None)
+        if value is not None:
+            if unit == Unit.IN:
+                measurements[f"{field}_cm"] = inches_to_cm(value)
+            else:
+                measurements[f"{field}_cm"] = value
+    return measurements
+
+
+def _build_normalized(
+    input_data: MeasurementInput,
+    measurements: Dict[str, float],
+    source: str,
+    accuracy: float,
+) -> MeasurementNormalized:
+    """Assemble the normalized envelope with session and provenance metadata."""
+
+    if source == "mediapipe":
+        # Ids of the mediapipe_landmarks rows written by the provenance writer
+        front_landmarks_id = str(uuid.uuid4())
+        side_landmarks_id = str(uuid.uuid4())
+    else:
+        front_landmarks_id = None
+        side_landmarks_id = None
+
+    session_id = input_data.session_id or str(uuid.uuid4())
+
+    normalized_kwargs = {
+        **measurements,
+        "source": source,
+        "model_version": MODEL_VERSION,
+        "confidence": accuracy,
+        "accuracy_estimate": accuracy,
+        "session_id": session_id,
+        "front_photo_url": input_data.front_photo_url,
+        "side_photo_url": input_data.side_photo_url,
+        "front_landmarks_id": front_landmarks_id,
+        "side_landmarks_id": side_landmarks_id,
+    }
+
+    normalized = MeasurementNormalized(**normalized_kwargs)
+    latest_results.record(normalized)
+    if provenance.provenance_writer is not None:
+        # Queued only; rows are written in batches off the request path.
+        provenance.provenance_writer.submit(input_data, normalized)
+    return normalized
+
+
+def result_cache_key(input_data: MeasurementInput) -> str:
+    """
+    Content hash of everything that determines the computed measurements.
+    
+    Covers the model version, both landmark arrays with their image
+    dimensions, the unit and the user-provided measurement fields. Session
+    and provenance metadata are excluded so resubmitted scans hit the cache.
+    """
+    digest = hashlib.blake2b(MODEL_VERSION.encode(), digest_size=16)
+    for view in (input_data.front_landmarks, input_data.side_landmarks):
+        if view is None:
+            digest.update(b"\x00")
+            continue
+        digest.update(struct.pack("<ii", view.image_width, view.image_height))
+        digest.update(view.points().tobytes())
+    digest.update(str(getattr(input_data.unit, "value", input_data.unit)).encode())
+    digest.update(
+        repr([getattr(input_data, field) for field in _SORTED_FIELDS]).encode()
+    )
+    return digest.hexdigest()
+
+
+def landmark_core(
+    front_points: np.ndarray,
+    front_size: tuple,
+    side_points: np.ndarray,
+    side_size: tuple,
+) -> tuple:
+    """Pure ``(measurements, accuracy)`` for two views.
+
+    Takes only arrays and image sizes so it can run in a worker process.
+    """
+
+    front_px = denormalize(front_points, *front_size)
+    side_px = denormalize(side_points, *side_size)
+    measurements = measurements_to_dict(compute_measurements(front_px, side_px))
+    return measurements, _visibility_accuracy(front_points, side_points)
+
+
+def landmark_core_args(input_data: MeasurementInput) -> tuple:
+    """Positional ``landmark_core`` arguments for any object with both views."""
+
+    front, side = input_data.front_landmarks, input_data.side_landmarks
+    return (
+        front.points(),
+        (front.image_width, front.image_height),
+        side.points(),
+        (side.image_width, side.image_height),
     )
 
-    # Check key landmarks visibility (shoulders, hips, knees, ankles)
-    key_indices = [11, 12, 23, 24, 25, 26, 27, 28]
-    key_visibility_front = sum(front_landmarks.landmarks[i].visibility for i in key_indices) / len(key_indices)
-    key_visibility_side = sum(side_landmarks.landmarks[i].visibility for i in key_indices) / len(key_indices)
-    key_visibility_avg = (key_visibility_front + key_visibility_side) / 2
-
-    # Accuracy estimation based on visibility
-    if avg_visibility > 0.85 and key_visibility_avg > 0.9:
-        return 0.95
-    elif avg_visibility > 0.7 and key_visibility_avg > 0.75:
-        return 0.90
-    elif avg_visibility > 0.5 and key_visibility_avg > 0.6:
-        return 0.85
+
+def _compute_measurements(input_data: MeasurementInput) -> tuple:
+    """Compute ``(measurements, source, accuracy)`` for a validated input."""
+
+    # Calculate measurements from MediaPipe landmarks if available
+    if input_data.front_landmarks and input_data.side_landmarks:
+        measurements, accuracy = landmark_core(*landmark_core_args(input_data))
+        source = "mediapipe"
     else:
-        return 0.80
+        measurements = _user_input_measurements(input_data)
+        source = "user_input"
+        accuracy = 1.0  # Assume user input is accurate
+    return measurements, source, accuracy
+
+
+def _raise_for_unknown_fields(
+    input_data: MeasurementInput, raw_payload: Dict | None
+) -> None:
+    """Reject user-input payloads carrying non-canonical field names."""
+
+    if input_data.front_landmarks or input_data.side_landmarks:
+        return
+    errors = _unknown_field_errors(_payload_keys(input_data, raw_payload))
+    if errors:
+        raise HTTPException(
+            status_code=422,
+            detail=ErrorResponse(
+                type="validation_error",
+                code="unknown_field",
+                message="Invalid measurement field names",
+                errors=errors,
+                session_id=input_data.session_id,
+            ).model_dump(),
+        )
 
 
 def normalize_and_validate(
@@ -337,7 +336,8 @@ def normalize_and_validate(
     Normalize measurement input to centimeters and validate field names.
     
     If MediaPipe landmarks are provided, calculate measurements from landmarks.
-    Otherwise, use user-provided measurements.
+    Otherwise, use user-provided measurements. Computed measurements are
+    served from ``result_cache`` when an identical payload was seen recently.
     
     Args:
         input_data: Raw measurement input with optional MediaPipe landmarks
@@ -349,91 +349,112 @@ def normalize_and_validate(
     Raises:
         HTTPException with 422 status for validation errors
     """
-    errors = []
+    _raise_for_unknown_fields(input_data, raw_payload)
+
+    key = result_cache_key(input_data)
+    cached = result_cache.get(key)
+    if cached is None:
+        cached = _compute_measurements(input_data)
+        result_cache.set(key, cached)
+    measurements, source, accuracy = cached
+
+    return _build_normalized(input_data, measurements, source, accuracy)
+
+
+async def normalize_and_validate_offloaded(
+    input_data: MeasurementInput, executor: BoundedExecutor
+) -> MeasurementNormalized:
+    """
+    ``normalize_and_validate`` with landmark math run on ``executor``.
+    
+    Validation and the result cache stay on the caller's event loop; only a
+    cache miss with landmarks is shipped to the pool.
     
-    # Check for unknown fields in user-provided measurements
-    if not input_data.front_landmarks and not input_data.side_landmarks:
-        if raw_payload is None:
-            input_dict = (
-                input_data.model_dump(exclude_unset=True)
-                if hasattr(input_data, "model_dump")
-                else input_data.dict(exclude_unset=True)
+    Raises:
+        HTTPException with 422 status for validation errors
+        ExecutorSaturated when the pool cannot accept more work
+    """
+    _raise_for_unknown_fields(input_data, None)
+
+    key = result_cache_key(input_data)
+    cached = result_cache.get(key)
+    if cached is None:
+        if input_data.front_landmarks and input_data.side_landmarks:
+            measurements, accuracy = await executor.run(
+                landmark_core, *landmark_core_args(input_data)
             )
-            keys = set(input_dict.keys())
+            cached = (measurements, "mediapipe", accuracy)
         else:
-            keys = set(raw_payload.keys())
-
-        for field_name in keys:
-            if field_name not in CANONICAL_FIELDS and field_name not in ALLOWED_META_FIELDS:
-                errors.append(
-                    ErrorDetail(
-                        field=field_name,
-                        message=f"Unknown field: {field_name}",
-                        hint=f"Did you mean one of: {', '.join(sorted(CANONICAL_FIELDS))}?",
-                    )
-                )
+            cached = _compute_measurements(input_data)
+        result_cache.set(key, cached)
+    measurements, source, accuracy = cached
+
+    return _build_normalized(input_data, measurements, source, accuracy)
+
+
+def normalize_and_validate_batch(
+    inputs: Sequence[MeasurementInput],
+    raw_payloads: Sequence[Dict | None] | None = None,
+) -> List[MeasurementNormalized | ErrorResponse]:
+    """
+    Normalize many measurement inputs in one pass.
     
-    if errors:
-        raise HTTPException(
-            status_code=422,
-            detail=ErrorResponse(
-                type="validation_error",
-                code="unknown_field",
-                message="Invalid measurement field names",
-                errors=errors,
-                session_id=input_data.session_id,
-            ).model_dump(),
-        )
+    Items carrying both landmark views are stacked into a single
+    (N, 2, 33, 4) tensor and evaluated by the vectorized engine at once;
+    user-input items are converted individually. Failures are reported per
+    item as an ``ErrorResponse`` so one bad item never fails the batch.
     
-    # Calculate measurements from MediaPipe landmarks if available
-    if input_data.front_landmarks and input_data.side_landmarks:
-        measurements = calculate_measurements_from_landmarks(
-            input_data.front_landmarks,
-            input_data.side_landmarks
-        )
-        source = "mediapipe"
-        accuracy = estimate_accuracy(
-            measurements, input_data.front_landmarks, input_data.side_landmarks
-        )
+    Args:
+        inputs: Parsed measurement inputs
+        raw_payloads: Optional raw payload dicts aligned with ``inputs``
         
-        # Store landmarks for provenance
-        front_landmarks_id = str(uuid.uuid4())
-        side_landmarks_id = str(uuid.uuid4())
-        # TODO: Store landmarks in database
-        confidence = accuracy
+    Returns:
+        One ``MeasurementNormalized`` or ``ErrorResponse`` per input, in order
+    """
+    raw_payloads = raw_payloads or [None] * len(inputs)
+    results: List[MeasurementNormalized | ErrorResponse | None] = [None] * len(inputs)
+    landmark_rows: List[int] = []
+    views: List[np.ndarray] = []
+    dimensions: List[tuple] = []
 
-    else:
-        # Use user-provided measurements and convert to cm
-        unit = input_data.unit or Unit.CM
-        measurements = {}
-        
-        for field in CANONICAL_FIELDS:
-            value = getattr(input_data, field, None)
-            if value is not None:
-                if unit == Unit.IN:
-                    measurements[f"{field}_cm"] = inches_to_cm(value)
-                else:
-                    measurements[f"{field}_cm"] = value
-        
-        source = "user_input"
-        accuracy = 1.0  # Assume user input is accurate
-        confidence = accuracy
-        front_landmarks_id = None
-        side_landmarks_id = None
+    for index, (input_data, raw_payload) in enumerate(zip(inputs, raw_payloads)):
+        front_view, side_view = input_data.front_landmarks, input_data.side_landmarks
+        if front_view and side_view:
+            landmark_rows.append(index)
+            views.append(np.stack([front_view.points(), side_view.points()]))
+            dimensions.append(
+                (
+                    (front_view.image_width, side_view.image_width),
+                    (front_view.image_height, side_view.image_height),
+                )
+            )
+            continue
 
-    session_id = input_data.session_id or str(uuid.uuid4())
+        if not front_view and not side_view:
+            errors = _unknown_field_errors(_payload_keys(input_data, raw_payload))
+            if errors:
+                results[index] = ErrorResponse(
+                    type="validation_error",
+                    code="unknown_field",
+                    message="Invalid measurement field names",
+                    errors=errors,
+                    session_id=input_data.session_id,
+                )
+                continue
 
-    normalized_kwargs = {
-        **measurements,
-        "source": source,
-        "model_version": "v1.0-mediapipe",
-        "confidence": confidence,
-        "accuracy_estimate": accuracy,
-        "session_id": session_id,
-        "front_photo_url": input_data.front_photo_url,
-        "side_photo_url": input_data.side_photo_url,
-        "front_landmarks_id": front_landmarks_id,
-        "side_landmarks_id": side_landmarks_id,
-    }
+        results[index] = _build_normalized(
+            input_data, _user_input_measurements(input_data), "user_input", 1.0
+        )
+
+    if landmark_rows:
+        points = np.stack(views)  # (N, 2, 33, 4)
+        dims = np.asarray(dimensions, dtype=np.float64)  # (N, [width, height], 2)
+        pixels = denormalize(points, dims[:, 0], dims[:, 1])
+        values = compute_measurements(pixels[:, 0], pixels[:, 1])
+        accuracies = estimate_accuracy_array(points[:, 0], points[:, 1])
+        for index, row, accuracy in zip(landmark_rows, values, accuracies.tolist()):
+            results[index] = _build_normalized(
+                inputs[index], measurements_to_dict(row), "mediapipe", accuracy
+            )
 
-    return MeasurementNormalized(**normalized_kwargs)
+    return results
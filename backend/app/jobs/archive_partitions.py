@@ -0,0 +1,336 @@
+"""Archive measurement months past retention to Parquet, then drop them.
+
+Run daily, e.g. from cron::
+
+    python -m backend.app.jobs.archive_partitions --archive-dir /data/archive
+
+Every month older than ``--retention-months`` (default 12 full months before
+the current one) is exported from ``measurement_sessions``,
+``mediapipe_landmarks`` and ``normalized_measurements`` to
+``<archive-dir>/<table>/<table>_YYYY_MM.parquet`` (zstd, one row group per
+``--fetch-size`` rows, read through a server-side cursor). Each file is
+written under a temporary name, its row count is checked against the
+database, and only then renamed into place. Once all three tables are
+exported, the month is dropped from all of them in one transaction. On
+Postgres that means detaching and dropping the ``<table>_pYYYY_MM``
+partitions from ``005_partition_measurement_tables.sql``; the SQLite
+stand-in deletes the rows. The job also pre-creates the next
+``--months-ahead`` partitions. Re-running is safe: an archived month no
+longer exists to export.
+
+Requires ``pyarrow``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from backend.app.core.config import settings
+from backend.app.core.database import ConnectionPool, connection_pool
+
+
+logger = logging.getLogger(__name__)
+
+# Archived columns per table; kinds map to Parquet types in ``_schema``.
+ARCHIVE_COLUMNS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "measurement_sessions": (
+        ("id", "string"),
+        ("session_id", "string"),
+        ("source_type", "string"),
+        ("platform", "string"),
+        ("device_id", "string"),
+        ("front_photo_url", "string"),
+        ("side_photo_url", "string"),
+        ("created_at", "timestamp"),
+    ),
+    "mediapipe_landmarks": (
+        ("id", "string"),
+        ("session_id", "string"),
+        ("view", "string"),
+        ("landmarks", "string"),
+        ("landmarks_f32", "binary"),
+        ("image_width", "int"),
+        ("image_height", "int"),
+        ("timestamp", "string"),
+        ("created_at", "timestamp"),
+    ),
+    "normalized_measurements": (
+        ("id", "string"),
+        ("session_id", "string"),
+        ("payload", "string"),
+        ("source", "string"),
+        ("model_version", "string"),
+        ("confidence", "float"),
+        ("accuracy_estimate", "float"),
+        ("created_at", "timestamp"),
+    ),
+}
+_PARTITION_NAME = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+@dataclass
+class ArchiveReport:
+    """What one archival run exported and dropped."""
+
+    months: List[str] = field(default_factory=list)
+    rows: Dict[str, int] = field(default_factory=dict)
+    bytes_written: int = 0
+    elapsed_seconds: float = 0.0
+
+    def summary(self) -> str:
+        counts = ", ".join(f"{table} {count}" for table, count in self.rows.items())
+        return (
+            f"archived {len(self.months)} months ({', '.join(self.months) or 'none'}) "
+            f"in {self.elapsed_seconds:.1f}s: {counts or 'no rows'}, "
+            f"{self.bytes_written / 1e6:.1f} MB of Parquet"
+        )
+
+
+def _month_start(day: dt.date) -> dt.date:
+    return day.replace(day=1)
+
+
+def _add_months(month: dt.date, months: int) -> dt.date:
+    index = month.year * 12 + month.month - 1 + months
+    return dt.date(index // 12, index % 12 + 1, 1)
+
+
+def retention_cutoff(today: dt.date, retention_months: int) -> dt.date:
+    """First month that is kept; every earlier month is archived."""
+
+    return _add_months(_month_start(today), -retention_months)
+
+
+def stored_months(pool: ConnectionPool) -> List[dt.date]:
+    """Months that hold data (SQLite) or have a partition (Postgres)."""
+
+    months = set()
+    with pool.connection() as connection:
+        cursor = connection.cursor()
+        if pool.dialect == "postgresql":
+            cursor.execute(
+                "select child.relname from pg_inherits "
+                "join pg_class parent on parent.oid = pg_inherits.inhparent "
+                "join pg_class child on child.oid = pg_inherits.inhrelid "
+                "where parent.relname = any(%s)",
+                (list(ARCHIVE_COLUMNS),),
+            )
+            for (name,) in cursor.fetchall():
+                match = _PARTITION_NAME.search(name)
+                if match:
+                    months.add(dt.date(int(match[1]), int(match[2]), 1))
+        else:
+            for table in ARCHIVE_COLUMNS:
+                cursor.execute(f"select distinct substr(created_at, 1, 7) from {table}")
+                months.update(
+                    dt.date(int(value[:4]), int(value[5:7]), 1)
+                    for (value,) in cursor.fetchall()
+                    if value
+                )
+    return sorted(months)
+
+
+def _partition(table: str, month: dt.date) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def _schema(table: str):
+    import pyarrow as pa
+
+    types = {
+        "string": pa.string(),
+        "binary": pa.binary(),
+        "int": pa.int32(),
+        "float": pa.float64(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in ARCHIVE_COLUMNS[table]])
+
+
+def _convert(kind: str, value):
+    if value is None:
+        return None
+    if kind == "string":
+        if isinstance(value, str):
+            return value
+        return json.dumps(value) if isinstance(value, (dict, list)) else str(value)
+    if kind == "binary":
+        return bytes(value)
+    if kind == "timestamp":
+        if isinstance(value, str):
+            value = dt.datetime.fromisoformat(value)
+        return value if value.tzinfo else value.replace(tzinfo=dt.timezone.utc)
+    if kind == "float":
+        return float(value)
+    return value
+
+
+def export_month(
+    pool: ConnectionPool, table: str, month: dt.date, path: Path, fetch_size: int
+) -> int:
+    """Write one table's rows for ``month`` to ``path``; returns the row count.
+
+    Raises:
+        RuntimeError: If the exported count differs from the database count
+    """
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = ARCHIVE_COLUMNS[table]
+    schema = _schema(table)
+    start, end = month.isoformat(), _add_months(month, 1).isoformat()
+    p = pool.placeholder
+    where = f"where created_at >= {p} and created_at < {p}"
+    # On Postgres read the partition itself, so the export is exactly what
+    # drop_month detaches and drops.
+    source = _partition(table, month) if pool.dialect == "postgresql" else table
+    select = ", ".join(name for name, _ in columns)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".parquet.tmp")
+    exported = 0
+
+    connection = pool.acquire()
+    try:
+        cursor = connection.cursor()
+        cursor.execute(f"select count(*) from {source} {where}", (start, end))
+        expected = cursor.fetchone()[0]
+        stream = pool.streaming_cursor(connection, f"archive_{table}", fetch_size)
+        stream.execute(f"select {select} from {source} {where} order by created_at", (start, end))
+        with pq.ParquetWriter(partial, schema, compression="zstd") as writer:
+            while True:
+                rows = stream.fetchmany(fetch_size)
+                if not rows:
+                    break
+                arrays = [
+                    pa.array(
+                        [_convert(kind, row[index]) for row in rows],
+                        type=schema.field(index).type,
+                    )
+                    for index, (_, kind) in enumerate(columns)
+                ]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                exported += len(rows)
+        stream.close()
+        connection.rollback()
+    finally:
+        pool.release(connection)
+
+    if exported != expected:
+        partial.unlink(missing_ok=True)
+        raise RuntimeError(
+            f"{table} {month:%Y-%m}: exported {exported} rows but {expected} are stored"
+        )
+    os.replace(partial, path)
+    return exported
+
+
+def drop_month(pool: ConnectionPool, month: dt.date) -> None:
+    """Remove ``month`` from every measurement table in one transaction."""
+
+    with pool.connection() as connection:
+        cursor = connection.cursor()
+        # Children first, so the SQLite stand-in's cascades never fire.
+        for table in reversed(list(ARCHIVE_COLUMNS)):
+            if pool.dialect == "postgresql":
+                partition = _partition(table, month)
+                cursor.execute(f"alter table {table} detach partition {partition}")
+                cursor.execute(f"drop table {partition}")
+            else:
+                cursor.execute(
+                    f"delete from {table} where created_at >= ? and created_at < ?",
+                    (month.isoformat(), _add_months(month, 1).isoformat()),
+                )
+
+
+def ensure_partitions(pool: ConnectionPool, today: dt.date, months_ahead: int) -> None:
+    """Pre-create this month's and the next ``months_ahead`` partitions."""
+
+    if pool.dialect != "postgresql":
+        return
+    with pool.connection() as connection:
+        connection.cursor().execute(
+            "select ensure_measurement_partitions(%s, %s)", (_month_start(today), months_ahead)
+        )
+
+
+def archive_partitions(
+    pool: ConnectionPool,
+    archive_dir: Path | str,
+    retention_months: int = 12,
+    months_ahead: int = 3,
+    fetch_size: int = 50000,
+    today: dt.date | None = None,
+    dry_run: bool = False,
+) -> ArchiveReport:
+    """Export and drop every month before the retention cutoff, oldest first."""
+
+    today = today or dt.date.today()
+    archive_dir = Path(archive_dir)
+    report = ArchiveReport()
+    started = time.perf_counter()
+    if not dry_run:
+        ensure_partitions(pool, today, months_ahead)
+    cutoff = retention_cutoff(today, retention_months)
+    for month in stored_months(pool):
+        if month >= cutoff:
+            break
+        label = f"{month:%Y-%m}"
+        if dry_run:
+            report.months.append(label)
+            continue
+        for table in ARCHIVE_COLUMNS:
+            path = archive_dir / table / f"{table}_{month:%Y_%m}.parquet"
+            count = export_month(pool, table, month, path, fetch_size)
+            report.rows[table] = report.rows.get(table, 0) + count
+            report.bytes_written += path.stat().st_size
+        drop_month(pool, month)
+        report.months.append(label)
+        logger.info("archived %s", label)
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--archive-dir", required=True, type=Path)
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--retention-months", type=int, default=12)
+    parser.add_argument("--months-ahead", type=int, default=3)
+    parser.add_argument("--fetch-size", type=int, default=50000)
+    parser.add_argument("--dry-run", action="store_true", help="list months without exporting")
+    args = parser.parse_args(argv)
+    if not args.database_url:
+        parser.error("set DATABASE_URL or pass --database-url")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    pool = connection_pool(args.database_url, 1)
+    try:
+        report = archive_partitions(
+            pool,
+            args.archive_dir,
+            retention_months=args.retention_months,
+            months_ahead=args.months_ahead,
+            fetch_size=args.fetch_size,
+            dry_run=args.dry_run,
+        )
+    finally:
+        pool.close()
+    if args.dry_run:
+        print(f"would archive: {', '.join(report.months) or 'nothing'}")
+    else:
+        print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,40 @@
+"""Convert JSON ``mediapipe_landmarks`` rows to packed float32.
+
+Run after applying ``003_packed_landmarks.sql``::
+
+    python -m backend.app.jobs.backfill_landmarks --batch-size 500
+
+Uses ``DATABASE_URL`` unless ``--database-url`` is given. The job is
+idempotent and can be interrupted and re-run at any point.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from backend.app.core.config import settings
+from backend.app.core.database import connection_pool
+from backend.app.core.provenance import backfill_packed_landmarks
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+    if not args.database_url:
+        parser.error("set DATABASE_URL or pass --database-url")
+
+    pool = connection_pool(args.database_url, 1)
+    started = time.perf_counter()
+    try:
+        converted = backfill_packed_landmarks(pool, args.batch_size)
+    finally:
+        pool.close()
+    print(f"converted {converted} landmark rows in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,308 @@
+"""Recompute measurements for every stored session under a new model version.
+
+Run after shipping a landmark model change::
+
+    python -m backend.app.jobs.replay_measurements --model-version v1.1-mediapipe
+
+``mediapipe_landmarks`` is streamed in ``session_id`` order through a
+server-side cursor (see ``ConnectionPool.streaming_cursor``). The latest front
+and side capture of each session are decoded into arrays, and chunks of
+``--chunk-size`` sessions are evaluated on a process pool by the same
+vectorized engine that backs ``calculate_measurements_from_landmarks`` and
+``estimate_accuracy``. Each chunk's ``normalized_measurements`` rows are
+written with one multi-row insert, in the same transaction as the chunk's
+checkpoint in ``measurement_replays``. Re-running with the same model version
+resumes after the last committed chunk without writing any session twice.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from backend.app.core.config import settings
+from backend.app.core.landmarks import (
+    compute_measurements,
+    denormalize,
+    estimate_accuracy_array,
+    measurements_to_dict,
+)
+from backend.app.core.database import ConnectionPool, connection_pool
+from backend.app.core.provenance import decode_landmarks
+from backend.app.schemas.measure_schema import MeasurementNormalized
+
+
+logger = logging.getLogger(__name__)
+
+# One stored view: (id, landmarks_f32, landmarks, image_width, image_height)
+StoredView = Tuple[str, Optional[bytes], Optional[str], int, int]
+
+
+@dataclass
+class ReplayReport:
+    """Throughput summary of one replay run."""
+
+    model_version: str
+    resumed_after: Optional[str]
+    sessions: int = 0
+    chunks: int = 0
+    skipped: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def sessions_per_second(self) -> float:
+        return self.sessions / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"replayed {self.sessions} sessions as {self.model_version} in "
+            f"{self.chunks} chunks, {self.elapsed_seconds:.1f}s "
+            f"({self.sessions_per_second:.0f} sessions/s, {self.skipped} skipped)"
+        )
+
+
+def stored_sessions(
+    pool: ConnectionPool, connection, after: str, fetch_size: int
+) -> Iterator[Tuple[str, Optional[StoredView], Optional[StoredView]]]:
+    """``(session_id, front, side)`` for every session after ``after``.
+
+    Rows are read in ``fetch_size`` batches; a session's latest capture of
+    each view wins.
+    """
+
+    cursor = pool.streaming_cursor(connection, "replay_landmarks", fetch_size)
+    cursor.execute(
+        "select session_id, view, id, landmarks_f32, landmarks, image_width, image_height "
+        f"from mediapipe_landmarks where session_id > {pool.placeholder} "
+        "order by session_id, created_at, id",
+        (after,),
+    )
+    current, views = None, {}
+    for session_id, view, *stored in cursor:
+        if session_id != current:
+            if current is not None:
+                yield current, views.get("front"), views.get("side")
+            current, views = session_id, {}
+        views[view] = tuple(stored)
+    if current is not None:
+        yield current, views.get("front"), views.get("side")
+    cursor.close()
+
+
+def replay_chunk(
+    session_ids: List[str],
+    landmark_ids: List[Tuple[str, str]],
+    points: np.ndarray,
+    dims: np.ndarray,
+    model_version: str,
+) -> List[tuple]:
+    """``normalized_measurements`` rows for a chunk of sessions.
+
+    ``points`` is ``(N, 2, 33, 4)`` (front, side) and ``dims`` is
+    ``(N, [width, height], 2)``, the layout ``normalize_and_validate_batch``
+    uses. Runs in a worker process.
+    """
+
+    pixels = denormalize(points, dims[:, 0], dims[:, 1])
+    values = compute_measurements(pixels[:, 0], pixels[:, 1])
+    accuracies = estimate_accuracy_array(points[:, 0], points[:, 1]).tolist()
+    rows = []
+    for session_id, (front_id, side_id), row, accuracy in zip(
+        session_ids, landmark_ids, values, accuracies
+    ):
+        payload = MeasurementNormalized(
+            **measurements_to_dict(row),
+            source="mediapipe",
+            model_version=model_version,
+            confidence=accuracy,
+            accuracy_estimate=accuracy,
+            session_id=session_id,
+            front_landmarks_id=front_id,
+            side_landmarks_id=side_id,
+        )
+        rows.append(
+            (
+                session_id,
+                payload.model_dump_json(exclude_none=True),
+                "mediapipe",
+                model_version,
+                accuracy,
+                accuracy,
+            )
+        )
+    return rows
+
+
+def _chunk_args(sessions: List[tuple], model_version: str) -> tuple:
+    fronts = decode_landmarks((front[1], front[2]) for _, front, _ in sessions)
+    sides = decode_landmarks((side[1], side[2]) for _, _, side in sessions)
+    dims = np.array(
+        [
+            ((front[3], side[3]), (front[4], side[4]))
+            for _, front, side in sessions
+        ],
+        dtype=np.float64,
+    )
+    return (
+        [session_id for session_id, _, _ in sessions],
+        [(front[0], side[0]) for _, front, side in sessions],
+        np.stack([fronts, sides], axis=1),
+        dims,
+        model_version,
+    )
+
+
+def _chunks(
+    sessions: Iterable[tuple], chunk_size: int, report: ReplayReport
+) -> Iterator[List[tuple]]:
+    chunk = []
+    for session in sessions:
+        if session[1] is None or session[2] is None:
+            report.skipped += 1
+            continue
+        chunk.append(session)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _write_chunk(
+    pool: ConnectionPool,
+    rows: List[tuple],
+    model_version: str,
+    last_session_id: str,
+    total_sessions: int,
+) -> None:
+    """Insert one chunk and advance the checkpoint in a single transaction."""
+
+    p = pool.placeholder
+    values = ", ".join([f"({', '.join([p] * 6)})"] * len(rows))
+    with pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(
+            "insert into normalized_measurements "
+            "(session_id, payload, source, model_version, confidence, accuracy_estimate) "
+            f"values {values}",
+            [value for row in rows for value in row],
+        )
+        cursor.execute(
+            "insert into measurement_replays (model_version, last_session_id, sessions) "
+            f"values ({p}, {p}, {p}) on conflict (model_version) do update set "
+            "last_session_id = excluded.last_session_id, sessions = excluded.sessions, "
+            "updated_at = current_timestamp",
+            (model_version, last_session_id, total_sessions),
+        )
+
+
+def _checkpoint(pool: ConnectionPool, model_version: str) -> Tuple[Optional[str], int]:
+    with pool.connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(
+            "select last_session_id, sessions from measurement_replays "
+            f"where model_version = {pool.placeholder}",
+            (model_version,),
+        )
+        row = cursor.fetchone()
+    return (row[0], row[1]) if row else (None, 0)
+
+
+def replay_measurements(
+    pool: ConnectionPool,
+    model_version: str,
+    chunk_size: int = 500,
+    workers: int = 0,
+    fetch_size: int = 2000,
+) -> ReplayReport:
+    """Replay every stored session not yet covered by ``model_version``.
+
+    ``workers=0`` evaluates chunks in this process. At most ``2 * workers``
+    chunks are in flight, and chunks are committed in ``session_id`` order so
+    the checkpoint never skips past unwritten sessions. ``pool`` needs room
+    for two connections: one holds the streaming read, the other commits.
+    """
+
+    resumed_after, done = _checkpoint(pool, model_version)
+    report = ReplayReport(model_version=model_version, resumed_after=resumed_after)
+    started = time.perf_counter()
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    limit = 2 * workers if executor is not None else 1
+    in_flight: deque = deque()
+
+    def commit_oldest() -> None:
+        nonlocal done
+        future, last_session_id = in_flight.popleft()
+        rows = future.result() if isinstance(future, Future) else future
+        done += len(rows)
+        _write_chunk(pool, rows, model_version, last_session_id, done)
+        report.sessions += len(rows)
+        report.chunks += 1
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "chunk %d committed through %s (%d sessions, %.0f sessions/s)",
+            report.chunks,
+            last_session_id,
+            report.sessions,
+            report.sessions / elapsed if elapsed else 0.0,
+        )
+
+    connection = pool.acquire()
+    try:
+        sessions = stored_sessions(pool, connection, resumed_after or "", fetch_size)
+        for chunk in _chunks(sessions, chunk_size, report):
+            args = _chunk_args(chunk, model_version)
+            work = executor.submit(replay_chunk, *args) if executor else replay_chunk(*args)
+            in_flight.append((work, chunk[-1][0]))
+            while len(in_flight) >= limit:
+                commit_oldest()
+        while in_flight:
+            commit_oldest()
+    finally:
+        connection.rollback()
+        pool.release(connection)
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model-version", required=True)
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--fetch-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+    if not args.database_url:
+        parser.error("set DATABASE_URL or pass --database-url")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    pool = connection_pool(args.database_url, 2)
+    try:
+        report = replay_measurements(
+            pool,
+            args.model_version,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            fetch_size=args.fetch_size,
+        )
+    finally:
+        pool.close()
+    if report.resumed_after:
+        print(f"resumed after session {report.resumed_after}")
+    print(report.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
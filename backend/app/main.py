@@ -1,9 +1,52 @@
 """FitTwin DMaaS API application entry point."""
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
+from backend.app.core.config import settings
+from backend.app.core.database import database, database_health
+from backend.app.core.executor import compute_executor
+from backend.app.core.idempotency import idempotency_store
+from backend.app.core.latest_results import latest_results
+from backend.app.core.provenance import provenance_writer
+from backend.app.core.validation import result_cache
+from backend.app.routers.dmaas import router as dmaas_router
 from backend.app.routers.measurements import router as measurements_router
+from backend.app.routers.measurements import verify_api_key
+from backend.app.schemas.errors import ErrorResponse
+from backend.app.services.fit_index import fit_history
+from backend.app.services.recommendation_cache import recommendation_cache
+from backend.app.services.reference_data import reference_data
+from backend.app.services.vendor_client import vendor_client
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Start background pollers; drain queues and pools on shutdown."""
+    watchers = []
+    if settings.reference_reload_interval_seconds > 0:
+        watchers.append(
+            asyncio.create_task(reference_data.watch(settings.reference_reload_interval_seconds))
+        )
+    if database is not None and settings.database_health_interval_seconds > 0:
+        watchers.append(
+            asyncio.create_task(database_health.watch(settings.database_health_interval_seconds))
+        )
+    yield
+    for watcher in watchers:
+        watcher.cancel()
+        with suppress(asyncio.CancelledError):
+            await watcher
+    compute_executor.shutdown()
+    if vendor_client is not None:
+        await vendor_client.aclose()
+    if provenance_writer is not None:
+        await asyncio.to_thread(provenance_writer.close)
+    if database is not None:
+        database.close()
 
 
 app = FastAPI(
@@ -16,6 +59,7 @@ app = FastAPI(
     version="1.0.0-mediapipe-mvp",
     contact={"name": "FitTwin Support", "email": "support@fittwin.com"},
     license_info={"name": "Proprietary"},
+    lifespan=lifespan,
 )
 
 # Allow cross-origin requests during development; tighten when deploying.
@@ -29,6 +73,7 @@ app.add_middleware(
 
 # Register routers
 app.include_router(measurements_router)
+app.include_router(dmaas_router)
 
 
 @app.get("/")
@@ -44,15 +89,56 @@ def root():
 
 @app.get("/health")
 def health():
-    """Detailed health probe for monitoring."""
+    """Detailed health probe for monitoring.
+
+    The database entry is the cached result of the background readiness
+    check; serving it never queries the database.
+    """
+    check = database_health.snapshot()
     return {
-        "status": "healthy",
-        "database": "connected",  # TODO: add real DB check
+        "status": "degraded" if check["status"] == "unavailable" else "healthy",
+        "database": check["status"],
+        "database_check": check,
         "mediapipe": "available",
         "version": "1.0.0-mediapipe-mvp",
     }
 
 
+@app.get("/metrics")
+def metrics():
+    """In-process cache and service counters for monitoring."""
+    return {
+        "result_cache": result_cache.stats(),
+        "idempotency": idempotency_store.stats(),
+        "compute_executor": compute_executor.stats(),
+        "fit_index": fit_history.stats(),
+        "recommendation_cache": recommendation_cache.stats(),
+        "reference_data": reference_data.stats(),
+        "latest_results": latest_results.stats(),
+        "database_pool": database.stats() if database is not None else None,
+        "provenance": provenance_writer.stats() if provenance_writer is not None else None,
+        "vendor": vendor_client.stats() if vendor_client is not None else None,
+    }
+
+
+@app.post("/admin/reload", dependencies=[Depends(verify_api_key)])
+def reload_reference_data():
+    """Recompile size charts, catalog and fit notes and swap them in."""
+    try:
+        reloaded = reference_data.reload(force=True)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=422,
+            detail=ErrorResponse(
+                type="validation_error",
+                code="invalid_reference_data",
+                message=f"Reference data rejected; previous version still serving: {exc}",
+                errors=[],
+            ).model_dump(),
+        ) from exc
+    return {"reloaded": reloaded, **reference_data.stats()}
+
+
 if __name__ == "__main__":
     import uvicorn
 
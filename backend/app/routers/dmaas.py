@@ -0,0 +1,62 @@
+"""DMaaS polling endpoints for agents and integrations."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+
+from backend.app.core.latest_results import latest_results
+from backend.app.routers.measurements import verify_api_key
+from backend.app.schemas.errors import ErrorResponse
+from backend.app.schemas.measure_schema import MeasurementNormalized
+
+
+router = APIRouter(prefix="/dmaas", tags=["dmaas"])
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 9110 weak comparison of ``If-None-Match`` against ``etag``."""
+
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+@router.get(
+    "/latest",
+    response_model=MeasurementNormalized,
+    dependencies=[Depends(verify_api_key)],
+    responses={304: {"description": "Unchanged since the supplied ETag"}},
+)
+def dmaas_latest(
+    session_id: Optional[str] = Query(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+) -> Response:
+    """Latest normalized result, overall or for one session.
+
+    Served from memory. Send the previous ``ETag`` as ``If-None-Match`` to get
+    an empty 304 while nothing has changed.
+    """
+
+    entry = latest_results.get(session_id)
+    if entry is None:
+        raise HTTPException(
+            status_code=404,
+            detail=ErrorResponse(
+                type="not_found",
+                code="no_results",
+                message="No validated measurements yet"
+                if session_id is None
+                else "No validated measurements for this session",
+                errors=[],
+                session_id=session_id,
+            ).model_dump(),
+        )
+    body, etag = entry.rendered()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
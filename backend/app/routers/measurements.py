@@ -11,20 +11,59 @@ This module implements the two main DMaaS API endpoints:
 - /measurements/recommend: Generate size recommendations from normalized measurements
 """
 
+import hashlib
+import json
 import os
-from typing import Optional
+import uuid
+from typing import AsyncIterator, Awaitable, Callable, List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
 
-from backend.app.core.validation import normalize_and_validate
-from backend.app.schemas.errors import ErrorResponse
-from backend.app.schemas.measure_schema import MeasurementInput, MeasurementNormalized
+from backend.app.core.config import settings
+from backend.app.core.executor import ExecutorSaturated, compute_executor
+from backend.app.core.idempotency import IdempotencyConflict, idempotency_store
+from backend.app.core.streaming import MeasurementStream
+from backend.app.core.validation import (
+    MODEL_VERSION,
+    landmark_core,
+    landmark_core_args,
+    normalize_and_validate_batch,
+    normalize_and_validate_offloaded,
+)
+from backend.app.schemas.errors import ErrorDetail, ErrorResponse
+from backend.app.services.catalog import GarmentCatalog
+from backend.app.services.fit_index import fit_history
+from backend.app.services.recommendation_cache import recommendation_cache
+from backend.app.services.reference_data import ReferenceSnapshot, reference_data
+from backend.app.schemas.measure_schema import (
+    FitHistoryRecord,
+    MeasurementBatchItem,
+    MeasurementBatchRequest,
+    MeasurementBatchResponse,
+    MeasurementInput,
+    MeasurementNormalized,
+    MeasurementStreamFrame,
+)
 
 
 router = APIRouter(prefix="/measurements", tags=["measurements"])
 
 VALID_API_KEY = os.getenv("API_KEY", "staging-secret-key")
-MODEL_VERSION = "v1.0-mediapipe"
 
 
 def verify_api_key(x_api_key: Optional[str] = Header(default=None)) -> None:
@@ -42,23 +81,86 @@ def verify_api_key(x_api_key: Optional[str] = Header(default=None)) -> None:
         )
 
 
-@router.post(
-    "/validate",
-    response_model=MeasurementNormalized,
-    dependencies=[Depends(verify_api_key)],
-)
-async def validate_measurements(request: Request, input_data: MeasurementInput) -> dict:
-    """Validate and normalize measurement input."""
+async def _run_idempotent(
+    scope: str,
+    idempotency_key: Optional[str],
+    request: Request,
+    response: Response,
+    session_id: Optional[str],
+    compute: Callable[[], Awaitable[dict]],
+) -> dict:
+    """Run ``compute`` at most once per ``Idempotency-Key``.
+
+    Retried keys replay the stored response (flagged with an
+    ``Idempotent-Replayed`` header) and concurrent requests sharing a key wait
+    for the first one. Reusing a key with a different body or query is a 422.
+    """
 
+    if not idempotency_key:
+        return await compute()
+
+    fingerprint = hashlib.sha256(
+        request.url.query.encode() + b"\0" + await request.body()
+    ).hexdigest()
     try:
-        raw_payload = await request.json()
-    except Exception:  # pragma: no cover - best effort capture
-        raw_payload = None
+        payload, replayed = await idempotency_store.run(
+            f"{scope}:{idempotency_key}", fingerprint, compute
+        )
+    except IdempotencyConflict as exc:
+        raise HTTPException(
+            status_code=422,
+            detail=ErrorResponse(
+                type="validation_error",
+                code="idempotency_key_reused",
+                message="Idempotency-Key was already used with a different payload",
+                errors=[ErrorDetail(field="Idempotency-Key", message=idempotency_key)],
+                session_id=session_id,
+            ).model_dump(),
+        ) from exc
+
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return dict(payload)
+
+
+async def _parse_measurement_input(request: Request) -> MeasurementInput:
+    """Decode the request body straight into ``MeasurementInput``.
+
+    ``model_validate_json`` parses the bytes once in pydantic-core, so large
+    landmark payloads are never materialized as an intermediate dict. Unknown
+    fields land in the model's extras for the validation layer to report.
+    """
 
     try:
-        normalized = normalize_and_validate(input_data, raw_payload)
+        return MeasurementInput.model_validate_json(await request.body())
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in exc.errors(include_url=False)
+            ]
+        ) from exc
+
+
+async def _validated_measurements(input_data: MeasurementInput) -> MeasurementNormalized:
+    """Normalize one input on the compute pool, mapping failures to HTTP errors."""
+
+    try:
+        return await normalize_and_validate_offloaded(input_data, compute_executor)
     except HTTPException:
         raise
+    except ExecutorSaturated as exc:
+        raise HTTPException(
+            status_code=503,
+            detail=ErrorResponse(
+                type="server_error",
+                code="overloaded",
+                message="Measurement workers are saturated; retry shortly",
+                errors=[],
+                session_id=input_data.session_id,
+            ).model_dump(),
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
     except Exception as exc:  # pragma: no cover - defensive guard
         raise HTTPException(
             status_code=500,
@@ -71,44 +173,230 @@ async def validate_measurements(request: Request, input_data: MeasurementInput)
             ).model_dump(),
         ) from exc
 
+
+async def _validated_payload(input_data: MeasurementInput) -> dict:
+    """Normalize one input on the compute pool and render the response payload."""
+
+    normalized = await _validated_measurements(input_data)
     payload = normalized.model_dump(exclude_none=True)
     payload.setdefault("model_version", MODEL_VERSION)
     return payload
 
 
 @router.post(
-    "/recommend",
-    response_model=dict,
+    "/validate",
+    response_model=MeasurementNormalized,
     dependencies=[Depends(verify_api_key)],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {"schema": MeasurementInput.model_json_schema()}
+            },
+            "required": True,
+        }
+    },
 )
-def recommend_sizes(measurements: MeasurementNormalized) -> dict:
-    """Generate size recommendations from normalized measurements."""
+async def validate_measurements(
+    request: Request,
+    response: Response,
+    input_data: MeasurementInput = Depends(_parse_measurement_input),
+    idempotency_key: Optional[str] = Header(default=None),
+) -> dict:
+    """Validate and normalize measurement input."""
+
+    return await _run_idempotent(
+        "validate",
+        idempotency_key,
+        request,
+        response,
+        input_data.session_id,
+        lambda: _validated_payload(input_data),
+    )
+
+
+def _invalid_payload(exc: ValidationError, session_id: Optional[str]) -> ErrorResponse:
+    """Error envelope for a payload that failed schema validation."""
+
+    return ErrorResponse(
+        type="validation_error",
+        code="invalid_payload",
+        message="Measurement payload failed schema validation",
+        errors=[
+            ErrorDetail(
+                field=".".join(str(part) for part in error["loc"]),
+                message=error["msg"],
+            )
+            for error in exc.errors()
+        ],
+        session_id=session_id,
+    )
+
+
+@router.post(
+    "/validate/batch",
+    response_model=MeasurementBatchResponse,
+    response_model_exclude_none=True,
+    dependencies=[Depends(verify_api_key)],
+)
+def validate_measurements_batch(batch: MeasurementBatchRequest) -> dict:
+    """Validate and normalize many payloads, reporting errors per item.
+
+    Landmark math for every valid item runs as one tensor computation; each
+    item still receives its own result or ``ErrorResponse`` envelope.
+    """
+
+    results = [None] * len(batch.items)
+    parsed_rows = []
+    parsed_inputs = []
+
+    for index, item in enumerate(batch.items):
+        try:
+            parsed_inputs.append(MeasurementInput.model_validate(item))
+            parsed_rows.append(index)
+        except ValidationError as exc:
+            session_id = item.get("session_id")
+            results[index] = _invalid_payload(
+                exc, session_id if isinstance(session_id, str) else None
+            )
 
     try:
-        recs = [
-            {
-                "category": "tops",
-                "size": "M",
-                "confidence": 0.9,
-                "rationale": "Based on chest and waist measurements",
-            },
-            {
-                "category": "bottoms",
-                "size": "32",
-                "confidence": 0.85,
-                "rationale": "Based on waist and inseam measurements",
-            },
-        ]
+        outcomes = normalize_and_validate_batch(
+            parsed_inputs, [batch.items[index] for index in parsed_rows]
+        )
+    except Exception as exc:  # pragma: no cover - defensive guard
+        raise HTTPException(
+            status_code=500,
+            detail=ErrorResponse(
+                type="server_error",
+                code="internal",
+                message="An unexpected error occurred during batch validation",
+                errors=[],
+            ).model_dump(),
+        ) from exc
+
+    for index, outcome in zip(parsed_rows, outcomes):
+        results[index] = outcome
+
+    items = [
+        (
+            MeasurementBatchItem(index=index, status="error", error=outcome)
+            if isinstance(outcome, ErrorResponse)
+            else MeasurementBatchItem(index=index, status="ok", result=outcome)
+        )
+        for index, outcome in enumerate(results)
+    ]
+    failed = sum(1 for item in items if item.status == "error")
+    return {
+        "results": items,
+        "succeeded": len(items) - failed,
+        "failed": failed,
+        "model_version": MODEL_VERSION,
+    }
+
+
+def _catalog_recommendations(
+    snapshot: ReferenceSnapshot, profile: dict, top_k: int
+) -> tuple:
+    """Score the profile against every SKU of each catalog category.
+
+    The best match per category becomes the headline recommendation and the
+    ranked top-k list is returned under ``matches``.
+    """
+
+    matches = snapshot.catalog.match(profile, top_k)
+    notes = {category: snapshot.fit_notes.notes(profile, category) for category in matches}
+    return _catalog_headlines(snapshot.catalog, matches, notes), {
+        "matches": matches,
+        "catalog_version": snapshot.catalog.version,
+    }
+
 
-        processed = measurements.model_dump(exclude_none=True)
-        processed.setdefault("model_version", MODEL_VERSION)
+def _catalog_headlines(scored_catalog: GarmentCatalog, matches: dict, notes: dict) -> list:
+    """Best SKU per category as a recommendation entry with its fit notes."""
 
-        return {
-            "recommendations": recs,
-            "processed_measurements": processed,
-            "model_version": processed.get("model_version", MODEL_VERSION),
-            "session_id": processed.get("session_id"),
+    return [
+        {
+            "category": category,
+            "size": ranked[0]["size"],
+            "confidence": ranked[0]["confidence"],
+            "rationale": (
+                f"Closest of {len(scored_catalog.categories[category])} {category} SKUs "
+                f"on {', '.join(ranked[0]['dimensions'])}"
+            ),
+            "sku": ranked[0]["sku"],
+            "fit_notes": notes.get(category, []),
         }
+        for category, ranked in matches.items()
+        if ranked
+    ]
+
+
+def _neighbor_recommendations(profile: dict) -> tuple:
+    """Vote per category among the nearest shoppers in the fit history."""
+
+    votes = fit_history.vote(profile, settings.fit_index_neighbors)
+    recs = [
+        {
+            "category": category,
+            "size": vote["size"],
+            "confidence": vote["confidence"],
+            "rationale": f"Vote of {vote['neighbors']} nearest shoppers",
+        }
+        for category, vote in votes.items()
+    ]
+    return recs, {}
+
+
+def _recommendation_envelope(
+    measurements: MeasurementNormalized,
+    recs: list,
+    extra: dict,
+    mode: str,
+) -> dict:
+    """The ``recommend_sizes`` response contract around computed recommendations."""
+
+    processed = measurements.model_dump(exclude_none=True)
+    processed.setdefault("model_version", MODEL_VERSION)
+
+    return {
+        "recommendations": recs,
+        **extra,
+        "mode": mode,
+        "processed_measurements": processed,
+        "model_version": processed.get("model_version", MODEL_VERSION),
+        "session_id": processed.get("session_id"),
+    }
+
+
+def _recommendation_payload(
+    measurements: MeasurementNormalized,
+    top_k: int,
+    mode: str = "catalog",
+) -> dict:
+    """Build the recommendation response for normalized measurements.
+
+    ``catalog`` mode scores the profile against the SKU catalog in one
+    vectorized pass, served from ``recommendation_cache`` when the profile's
+    quantized bucket was scored before against the same reference data
+    snapshot; ``neighbors`` mode answers with a size vote of the most similar past
+    shoppers from the fit history index, which changes with every insert and
+    is never cached.
+    """
+
+    try:
+        profile = measurements.model_dump(exclude_none=True)
+        if mode == "neighbors":
+            recs, extra = _neighbor_recommendations(profile)
+        else:
+            snapshot = reference_data.current
+            recs, extra = recommendation_cache.get_or_compute(
+                profile,
+                snapshot.version,
+                top_k,
+                lambda bucket: _catalog_recommendations(snapshot, bucket, top_k),
+            )
+
+        return _recommendation_envelope(measurements, recs, extra, mode)
 
     except HTTPException:
         raise
@@ -124,3 +412,331 @@ def recommend_sizes(measurements: MeasurementNormalized) -> dict:
             ).model_dump(),
         ) from exc
 
+
+@router.post(
+    "/recommend",
+    response_model=dict,
+    dependencies=[Depends(verify_api_key)],
+)
+async def recommend_sizes(
+    request: Request,
+    measurements: MeasurementNormalized,
+    response: Response,
+    top_k: int = Query(default=settings.recommend_top_k, ge=1, le=100),
+    mode: Literal["catalog", "neighbors"] = Query(default="catalog"),
+    idempotency_key: Optional[str] = Header(default=None),
+) -> dict:
+    """Generate size recommendations from normalized measurements."""
+
+    async def compute() -> dict:
+        return _recommendation_payload(measurements, top_k, mode)
+
+    return await _run_idempotent(
+        "recommend",
+        idempotency_key,
+        request,
+        response,
+        measurements.session_id,
+        compute,
+    )
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """Streaming response whose body is produced while the request is read.
+
+    ``StreamingResponse`` listens for ``http.disconnect`` on ``receive`` in
+    parallel with sending, which would swallow request body chunks the
+    generator is still waiting for. Here the generator owns ``receive``;
+    ``request.stream()`` raises ``ClientDisconnect`` if the client goes away.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+@router.post(
+    "/validate-and-recommend",
+    response_model=dict,
+    dependencies=[Depends(verify_api_key)],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {"schema": MeasurementInput.model_json_schema()}
+            },
+            "required": True,
+        }
+    },
+)
+async def validate_and_recommend(
+    request: Request,
+    response: Response,
+    input_data: MeasurementInput = Depends(_parse_measurement_input),
+    top_k: int = Query(default=settings.recommend_top_k, ge=1, le=100),
+    mode: Literal["catalog", "neighbors"] = Query(default="catalog"),
+    idempotency_key: Optional[str] = Header(default=None),
+) -> dict:
+    """Validate raw input and recommend sizes in one round trip.
+
+    The ``MeasurementNormalized`` produced by validation is handed to the
+    recommender in memory. The response is the ``/measurements/recommend``
+    payload, whose ``processed_measurements`` holds the fields
+    ``/measurements/validate`` returns for the same input (nulls omitted).
+    """
+
+    async def compute() -> dict:
+        normalized = await _validated_measurements(input_data)
+        return _recommendation_payload(normalized, top_k, mode)
+
+    return await _run_idempotent(
+        "validate-and-recommend",
+        idempotency_key,
+        request,
+        response,
+        input_data.session_id,
+        compute,
+    )
+
+
+async def _ndjson_lines(request: Request, max_line_bytes: int) -> AsyncIterator[Optional[bytes]]:
+    """Yield non-blank lines of a streamed request body.
+
+    Only the newly received chunk is split; an unfinished line is kept as a
+    list of pieces. A line longer than ``max_line_bytes`` is discarded as it
+    arrives and reported as ``None``, so memory stays bounded by that limit.
+    """
+
+    pieces: List[bytes] = []
+    size = 0
+    oversized = False
+    async for chunk in request.stream():
+        *ends, tail = chunk.split(b"\n")
+        for end in ends:
+            if oversized or size + len(end) > max_line_bytes:
+                yield None
+            else:
+                line = b"".join(pieces) + end
+                if line.strip():
+                    yield line
+            pieces, size, oversized = [], 0, False
+        if oversized or size + len(tail) > max_line_bytes:
+            pieces, size, oversized = [], 0, True
+        elif tail:
+            pieces.append(tail)
+            size += len(tail)
+    if oversized:
+        yield None
+    elif pieces:
+        line = b"".join(pieces)
+        if line.strip():
+            yield line
+
+
+def _score_bulk_chunk(
+    snapshot: ReferenceSnapshot,
+    rows: List[Tuple[int, object]],
+    top_k: int,
+) -> bytes:
+    """Score one chunk of parsed profiles and render it as NDJSON lines."""
+
+    valid = [(index, item) for index, item in rows if isinstance(item, MeasurementNormalized)]
+    profiles = [item.model_dump(exclude_none=True) for _, item in valid]
+    scored_catalog = snapshot.catalog
+    matches = scored_catalog.match_many(profiles, top_k)
+    notes = snapshot.fit_notes.notes_many(profiles, list(scored_catalog.categories))
+    scored = dict(zip((index for index, _ in valid), zip(matches, notes)))
+
+    lines = []
+    for index, item in rows:
+        if isinstance(item, MeasurementNormalized):
+            line = {
+                "index": index,
+                "status": "ok",
+                **_recommendation_envelope(
+                    item,
+                    _catalog_headlines(scored_catalog, *scored[index]),
+                    {"matches": scored[index][0], "catalog_version": scored_catalog.version},
+                    "catalog",
+                ),
+            }
+        else:
+            line = {"index": index, "status": "error", "error": item.model_dump()}
+        lines.append(json.dumps(line, separators=(",", ":")))
+    return ("\n".join(lines) + "\n").encode()
+
+
+@router.post(
+    "/recommend/bulk",
+    dependencies=[Depends(verify_api_key)],
+    response_class=_DuplexStreamingResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/x-ndjson": {
+                    "schema": {"$ref": "#/components/schemas/MeasurementNormalized"}
+                }
+            },
+        }
+    },
+)
+async def recommend_sizes_bulk(
+    request: Request,
+    top_k: int = Query(default=settings.recommend_top_k, ge=1, le=100),
+) -> _DuplexStreamingResponse:
+    """Score NDJSON profiles against the catalog, streaming NDJSON results.
+
+    The body holds one ``MeasurementNormalized`` object per line. Profiles
+    are read and scored ``RECOMMEND_BULK_CHUNK_SIZE`` at a time with one
+    vectorized catalog pass per chunk, and each chunk's lines are sent before
+    the next is read, so memory stays bounded by the chunk size. Each output
+    line carries the ``recommend_sizes`` contract plus its input ``index``
+    and ``status``; lines that fail validation or exceed
+    ``RECOMMEND_BULK_MAX_LINE_BYTES`` carry an ``ErrorResponse``.
+    A final ``summary`` line reports the counts.
+    """
+
+    # Pin one snapshot so a reload mid-run cannot mix catalog versions.
+    snapshot = reference_data.current
+    chunk_size = max(1, settings.recommend_bulk_chunk_size)
+    max_line_bytes = max(1, settings.recommend_bulk_max_line_bytes)
+
+    async def results() -> AsyncIterator[bytes]:
+        rows: List[Tuple[int, object]] = []
+        index = failed = 0
+        async for line in _ndjson_lines(request, max_line_bytes):
+            if line is None:
+                error = ErrorResponse(
+                    type="validation_error",
+                    code="line_too_long",
+                    message=f"Line exceeds {max_line_bytes} bytes",
+                    errors=[],
+                )
+                rows.append((index, error))
+                failed += 1
+                index += 1
+                continue
+            try:
+                rows.append((index, MeasurementNormalized.model_validate_json(line)))
+            except ValidationError as exc:
+                rows.append((index, _invalid_payload(exc, None)))
+                failed += 1
+            index += 1
+            if len(rows) >= chunk_size:
+                yield await run_in_threadpool(_score_bulk_chunk, snapshot, rows, top_k)
+                rows = []
+        if rows:
+            yield await run_in_threadpool(_score_bulk_chunk, snapshot, rows, top_k)
+        summary = {
+            "succeeded": index - failed,
+            "failed": failed,
+            "catalog_version": snapshot.catalog.version,
+            "model_version": MODEL_VERSION,
+        }
+        yield (json.dumps({"summary": summary}, separators=(",", ":")) + "\n").encode()
+
+    return _DuplexStreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/fit-history",
+    response_model=dict,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(verify_api_key)],
+)
+def record_fit_history(record: FitHistoryRecord) -> dict:
+    """Add a shopper's profile and kept size to the nearest-neighbor index.
+
+    Inserts land in the category's buffer and are visible to
+    ``mode=neighbors`` immediately; the tree is rebuilt once the buffer
+    reaches ``FIT_INDEX_COMPACT_THRESHOLD``.
+    """
+
+    fit_history.record(
+        record.measurements.model_dump(exclude_none=True), record.category, record.size
+    )
+    return {"category": record.category, **fit_history.index(record.category).stats()}
+
+
+@router.websocket("/stream")
+async def stream_measurements(
+    websocket: WebSocket,
+    session_id: Optional[str] = None,
+    api_key: Optional[str] = None,
+) -> None:
+    """Fold per-frame landmarks from a live capture into a running estimate.
+
+    Authenticate with ``X-API-Key`` or ``?api_key=`` (browsers cannot set
+    WebSocket headers). Each text message is a ``MeasurementStreamFrame``; the
+    server answers every frame with a ``progress`` message until the running
+    statistics converge, then with an ``estimate`` carrying the
+    ``MeasurementNormalized`` payload. Bad frames, including binary messages,
+    get an ``error`` message and the session continues.
+    """
+
+    if (websocket.headers.get("x-api-key") or api_key) != VALID_API_KEY:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    stream = MeasurementStream(session_id or str(uuid.uuid4()))
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", status.WS_1000_NORMAL_CLOSURE))
+            if message.get("text") is None:
+                error = ErrorResponse(
+                    type="validation_error",
+                    code="invalid_payload",
+                    message="Frames must be sent as JSON text messages",
+                    errors=[],
+                    session_id=stream.session_id,
+                )
+                await websocket.send_json({"type": "error", "error": error.model_dump()})
+                continue
+            try:
+                frame = MeasurementStreamFrame.model_validate_json(message["text"])
+                measurements, accuracy = await compute_executor.run(
+                    landmark_core, *landmark_core_args(frame)
+                )
+            except ValidationError as exc:
+                error = _invalid_payload(exc, stream.session_id)
+                await websocket.send_json({"type": "error", "error": error.model_dump()})
+                continue
+            except ExecutorSaturated:
+                error = ErrorResponse(
+                    type="server_error",
+                    code="overloaded",
+                    message="Frame dropped: measurement workers are saturated",
+                    errors=[],
+                    session_id=stream.session_id,
+                )
+                await websocket.send_json({"type": "error", "error": error.model_dump()})
+                continue
+
+            stream.add_frame(measurements, accuracy)
+            estimate = stream.estimate()
+            if estimate is None:
+                relative_error = stream.relative_error()
+                await websocket.send_json(
+                    {
+                        "type": "progress",
+                        "frames": stream.frames,
+                        "relative_error": (
+                            relative_error if relative_error != float("inf") else None
+                        ),
+                    }
+                )
+            else:
+                await websocket.send_json(
+                    {
+                        "type": "estimate",
+                        "frames": stream.frames,
+                        "result": estimate.model_dump(exclude_none=True),
+                    }
+                )
+    except WebSocketDisconnect:
+        return
@@ -14,9 +14,19 @@ for input, MediaPipe landmarks, and normalized output.
 """
 
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+import numpy as np
+from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic_core import core_schema
+
+from backend.app.core.landmarks import (
+    LANDMARK_COLUMNS,
+    LANDMARK_COUNT,
+    landmarks_to_array,
+    unpack_landmarks,
+)
+from backend.app.schemas.errors import ErrorResponse
 
 try:  # Pydantic v2 support
     from pydantic import ConfigDict  # type: ignore
@@ -40,14 +50,119 @@ class MediaPipeLandmark(BaseModel):
     visibility: float
 
 
+class LandmarkArray:
+    """Pydantic type holding one view's landmarks as a ``(33, 4)`` array.
+
+    Accepts a list of ``{x, y, z, visibility}`` points, packed float32 base64
+    (see ``unpack_landmarks``) or an existing array, and validates it once into
+    a contiguous float64 array. Shape and finiteness are checked up front so
+    malformed views fail as a 422 instead of deep inside the measurement math.
+    Serializes back to the list-of-points JSON form.
+    """
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type, handler):
+        return core_schema.no_info_plain_validator_function(
+            cls.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls.serialize
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, _core_schema, handler):
+        return {
+            "type": "array",
+            "minItems": LANDMARK_COUNT,
+            "maxItems": LANDMARK_COUNT,
+            "items": {
+                "type": "object",
+                "properties": {
+                    column: {"type": "number"} for column in LANDMARK_COLUMNS
+                },
+                "required": list(LANDMARK_COLUMNS),
+            },
+        }
+
+    @staticmethod
+    def validate(value) -> np.ndarray:
+        """Coerce supported inputs to a finite ``(33, 4)`` float64 array."""
+
+        if isinstance(value, np.ndarray):
+            points = np.ascontiguousarray(value, dtype=np.float64)
+        elif isinstance(value, (str, bytes)):
+            points = unpack_landmarks(value)
+        elif isinstance(value, (list, tuple)):
+            if len(value) != LANDMARK_COUNT:
+                raise ValueError(
+                    f"expected {LANDMARK_COUNT} landmarks, got {len(value)}"
+                )
+            try:
+                if isinstance(value[0], dict):
+                    points = np.array(
+                        [(p["x"], p["y"], p["z"], p["visibility"]) for p in value],
+                        dtype=np.float64,
+                    )
+                else:
+                    points = landmarks_to_array(value)
+            except (KeyError, AttributeError, TypeError, ValueError) as exc:
+                raise ValueError(
+                    "each landmark requires numeric x, y, z and visibility"
+                ) from exc
+        else:
+            raise ValueError("landmarks must be a list of points")
+
+        if points.shape != (LANDMARK_COUNT, len(LANDMARK_COLUMNS)):
+            raise ValueError(
+                f"expected {LANDMARK_COUNT} landmarks with "
+                f"{len(LANDMARK_COLUMNS)} values each, got shape {points.shape}"
+            )
+        if not np.isfinite(points).all():
+            raise ValueError("landmark coordinates must be finite numbers")
+        return points
+
+    @staticmethod
+    def serialize(points: np.ndarray) -> List[Dict[str, float]]:
+        """Render the array as a list of landmark dicts."""
+
+        return [dict(zip(LANDMARK_COLUMNS, row)) for row in points.tolist()]
+
+
 class MediaPipeLandmarks(BaseModel):
-    """Complete set of MediaPipe Pose landmarks."""
+    """Complete set of MediaPipe Pose landmarks.
+
+    Landmarks arrive either as a JSON list of points or, for compact uploads,
+    as ``landmarks_f32``: base64 of packed little-endian float32 values laid
+    out point by point as ``x, y, z, visibility``. Both forms are validated
+    once into the same ``LandmarkArray`` without building per-point objects.
+    """
 
-    landmarks: List[MediaPipeLandmark]
+    landmarks: Optional[LandmarkArray] = None
+    landmarks_f32: Optional[str] = Field(default=None, exclude=True)
     timestamp: str
     image_width: int
     image_height: int
 
+    @model_validator(mode="before")
+    @classmethod
+    def _route_packed(cls, data):
+        """Require exactly one encoding and validate the packed form as landmarks."""
+
+        if not isinstance(data, dict):
+            return data
+        has_list = data.get("landmarks") is not None
+        has_packed = data.get("landmarks_f32") is not None
+        if has_list == has_packed:
+            raise ValueError("provide exactly one of landmarks or landmarks_f32")
+        if has_packed:
+            data = {**data, "landmarks": data["landmarks_f32"]}
+        return data
+
+    def points(self) -> np.ndarray:
+        """Landmarks as a ``(33, 4)`` array of ``x, y, z, visibility``."""
+
+        return self.landmarks
+
 
 class MeasurementInput(BaseModel):
     """Input schema for measurements with flexible units and MediaPipe data."""
@@ -182,3 +297,54 @@ class MeasurementNormalized(BaseModel):
             extra = "allow"
             protected_namespaces = ()
 
+
+class MeasurementStreamFrame(BaseModel):
+    """One camera frame sent over ``/measurements/stream``."""
+
+    front_landmarks: MediaPipeLandmarks
+    side_landmarks: MediaPipeLandmarks
+
+
+class FitHistoryRecord(BaseModel):
+    """A past shopper's measurements and the size they kept."""
+
+    measurements: MeasurementNormalized
+    category: str = Field(..., min_length=1)
+    size: str = Field(..., min_length=1)
+
+
+# Upper bound on items accepted by /measurements/validate/batch.
+MAX_BATCH_ITEMS = 1000
+
+
+class MeasurementBatchRequest(BaseModel):
+    """Batch of raw measurement payloads validated independently."""
+
+    # Items stay raw dicts so one malformed payload yields a per-item error
+    # instead of rejecting the whole request.
+    items: List[Dict[str, Any]] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+class MeasurementBatchItem(BaseModel):
+    """Outcome for a single batch item: a result or an error envelope."""
+
+    index: int
+    status: Literal["ok", "error"]
+    result: Optional[MeasurementNormalized] = None
+    error: Optional[ErrorResponse] = None
+
+
+class MeasurementBatchResponse(BaseModel):
+    """Per-item batch results in request order."""
+
+    results: List[MeasurementBatchItem]
+    succeeded: int
+    failed: int
+    model_version: str = "v1.0-mediapipe"
+
+    if ConfigDict:  # pragma: no branch - executed depending on pydantic version
+        model_config = ConfigDict(protected_namespaces=())
+    else:
+
+        class Config:  # type: ignore
+            protected_namespaces = ()
@@ -0,0 +1,251 @@
+"""Vectorized garment catalog scoring for size recommendations.
+
+Each category keeps its SKUs as one SKU × dimension matrix of garment spec
+measurements in centimeters (NaN where a SKU does not specify a dimension).
+Scoring a body profile is a single broadcast against that matrix: the
+residual ``garment - (body + ease)`` is divided by the dimension's tolerance,
+garments smaller than the target are penalized ``TIGHT_PENALTY`` times
+harder, and the root-mean-square over the dimensions both sides provide is
+the fit score (lower is better). ``np.argpartition`` then picks the top-k
+SKUs without sorting the whole category.
+
+The catalog is a JSON document at ``CATALOG_PATH`` (defaults to
+``backend/app/data/catalog/sample_catalog.json``)::
+
+    {
+      "version": "2025.10",
+      "categories": {"tops": {"ease": {"chest": 10}, "tolerance": {"chest": 4}}},
+      "skus": [{"sku": "TEE-M", "category": "tops", "name": "Tee", "size": "M",
+                "measurements": {"chest": 110}}]
+    }
+
+The live catalog is part of ``reference_data.current``.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+DEFAULT_CATALOG_PATH = (
+    Path(__file__).resolve().parents[1] / "data" / "catalog" / "sample_catalog.json"
+)
+TIGHT_PENALTY = 2.0
+
+
+def fit_confidence(scores: np.ndarray) -> np.ndarray:
+    """Map fit scores (tolerance units) onto a 0-1 confidence."""
+
+    return np.exp(-0.5 * np.square(scores))
+
+
+@dataclass(frozen=True)
+class CategoryMatrix:
+    """Garment specs for one category as a dense SKU × dimension matrix."""
+
+    category: str
+    dimensions: Tuple[str, ...]
+    skus: Tuple[str, ...]
+    names: Tuple[str, ...]
+    sizes: Tuple[str, ...]
+    specs: np.ndarray
+    ease: np.ndarray
+    tolerance: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.skus)
+
+    def body_matrix(self, profiles: Sequence[Mapping[str, float]]) -> np.ndarray:
+        """``(profiles, dimensions)`` body values; NaN where a profile lacks one."""
+
+        keys = [f"{dimension}_cm" for dimension in self.dimensions]
+        bodies = np.full((len(profiles), len(keys)), np.nan)
+        for row, profile in enumerate(profiles):
+            for column, key in enumerate(keys):
+                value = profile.get(key)
+                if value is not None:
+                    bodies[row, column] = value
+        return bodies
+
+    def scores(self, bodies: np.ndarray) -> np.ndarray:
+        """Fit score of every SKU for ``bodies`` of shape ``(..., dimensions)``.
+
+        Returns an array of shape ``(..., skus)``; SKUs sharing no dimension
+        with a body score ``inf``.
+        """
+
+        residual = (self.specs - bodies[..., None, :] - self.ease) / self.tolerance
+        residual = np.where(residual < 0, residual * TIGHT_PENALTY, residual)
+        valid = ~np.isnan(residual)
+        count = valid.sum(axis=-1)
+        squares = np.where(valid, residual * residual, 0.0).sum(axis=-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(count > 0, np.sqrt(squares / count), np.inf)
+
+    def top_k(self, bodies: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices and scores of the ``k`` best SKUs per body, best first.
+
+        ``bodies`` has shape ``(profiles, dimensions)``; both results have
+        shape ``(profiles, k)``.
+        """
+
+        scores = self.scores(bodies)
+        k = min(k, scores.shape[-1])
+        if k < scores.shape[-1]:
+            candidates = np.argpartition(scores, k - 1, axis=-1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(k), scores.shape)
+        rows = np.arange(scores.shape[0])[:, None]
+        candidate_scores = scores[rows, candidates]
+        order = np.argsort(candidate_scores, axis=-1, kind="stable")
+        return candidates[rows, order], candidate_scores[rows, order]
+
+
+class GarmentCatalog:
+    """Per-category SKU matrices with top-k matching."""
+
+    def __init__(self, version: str, categories: Iterable[CategoryMatrix]) -> None:
+        self.version = version
+        self.categories: Dict[str, CategoryMatrix] = {
+            matrix.category: matrix for matrix in categories
+        }
+
+    def __len__(self) -> int:
+        return sum(len(matrix) for matrix in self.categories.values())
+
+    def match_many(
+        self,
+        profiles: Sequence[Mapping[str, float]],
+        k: int,
+        categories: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, List[dict]]]:
+        """Top-k SKUs per category for each profile, scored in one pass each."""
+
+        results: List[Dict[str, List[dict]]] = [{} for _ in profiles]
+        for category in categories or self.categories:
+            matrix = self.categories.get(category)
+            if matrix is None or not len(matrix):
+                continue
+            bodies = matrix.body_matrix(profiles)
+            indices, scores = matrix.top_k(bodies, k)
+            confidences = fit_confidence(scores)
+            present = ~np.isnan(bodies)
+            for row, result in enumerate(results):
+                used = [
+                    dimension
+                    for dimension, flag in zip(matrix.dimensions, present[row].tolist())
+                    if flag
+                ]
+                result[category] = [
+                    {
+                        "sku": matrix.skus[index],
+                        "name": matrix.names[index],
+                        "size": matrix.sizes[index],
+                        "fit_score": round(float(score), 3),
+                        "confidence": round(float(confidence), 3),
+                        "dimensions": used,
+                    }
+                    for index, score, confidence in zip(
+                        indices[row].tolist(),
+                        scores[row].tolist(),
+                        confidences[row].tolist(),
+                    )
+                    if math.isfinite(score)
+                ]
+        return results
+
+    def match(
+        self,
+        profile: Mapping[str, float],
+        k: int,
+        categories: Optional[Sequence[str]] = None,
+    ) -> Dict[str, List[dict]]:
+        """Top-k SKUs per category for one profile."""
+
+        return self.match_many([profile], k, categories)[0]
+
+    @classmethod
+    def from_document(cls, document: Mapping, source: str = "<catalog>") -> "GarmentCatalog":
+        """Build category matrices from a catalog document.
+
+        Raises:
+            ValueError: If the document is malformed, a SKU names an unknown
+                category or a dimension has no positive tolerance
+        """
+
+        if not isinstance(document, Mapping):
+            raise ValueError(f"{source}: a catalog must be an object")
+        configs = document.get("categories", {})
+        all_skus = document.get("skus", [])
+        if not isinstance(configs, Mapping) or not all(
+            isinstance(config, Mapping) for config in configs.values()
+        ):
+            raise ValueError(f"{source}: categories must map names to objects")
+        if not isinstance(all_skus, list) or not all(
+            isinstance(sku, Mapping)
+            and isinstance(sku.get("measurements"), Mapping)
+            and "sku" in sku
+            and "size" in sku
+            for sku in all_skus
+        ):
+            raise ValueError(f"{source}: every SKU needs sku, size and a measurements object")
+        grouped: Dict[str, List[Mapping]] = {category: [] for category in configs}
+        for sku in all_skus:
+            if not isinstance(sku.get("category"), str) or sku["category"] not in grouped:
+                raise ValueError(
+                    f"{source}: SKU {sku.get('sku')!r} has unknown category "
+                    f"{sku.get('category')!r}"
+                )
+            grouped[sku["category"]].append(sku)
+
+        matrices = []
+        for category, skus in grouped.items():
+            config = configs[category]
+            ease, tolerances = config.get("ease", {}), config.get("tolerance", {})
+            if not isinstance(ease, Mapping) or not isinstance(tolerances, Mapping):
+                raise ValueError(f"{source}: {category} ease and tolerance must be objects")
+            dimensions = tuple(
+                sorted({name for sku in skus for name in sku["measurements"]} | set(ease))
+            )
+            try:
+                tolerance = np.array([float(tolerances.get(name, 0.0)) for name in dimensions])
+                specs = np.array(
+                    [
+                        [sku["measurements"].get(name, np.nan) for name in dimensions]
+                        for sku in skus
+                    ],
+                    dtype=np.float64,
+                ).reshape(len(skus), len(dimensions))
+                ease_values = np.array([float(ease.get(name, 0.0)) for name in dimensions])
+            except (TypeError, ValueError):
+                raise ValueError(f"{source}: {category} has a non-numeric value") from None
+            if np.any(tolerance <= 0):
+                missing = [name for name, tol in zip(dimensions, tolerance) if tol <= 0]
+                raise ValueError(f"{source}: {category} needs a positive tolerance for {missing}")
+            matrices.append(
+                CategoryMatrix(
+                    category=category,
+                    dimensions=dimensions,
+                    skus=tuple(sku["sku"] for sku in skus),
+                    names=tuple(sku.get("name", sku["sku"]) for sku in skus),
+                    sizes=tuple(str(sku["size"]) for sku in skus),
+                    specs=specs,
+                    ease=ease_values,
+                    tolerance=tolerance,
+                )
+            )
+        return cls(str(document.get("version", "1")), matrices)
+
+
+def load_catalog(path: Path | str) -> GarmentCatalog:
+    """Read and compile a catalog JSON file."""
+
+    path = Path(path)
+    return GarmentCatalog.from_document(json.loads(path.read_text()), source=str(path))
+
@@ -0,0 +1,59 @@
+"""Local stand-in for the vendor measurement API.
+
+Serves ``fetch_two_photo_stub`` payloads on the route ``VendorClient`` calls,
+with an ``X-Cost-USD`` header, so calibration runs can be exercised without
+paying for real calls::
+
+    uvicorn backend.app.services.fake_vendor:app --port 9001
+    VENDOR_API_URL=http://localhost:9001 ...
+
+``create_app`` can add latency and transient failures. It counts calls per
+session in ``app.state.calls`` and tracks the peak number of concurrent
+requests in ``app.state.peak_concurrency``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+
+from backend.app.services.vendor_client import fetch_two_photo_stub
+
+
+def create_app(
+    cost_usd: float = 0.25,
+    latency_seconds: float = 0.0,
+    failures_per_session: int = 0,
+) -> FastAPI:
+    """Fake vendor whose first ``failures_per_session`` calls per session return 503."""
+
+    vendor = FastAPI(title="Fake measurement vendor")
+    vendor.state.calls = Counter()
+    vendor.state.concurrency = 0
+    vendor.state.peak_concurrency = 0
+
+    @vendor.get("/v1/measurements/{session_id}")
+    async def measurements(session_id: str):
+        state = vendor.state
+        state.calls[session_id] += 1
+        state.concurrency += 1
+        state.peak_concurrency = max(state.peak_concurrency, state.concurrency)
+        try:
+            if latency_seconds:
+                await asyncio.sleep(latency_seconds)
+        finally:
+            state.concurrency -= 1
+        if state.calls[session_id] <= failures_per_session:
+            return Response(status_code=503)
+        return JSONResponse(
+            fetch_two_photo_stub(session_id) | {"session_id": session_id},
+            headers={"X-Cost-USD": str(cost_usd)},
+        )
+
+    return vendor
+
+
+app = create_app()
@@ -0,0 +1,322 @@
+"""Nearest-neighbor size votes over historical shopper profiles.
+
+Profiles are the 18 ``MeasurementNormalized`` centimeter values in
+``MEASUREMENT_KEYS`` order. Each category keeps a ``FitIndex``: a static
+array-backed KD-tree over compacted profiles plus a small insert buffer that
+is scanned brute force. New sessions land in the buffer immediately; once it
+reaches ``compact_threshold`` (or on an explicit ``compact()``) the tree is
+rebuilt off-lock from tree + buffer and swapped in, so inserts never wait on a
+full rebuild. Compactions are serialized, so one never swaps in a tree built
+from an older snapshot than another's.
+
+Profiles are stored with their missing measurements as NaN. Each compaction
+recomputes the per-dimension mean (``center``) and standard deviation
+(``scale``) of the stored values, and the tree indexes z-scores: a missing
+value becomes 0, the mean. Queries and the buffered profiles are scaled the
+same way. Every measurement therefore weighs by how unusual it is rather than
+by its size in centimeters, so height and the large girths do not drown out
+neck, forearm or ankle. A missing value never pulls neighbors in any direction
+and is never frozen at a stale estimate.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from backend.app.core.config import settings
+from backend.app.core.landmarks import MEASUREMENT_KEYS
+
+
+DIMENSIONS = len(MEASUREMENT_KEYS)
+
+
+def profile_vector(measurements: Mapping[str, Optional[float]]) -> np.ndarray:
+    """18-d centimeter vector for a profile; NaN where a value is missing."""
+
+    return np.array(
+        [
+            np.nan if measurements.get(key) is None else float(measurements[key])
+            for key in MEASUREMENT_KEYS
+        ]
+    )
+
+
+class KDTree:
+    """Static KD-tree with bucketed leaves, stored in flat arrays.
+
+    Building splits the widest dimension at the median until a node holds at
+    most ``leaf_size`` points. Queries compute the lower-bound distance from
+    the point to every leaf's bounding box in one vector op, then scan leaves
+    nearest-box first and stop once the next box is farther than the current
+    k-th neighbor. That keeps the per-query Python work proportional to the
+    leaves actually visited rather than to tree depth × branching.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 128) -> None:
+        points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, DIMENSIONS)
+        order = np.arange(len(points))
+        spans = self._partition(points, order, leaf_size) if len(points) else []
+        self.order = order
+        self.points = points[order]
+        self.leaf_starts = np.array([start for start, _ in spans], dtype=np.int64)
+        self.leaf_ends = np.array([end for _, end in spans], dtype=np.int64)
+        self.leaf_min = np.array(
+            [self.points[start:end].min(axis=0) for start, end in spans]
+        ).reshape(-1, DIMENSIONS)
+        self.leaf_max = np.array(
+            [self.points[start:end].max(axis=0) for start, end in spans]
+        ).reshape(-1, DIMENSIONS)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    @staticmethod
+    def _partition(points: np.ndarray, order: np.ndarray, leaf_size: int) -> list:
+        """Median-split ``order`` in place; return the leaf ``(start, end)`` spans."""
+
+        spans = []
+        stack = [(0, len(points))]
+        while stack:
+            start, end = stack.pop()
+            if end - start <= leaf_size:
+                spans.append((start, end))
+                continue
+            members = order[start:end]
+            values = points[members]
+            dim = int(np.argmax(values.max(axis=0) - values.min(axis=0)))
+            middle = (end - start) // 2
+            order[start:end] = members[np.argpartition(values[:, dim], middle)]
+            stack.append((start + middle, end))
+            stack.append((start, start + middle))
+        return spans
+
+    def query(self, point: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Squared distances and row positions (into ``points``) of the k nearest."""
+
+        if not len(self.points):
+            return np.empty(0), np.empty(0, dtype=np.int64)
+        k = min(k, len(self.points))
+        outside = np.maximum(self.leaf_min - point, 0.0) + np.maximum(point - self.leaf_max, 0.0)
+        bounds = np.einsum("ij,ij->i", outside, outside)
+        best_distances = np.empty(0)
+        best_rows = np.empty(0, dtype=np.int64)
+        for leaf in np.argsort(bounds).tolist():
+            if len(best_distances) == k and bounds[leaf] >= best_distances[-1]:
+                break
+            start, end = int(self.leaf_starts[leaf]), int(self.leaf_ends[leaf])
+            diff = self.points[start:end] - point
+            distances = np.concatenate([best_distances, np.einsum("ij,ij->i", diff, diff)])
+            rows = np.concatenate([best_rows, np.arange(start, end)])
+            keep = np.argsort(distances, kind="stable")[:k]
+            best_distances, best_rows = distances[keep], rows[keep]
+        return best_distances, best_rows
+
+
+class FitIndex:
+    """KD-tree plus insert buffer of (profile, size label) pairs."""
+
+    def __init__(self, leaf_size: int = 128, compact_threshold: int = 1024) -> None:
+        self.leaf_size = leaf_size
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+        self._tree = KDTree(np.empty((0, DIMENSIONS)), leaf_size)
+        # Stored profiles (NaN where missing) and labels, both in tree order.
+        self._tree_profiles = np.empty((0, DIMENSIONS))
+        self._tree_labels: List[str] = []
+        self._buffer: List[np.ndarray] = []
+        self._buffer_labels: List[str] = []
+        self.center: Optional[np.ndarray] = None
+        self.scale: Optional[np.ndarray] = None
+        self.compactions = 0
+
+    def __len__(self) -> int:
+        return len(self._tree) + len(self._buffer)
+
+    @staticmethod
+    def _mean(profiles: np.ndarray) -> np.ndarray:
+        """Per-dimension mean of the present values; 0 where none is present."""
+
+        present = ~np.isnan(profiles)
+        counts = present.sum(axis=0)
+        totals = np.where(present, profiles, 0.0).sum(axis=0)
+        return np.divide(totals, counts, out=np.zeros(DIMENSIONS), where=counts > 0)
+
+    @staticmethod
+    def _spread(profiles: np.ndarray, center: np.ndarray) -> np.ndarray:
+        """Per-dimension standard deviation of the present values; 1 where it is 0."""
+
+        present = ~np.isnan(profiles)
+        counts = present.sum(axis=0)
+        squares = np.where(present, (profiles - center) ** 2, 0.0).sum(axis=0)
+        spread = np.sqrt(np.divide(squares, counts, out=np.zeros(DIMENSIONS), where=counts > 0))
+        return np.where(spread > 0, spread, 1.0)
+
+    @staticmethod
+    def _standardize(profiles: np.ndarray, center: np.ndarray, scale: np.ndarray) -> np.ndarray:
+        """Z-scores of ``profiles``; missing values map to 0, the mean."""
+
+        return np.nan_to_num((profiles - center) / scale, nan=0.0)
+
+    def insert(self, vector: np.ndarray, label: str) -> None:
+        """Add one profile; compacts once the buffer reaches the threshold."""
+
+        with self._lock:
+            self._buffer.append(np.asarray(vector, dtype=np.float64))
+            self._buffer_labels.append(label)
+            should_compact = len(self._buffer) >= self.compact_threshold
+        if should_compact:
+            # A compaction already running picks up the buffer on the next one.
+            self.compact(blocking=False)
+
+    def compact(self, blocking: bool = True) -> None:
+        """Fold the insert buffer into a freshly built tree."""
+
+        if not self._compact_lock.acquire(blocking=blocking):
+            return
+        try:
+            with self._lock:
+                buffered = len(self._buffer)
+                if not buffered:
+                    return
+                profiles = np.vstack([self._tree_profiles, *self._buffer[:buffered]])
+                labels = self._tree_labels + self._buffer_labels[:buffered]
+
+            center = self._mean(profiles)
+            scale = self._spread(profiles, center)
+            tree = KDTree(self._standardize(profiles, center, scale), self.leaf_size)
+            order = tree.order
+
+            with self._lock:
+                # Only appends happened meanwhile, so the first ``buffered``
+                # entries are still the ones folded in.
+                self._tree = tree
+                self._tree_profiles = profiles[order]
+                self._tree_labels = [labels[i] for i in order.tolist()]
+                del self._buffer[:buffered]
+                del self._buffer_labels[:buffered]
+                self.center = center
+                self.scale = scale
+                self.compactions += 1
+        finally:
+            self._compact_lock.release()
+
+    def nearest(self, vector: np.ndarray, k: int) -> List[Tuple[float, str]]:
+        """``(distance, label)`` of the k nearest profiles, closest first.
+
+        Distances are Euclidean over the standardized measurements.
+        """
+
+        with self._lock:
+            tree, tree_labels = self._tree, self._tree_labels
+            buffer = np.array(self._buffer) if self._buffer else np.empty((0, DIMENSIONS))
+            buffer_labels = list(self._buffer_labels)
+            center, scale = self.center, self.scale
+
+        if center is None:
+            # Nothing compacted yet: standardize by the buffered profiles.
+            center = self._mean(buffer) if len(buffer) else np.zeros(DIMENSIONS)
+            scale = self._spread(buffer, center) if len(buffer) else np.ones(DIMENSIONS)
+        point = self._standardize(np.asarray(vector, dtype=np.float64), center, scale)
+        distances, rows = tree.query(point, k)
+        candidates = [(d, tree_labels[r]) for d, r in zip(distances.tolist(), rows.tolist())]
+        if len(buffer):
+            diff = self._standardize(buffer, center, scale) - point
+            buffered = np.einsum("ij,ij->i", diff, diff)
+            for row in np.argsort(buffered)[:k].tolist():
+                candidates.append((float(buffered[row]), buffer_labels[row]))
+        candidates.sort(key=lambda item: item[0])
+        return [(float(np.sqrt(d)), label) for d, label in candidates[:k]]
+
+    def vote(self, vector: np.ndarray, k: int) -> Optional[dict]:
+        """Distance-weighted size vote among the k nearest profiles."""
+
+        neighbors = self.nearest(vector, k)
+        if not neighbors:
+            return None
+        weights: Dict[str, float] = {}
+        for distance, label in neighbors:
+            weights[label] = weights.get(label, 0.0) + 1.0 / (distance + 1.0)
+        size = max(weights, key=weights.get)
+        return {
+            "size": size,
+            "confidence": round(weights[size] / sum(weights.values()), 3),
+            "neighbors": len(neighbors),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "indexed": len(self._tree),
+            "buffered": len(self._buffer),
+            "compactions": self.compactions,
+        }
+
+
+class FitHistory:
+    """One ``FitIndex`` per garment category."""
+
+    def __init__(
+        self,
+        leaf_size: int = 128,
+        compact_threshold: int = settings.fit_index_compact_threshold,
+    ) -> None:
+        self.leaf_size = leaf_size
+        self.compact_threshold = compact_threshold
+        self._indexes: Dict[str, FitIndex] = {}
+        self._lock = threading.Lock()
+
+    def index(self, category: str) -> FitIndex:
+        with self._lock:
+            index = self._indexes.get(category)
+            if index is None:
+                index = FitIndex(self.leaf_size, self.compact_threshold)
+                self._indexes[category] = index
+            return index
+
+    def categories(self) -> List[str]:
+        return [category for category, index in self._indexes.items() if len(index)]
+
+    def record(self, measurements: Mapping, category: str, size: str) -> None:
+        """Add a shopper's profile with the size they kept."""
+
+        self.index(category).insert(profile_vector(measurements), size)
+
+    def vote(self, measurements: Mapping, k: int) -> Dict[str, dict]:
+        """Nearest-neighbor size vote for every category with history."""
+
+        vector = profile_vector(measurements)
+        votes = {}
+        for category in self.categories():
+            result = self._indexes[category].vote(vector, k)
+            if result is not None:
+                votes[category] = result
+        return votes
+
+    def compact(self) -> None:
+        for category in self.categories():
+            self._indexes[category].compact()
+
+    def stats(self) -> dict:
+        return {category: index.stats() for category, index in self._indexes.items()}
+
+
+def load_fit_history(path: Path | str, history: FitHistory) -> FitHistory:
+    """Bulk-load JSON-lines records (``category``, ``size`` + ``*_cm`` values)."""
+
+    with Path(path).open() as handle:
+        for line in handle:
+            if line.strip():
+                record = json.loads(line)
+                history.record(record, record["category"], str(record["size"]))
+    history.compact()
+    return history
+
+
+fit_history = FitHistory()
+if settings.fit_history_path:
+    load_fit_history(settings.fit_history_path, fit_history)
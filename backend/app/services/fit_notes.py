@@ -0,0 +1,245 @@
+"""Declarative fit-note rules compiled into a vectorized evaluator.
+
+Rules live in a JSON document at ``FIT_NOTES_PATH`` (defaults to
+``backend/app/data/fit_notes/default.json``)::
+
+    {
+      "version": "2025.10",
+      "rules": [
+        {"category": "bottoms", "note": "roomy thigh",
+         "measure": "thigh / hip_low", "op": ">", "value": 0.58}
+      ]
+    }
+
+``measure`` is a measurement name (without ``_cm``), a ratio ``a / b`` or a
+difference ``a - b``; ``op`` is one of ``<``, ``<=``, ``>``, ``>=``. Each
+category's rules compile to index, operator and threshold arrays, so
+evaluating every rule against a batch of profiles is a handful of NumPy
+operations whatever the rule count. Single-profile lookups on the request
+path use a flat tuple compiled from the same rules instead, because NumPy's
+per-call overhead outweighs a few comparisons. A rule whose inputs are
+missing (or whose ratio divides by zero) for a profile does not fire. The
+live rule set is part of ``reference_data.current``.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import operator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.app.core.landmarks import MEASUREMENT_KEYS
+
+
+DEFAULT_FIT_NOTES_PATH = (
+    Path(__file__).resolve().parents[1] / "data" / "fit_notes" / "default.json"
+)
+OPERATORS = ("<", "<=", ">", ">=")
+_COMPARE = (operator.lt, operator.le, operator.gt, operator.ge)
+_KIND_VALUE, _KIND_RATIO, _KIND_DIFFERENCE = 0, 1, 2
+_KEY_INDEX = {key: index for index, key in enumerate(MEASUREMENT_KEYS)}
+
+
+def profile_matrix(profiles: Sequence[Mapping[str, Optional[float]]]) -> np.ndarray:
+    """``(profiles, MEASUREMENT_KEYS)`` matrix; NaN where a value is missing."""
+
+    matrix = np.empty((len(profiles), len(MEASUREMENT_KEYS)))
+    for column, key in enumerate(MEASUREMENT_KEYS):
+        # Filled a column at a time: NumPy converts ``None`` to NaN.
+        matrix[:, column] = [profile.get(key) for profile in profiles]
+    return matrix
+
+
+@dataclass(frozen=True)
+class CompiledNotes:
+    """One category's rules as parallel arrays."""
+
+    category: str
+    notes: Tuple[str, ...]
+    left: np.ndarray
+    right: np.ndarray
+    kinds: np.ndarray
+    operators: np.ndarray
+    thresholds: np.ndarray
+    scalar: Tuple[tuple, ...]
+
+    def __len__(self) -> int:
+        return len(self.notes)
+
+    def evaluate_one(self, profile: Mapping[str, Optional[float]]) -> List[str]:
+        """Fired notes for a single profile without building arrays."""
+
+        fired = []
+        for note, left_key, right_key, kind, compare, threshold in self.scalar:
+            left, right = profile.get(left_key), profile.get(right_key)
+            if left is None or right is None:
+                continue
+            if kind == _KIND_RATIO:
+                if not right:
+                    continue
+                measured = left / right
+            elif kind == _KIND_DIFFERENCE:
+                measured = left - right
+            else:
+                measured = left
+            if not math.isnan(measured) and compare(measured, threshold):
+                fired.append(note)
+        return fired
+
+    def evaluate(self, matrix: np.ndarray) -> np.ndarray:
+        """Boolean ``(profiles, rules)`` array of which rules fire."""
+
+        left = matrix[:, self.left]
+        right = matrix[:, self.right]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            measured = np.where(
+                self.kinds == _KIND_RATIO,
+                left / right,
+                np.where(self.kinds == _KIND_DIFFERENCE, left - right, left),
+            )
+        below = measured < self.thresholds
+        above = measured > self.thresholds
+        equal = measured == self.thresholds
+        ops = self.operators
+        return np.isfinite(measured) & (
+            ((ops == 0) & below)
+            | ((ops == 1) & (below | equal))
+            | ((ops == 2) & above)
+            | ((ops == 3) & (above | equal))
+        )
+
+
+def _parse_measure(measure: str, source: str) -> Tuple[int, int, int]:
+    for symbol, kind in (("/", _KIND_RATIO), ("-", _KIND_DIFFERENCE)):
+        if symbol in measure:
+            names = [part.strip() for part in measure.split(symbol)]
+            break
+    else:
+        names, kind = [measure.strip()], _KIND_VALUE
+    if len(names) > 2:
+        raise ValueError(f"{source}: measure {measure!r} combines more than two values")
+    indexes = []
+    for name in names:
+        key = name if name.endswith("_cm") else f"{name}_cm"
+        if key not in _KEY_INDEX:
+            raise ValueError(f"{source}: unknown measurement {name!r} in {measure!r}")
+        indexes.append(_KEY_INDEX[key])
+    return indexes[0], indexes[-1], kind
+
+
+class FitNoteRules:
+    """Compiled fit-note rules keyed by category."""
+
+    def __init__(self, version: str, categories: Mapping[str, CompiledNotes]) -> None:
+        self.version = version
+        self.categories: Dict[str, CompiledNotes] = dict(categories)
+
+    def __len__(self) -> int:
+        return sum(len(compiled) for compiled in self.categories.values())
+
+    def notes_many(
+        self,
+        profiles: Sequence[Mapping[str, Optional[float]]],
+        categories: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, List[str]]]:
+        """Fired notes per category for each profile, one pass per category."""
+
+        results: List[Dict[str, List[str]]] = [{} for _ in profiles]
+        if not profiles:
+            return results
+        matrix = profile_matrix(profiles)
+        for category in categories or self.categories:
+            compiled = self.categories.get(category)
+            if compiled is None:
+                continue
+            fired = compiled.evaluate(matrix)
+            # Profiles share few distinct fired-rule patterns; decode each once.
+            patterns, inverse = np.unique(
+                np.packbits(fired, axis=1), axis=0, return_inverse=True
+            )
+            decoded = [
+                [compiled.notes[index] for index in np.flatnonzero(bits).tolist()]
+                for bits in np.unpackbits(patterns, axis=1, count=len(compiled)).astype(bool)
+            ]
+            for result, pattern in zip(results, inverse.reshape(-1).tolist()):
+                result[category] = list(decoded[pattern])
+        return results
+
+    def notes(self, profile: Mapping[str, Optional[float]], category: str) -> List[str]:
+        """Fired notes for one profile in one category."""
+
+        compiled = self.categories.get(category)
+        return compiled.evaluate_one(profile) if compiled is not None else []
+
+    @classmethod
+    def from_document(cls, document: Mapping, source: str = "<fit notes>") -> "FitNoteRules":
+        """Compile a rule document.
+
+        Raises:
+            ValueError: If the document is malformed, or a rule is missing a
+                key, names an unknown measurement or uses an unsupported
+                operator
+        """
+
+        rules = document.get("rules", []) if isinstance(document, Mapping) else None
+        if not isinstance(rules, list):
+            raise ValueError(f"{source}: expected an object with a rules list")
+        grouped: Dict[str, List[tuple]] = {}
+        for number, rule in enumerate(rules):
+            where = f"{source} rule {number}"
+            if not isinstance(rule, Mapping):
+                raise ValueError(f"{where}: a rule must be an object")
+            try:
+                category, note, measure = rule["category"], rule["note"], rule["measure"]
+                threshold = float(rule["value"])
+                op = rule["op"]
+            except KeyError as exc:
+                raise ValueError(f"{where}: missing required key {exc}") from None
+            except (TypeError, ValueError):
+                raise ValueError(f"{where}: value must be a number") from None
+            if not isinstance(category, str) or not isinstance(measure, str):
+                raise ValueError(f"{where}: category and measure must be strings")
+            if op not in OPERATORS:
+                raise ValueError(f"{where}: op must be one of {list(OPERATORS)}")
+            left, right, kind = _parse_measure(measure, where)
+            grouped.setdefault(category.lower(), []).append(
+                (str(note), left, right, kind, OPERATORS.index(op), threshold)
+            )
+
+        compiled = {
+            category: CompiledNotes(
+                category=category,
+                notes=tuple(rule[0] for rule in rules),
+                left=np.array([rule[1] for rule in rules], dtype=np.int64),
+                right=np.array([rule[2] for rule in rules], dtype=np.int64),
+                kinds=np.array([rule[3] for rule in rules], dtype=np.int64),
+                operators=np.array([rule[4] for rule in rules], dtype=np.int64),
+                thresholds=np.array([rule[5] for rule in rules], dtype=np.float64),
+                scalar=tuple(
+                    (
+                        note,
+                        MEASUREMENT_KEYS[left],
+                        MEASUREMENT_KEYS[right],
+                        kind,
+                        _COMPARE[op],
+                        threshold,
+                    )
+                    for note, left, right, kind, op, threshold in rules
+                ),
+            )
+            for category, rules in grouped.items()
+        }
+        return cls(str(document.get("version", "1")), compiled)
+
+
+def load_fit_notes(path: Path | str) -> FitNoteRules:
+    """Read and compile a fit-note rule file."""
+
+    path = Path(path)
+    return FitNoteRules.from_document(json.loads(path.read_text()), source=str(path))
+
@@ -1,11 +1,16 @@
 from typing import Dict
-INCH = 1/2.54
 
-def recommend_bottom(m: Dict) -> Dict:
-    waist = round(m["waist_natural_cm"] * INCH)
-    inseam = round(m["inseam_cm"] * INCH)
-    notes = []
-    if m["thigh_cm"]/m["hip_low_cm"] > 0.58: notes.append("roomy thigh")
-    if m["knee_cm"]/m["thigh_cm"] < 0.67: notes.append("strong knee taper")
+from backend.app.services.reference_data import reference_data
+from backend.app.services.size_charts import DEFAULT_BRAND, DEFAULT_REGION
+
+def recommend_bottom(m: Dict, brand: str = DEFAULT_BRAND, region: str = DEFAULT_REGION) -> Dict:
+    snapshot = reference_data.current
+    chart = snapshot.size_charts.get("bottoms", brand, region)
+    notes = snapshot.fit_notes.notes(m, "bottoms")
     rationale = ", ".join(notes) or "standard ease"
-    return {"category": "bottom", "size": f"{waist}x{inseam}", "confidence": 0.72, "rationale": rationale}
+    size = chart.size_for(m)
+    if size is None:
+        # Never hand out the nearest end size for a body the chart does not cover.
+        rationale = f"outside the size chart: {', '.join(chart.out_of_range(m))}"
+    return {"category": "bottom", "size": size, "confidence": 0.72, "rationale": rationale,
+            "fit_notes": notes, "chart_version": chart.version}
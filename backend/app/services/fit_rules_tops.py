@@ -1,14 +1,19 @@
 from typing import Dict
+
+from backend.app.services.reference_data import reference_data
+from backend.app.services.size_charts import DEFAULT_BRAND, DEFAULT_REGION
+
 INCH = 1/2.54
 
-def recommend_top(m: Dict) -> Dict:
+def recommend_top(m: Dict, brand: str = DEFAULT_BRAND, region: str = DEFAULT_REGION) -> Dict:
+    snapshot = reference_data.current
+    chart = snapshot.size_charts.get("tops", brand, region)
+    size = chart.size_for(m)
     chest_in = round(m["chest_cm"] * INCH)
     shoulder_in = round(m["shoulder_cm"] * INCH)
     sleeve_in = round(m["sleeve_cm"] * INCH)
-    # simple S/M/L mapping placeholder
-    if chest_in <= 36: size = "S"
-    elif chest_in <= 40: size = "M"
-    elif chest_in <= 44: size = "L"
-    else: size = "XL"
     rationale = f"Based on chest {chest_in} in, shoulder {shoulder_in} in, sleeve {sleeve_in} in"
-    return {"category": "top", "size": size, "confidence": 0.7, "rationale": rationale}
+    if size is None:
+        rationale = f"outside the size chart: {', '.join(chart.out_of_range(m))}"
+    return {"category": "top", "size": size, "confidence": 0.7, "rationale": rationale,
+            "fit_notes": snapshot.fit_notes.notes(m, "tops"), "chart_version": chart.version}
@@ -0,0 +1,123 @@
+"""Recommendation cache keyed on quantized body measurements.
+
+Shoppers cluster into a limited number of body-measurement buckets. Each
+``MeasurementNormalized`` value is snapped to a ``step_cm`` grid (0.5 cm by
+default) and the bucket, together with the catalog version and the request
+variant (e.g. ``top_k``), keys an LRU ``TTLCache``. Recommendations are
+computed from the bucket's grid values rather than the first shopper's exact
+numbers, so every shopper in a bucket gets the same answer regardless of who
+filled the entry.
+
+Entries carry the reference data version in their key, so versions never
+mix. The first lookup with a version never seen before clears the cache once,
+so stale buckets do not linger until LRU eviction. During a hot reload,
+requests pinned to the old snapshot keep arriving next to new ones; their
+versions have been seen, so they neither clear the cache nor each other's
+entries.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+from backend.app.core.cache import TTLCache
+from backend.app.core.config import settings
+from backend.app.core.landmarks import MEASUREMENT_KEYS
+
+
+Bucket = Tuple[Tuple[str, float], ...]
+
+# Recent versions remembered so that in-flight requests on an older snapshot
+# do not count as new versions.
+_KNOWN_VERSIONS = 8
+
+
+class RecommendationCache:
+    """LRU of computed recommendations per measurement bucket."""
+
+    def __init__(self, maxsize: int, step_cm: float = 0.5) -> None:
+        self.step_cm = step_cm
+        self._entries = TTLCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._version: Optional[Hashable] = None
+        self._known: OrderedDict[Hashable, None] = OrderedDict()
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def bucket(self, profile: Mapping[str, Optional[float]]) -> Bucket:
+        """Grid values of the measurements present in ``profile``.
+
+        A non-positive ``step_cm`` disables quantization and keys on the
+        exact values.
+        """
+
+        step = self.step_cm
+        if step <= 0:
+            return tuple(
+                (key, float(profile[key]))
+                for key in MEASUREMENT_KEYS
+                if profile.get(key) is not None
+            )
+        return tuple(
+            (key, round(round(profile[key] / step) * step, 6))
+            for key in MEASUREMENT_KEYS
+            if profile.get(key) is not None
+        )
+
+    def _check_version(self, version: Hashable) -> None:
+        with self._lock:
+            if version == self._version or version in self._known:
+                return
+            if self._version is not None:
+                self._entries.clear()
+                self.invalidations += 1
+            self._version = version
+            self._known[version] = None
+            if len(self._known) > _KNOWN_VERSIONS:
+                self._known.popitem(last=False)
+
+    def get_or_compute(
+        self,
+        profile: Mapping[str, Optional[float]],
+        version: Hashable,
+        variant: Hashable,
+        compute: Callable[[Dict[str, float]], Any],
+    ) -> Any:
+        """Cached ``compute(bucket_profile)`` for the profile's bucket.
+
+        Args:
+            profile: Measurements keyed like ``MeasurementNormalized``
+            version: Version of the data the recommendation is computed from
+            variant: Anything else that changes the result, such as ``top_k``
+            compute: Called with the bucket's grid values on a miss
+        """
+
+        self._check_version(version)
+        bucket = self.bucket(profile)
+        key = (version, variant, bucket)
+        value = self._entries.get(key)
+        if value is None:
+            value = compute(dict(bucket))
+            self._entries.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            **self._entries.stats(),
+            "step_cm": self.step_cm,
+            "version": self._version,
+            "invalidations": self.invalidations,
+        }
+
+
+recommendation_cache = RecommendationCache(
+    maxsize=settings.recommend_cache_size,
+    step_cm=settings.recommend_cache_step_cm,
+)
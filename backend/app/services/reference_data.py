@@ -0,0 +1,173 @@
+"""Hot-reloadable reference data: size charts, garment catalog and fit notes.
+
+All three are compiled together into one immutable ``ReferenceSnapshot``.
+Request handlers read ``reference_data.current`` once and use that snapshot
+for the whole request, so a reload can never mix chart, catalog and rule
+versions within a response. Reads are a single attribute load and take no
+lock.
+
+``reload()`` stats the source files and, when any changed, compiles a fresh
+snapshot off the request path. Compilation validates every file (the
+loaders raise ``ValueError`` on malformed specs); only a snapshot that
+compiled completely is swapped in, by rebinding ``current``. A failed reload
+leaves the previous snapshot serving and is reported in ``stats()``. The
+lifespan runs ``watch()`` to poll every ``REFERENCE_RELOAD_INTERVAL_SECONDS``;
+``POST /admin/reload`` forces a reload.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+from backend.app.core.config import settings
+from backend.app.services.catalog import DEFAULT_CATALOG_PATH, GarmentCatalog
+from backend.app.services.fit_notes import DEFAULT_FIT_NOTES_PATH, FitNoteRules
+from backend.app.services.size_charts import (
+    DEFAULT_CHART_DIR,
+    SizeChartRegistry,
+    charts_from_document,
+)
+
+
+logger = logging.getLogger(__name__)
+
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """One consistent, immutable generation of reference data."""
+
+    version: str
+    size_charts: SizeChartRegistry
+    catalog: GarmentCatalog
+    fit_notes: FitNoteRules
+    fingerprint: Fingerprint
+    loaded_at: float
+
+
+class ReferenceData:
+    """Holder of the current ``ReferenceSnapshot`` with background reloads."""
+
+    def __init__(
+        self,
+        chart_dir: Path | str,
+        catalog_path: Path | str,
+        fit_notes_path: Path | str,
+    ) -> None:
+        self.chart_dir = Path(chart_dir)
+        self.catalog_path = Path(catalog_path)
+        self.fit_notes_path = Path(fit_notes_path)
+        # Serializes reloaders only; readers never touch it.
+        self._reload_lock = threading.Lock()
+        self.reloads = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.current: ReferenceSnapshot = self._load(self._fingerprint())
+
+    def _sources(self) -> list:
+        return [
+            *sorted(self.chart_dir.glob("**/*.json")),
+            self.catalog_path,
+            self.fit_notes_path,
+        ]
+
+    def _fingerprint(self) -> Fingerprint:
+        fingerprint = []
+        for path in self._sources():
+            stat = path.stat()
+            fingerprint.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(fingerprint)
+
+    def _load(self, fingerprint: Fingerprint) -> ReferenceSnapshot:
+        """Compile every source; raises if any file is missing or invalid.
+
+        Each file is read once, and the version hashes exactly the bytes that
+        were parsed.
+        """
+
+        digest = hashlib.sha256()
+        documents = []
+        for path, _, _ in fingerprint:
+            raw = Path(path).read_bytes()
+            digest.update(path.encode() + b"\0" + raw + b"\0")
+            documents.append((path, json.loads(raw)))
+        # Same order as ``_sources``: chart files, then catalog, then fit notes.
+        *charts, (catalog_path, catalog), (fit_notes_path, fit_notes) = documents
+        size_charts = SizeChartRegistry()
+        for path, document in charts:
+            for chart in charts_from_document(document, source=path):
+                size_charts.add(chart)
+        return ReferenceSnapshot(
+            version=digest.hexdigest()[:12],
+            size_charts=size_charts,
+            catalog=GarmentCatalog.from_document(catalog, source=catalog_path),
+            fit_notes=FitNoteRules.from_document(fit_notes, source=fit_notes_path),
+            fingerprint=fingerprint,
+            loaded_at=time.time(),
+        )
+
+    def reload(self, force: bool = False) -> bool:
+        """Swap in a new snapshot if the sources changed (or ``force``).
+
+        Returns whether a new snapshot was installed.
+
+        Raises:
+            ValueError: If a source file is missing, unreadable or fails
+                validation; the current snapshot keeps serving
+        """
+
+        with self._reload_lock:
+            try:
+                fingerprint = self._fingerprint()
+                if not force and fingerprint == self.current.fingerprint:
+                    return False
+                snapshot = self._load(fingerprint)
+            except Exception as exc:
+                self.failures += 1
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                raise ValueError(self.last_error) from exc
+            self.current = snapshot
+            self.reloads += 1
+            self.last_error = None
+            return True
+
+    async def watch(self, interval_seconds: float) -> None:
+        """Poll for changed sources until cancelled."""
+
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                if await asyncio.to_thread(self.reload):
+                    logger.info("reference data reloaded (version %s)", self.current.version)
+            except Exception as exc:
+                # Keep polling: the previous snapshot serves until a fix lands.
+                logger.warning("reference data reload rejected: %s", exc)
+
+    def stats(self) -> dict:
+        snapshot = self.current
+        return {
+            "version": snapshot.version,
+            "loaded_at": snapshot.loaded_at,
+            "size_charts": len(snapshot.size_charts),
+            "catalog_version": snapshot.catalog.version,
+            "fit_notes_version": snapshot.fit_notes.version,
+            "reloads": self.reloads,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+reference_data = ReferenceData(
+    chart_dir=settings.size_chart_dir or DEFAULT_CHART_DIR,
+    catalog_path=settings.catalog_path or DEFAULT_CATALOG_PATH,
+    fit_notes_path=settings.fit_notes_path or DEFAULT_FIT_NOTES_PATH,
+)
@@ -0,0 +1,262 @@
+"""Data-driven size charts compiled into sorted boundary tuples.
+
+Each chart is a JSON file (or a ``{"charts": [...]}`` bundle) under
+``backend/app/data/size_charts`` or ``SIZE_CHART_DIR``::
+
+    {
+      "brand": "default", "category": "tops", "region": "US",
+      "unit": "in", "version": "2025.10",
+      "dimensions": {"chest": {"bounds": [36, 40, 44], "labels": ["S", "M", "L", "XL"]}},
+      "format": "{chest}"
+    }
+
+``bounds`` are inclusive upper limits in ``unit``; a value above the last
+bound gets the last label. A dimension may also give an inclusive ``min``
+and ``max``: a value outside them is out of the chart's range and gets no
+size at all rather than the nearest end label. Without them the end labels
+are open-ended (e.g. ``"S"`` and ``"XL"``). Bounds are converted to
+centimeters once at load
+time, so a lookup is one ``bisect`` per dimension plus a dict lookup for the
+chart, independent of how many charts are loaded. The live registry is part
+of ``reference_data.current`` and is reloaded without a restart.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+DEFAULT_CHART_DIR = Path(__file__).resolve().parents[1] / "data" / "size_charts"
+DEFAULT_BRAND = "default"
+DEFAULT_REGION = "US"
+CM_PER_UNIT = {"cm": 1.0, "in": 2.54}
+
+
+@dataclass(frozen=True)
+class ChartDimension:
+    """Sorted centimeter boundaries for one body measurement."""
+
+    name: str
+    measurement: str
+    bounds: Tuple[float, ...]
+    labels: Tuple[str, ...]
+    lower: float = -math.inf
+    upper: float = math.inf
+
+    def label_for(self, value_cm: float) -> Optional[str]:
+        """Label for ``value_cm``, or ``None`` outside ``[lower, upper]``."""
+
+        if not self.lower <= value_cm <= self.upper:
+            return None
+        return self.labels[bisect_left(self.bounds, value_cm)]
+
+
+@dataclass(frozen=True)
+class SizeChart:
+    """A compiled brand × category × region size chart."""
+
+    brand: str
+    category: str
+    region: str
+    version: str
+    dimensions: Tuple[ChartDimension, ...]
+    label_format: str
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.brand, self.category, self.region)
+
+    @property
+    def measurements(self) -> Tuple[str, ...]:
+        """``MeasurementNormalized`` keys the chart reads."""
+
+        return tuple(dimension.measurement for dimension in self.dimensions)
+
+    def size_for(self, measurements: Mapping[str, float]) -> Optional[str]:
+        """Size label for measurements keyed like ``MeasurementNormalized``.
+
+        Returns ``None`` when any dimension is outside the chart's range.
+
+        Raises:
+            KeyError: If a measurement the chart needs is missing
+        """
+
+        labels = {}
+        for dimension in self.dimensions:
+            label = dimension.label_for(measurements[dimension.measurement])
+            if label is None:
+                return None
+            labels[dimension.name] = label
+        return self.label_format.format_map(labels)
+
+    def out_of_range(self, measurements: Mapping[str, float]) -> Tuple[str, ...]:
+        """Names of the dimensions whose measurement the chart does not cover."""
+
+        return tuple(
+            dimension.name
+            for dimension in self.dimensions
+            if dimension.label_for(measurements[dimension.measurement]) is None
+        )
+
+
+def _chart_key(brand: str, category: str, region: str) -> Tuple[str, str, str]:
+    return (brand.lower(), category.lower(), region.upper())
+
+
+def compile_chart(spec: Mapping, source: str = "<chart>") -> SizeChart:
+    """Validate a chart spec and convert its bounds to centimeters.
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+
+    if not isinstance(spec, Mapping):
+        raise ValueError(f"{source}: a chart must be an object")
+    try:
+        scale = CM_PER_UNIT[spec.get("unit", "cm")]
+    except (KeyError, TypeError):
+        raise ValueError(f"{source}: unit must be one of {sorted(CM_PER_UNIT)}") from None
+
+    try:
+        brand, category, region = _chart_key(
+            spec["brand"], spec["category"], spec.get("region", DEFAULT_REGION)
+        )
+        raw_dimensions = spec["dimensions"]
+    except KeyError as exc:
+        raise ValueError(f"{source}: missing required key {exc}") from None
+    except AttributeError:
+        raise ValueError(f"{source}: brand, category and region must be strings") from None
+    if not isinstance(raw_dimensions, Mapping) or not raw_dimensions:
+        raise ValueError(f"{source}: dimensions must be a non-empty object")
+
+    dimensions = []
+    for name, dimension in raw_dimensions.items():
+        try:
+            if not isinstance(dimension["bounds"], list) or not isinstance(
+                dimension["labels"], list
+            ):
+                raise TypeError
+            bounds = tuple(float(bound) * scale for bound in dimension["bounds"])
+            labels = tuple(str(label) for label in dimension["labels"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(
+                f"{source}: {name} needs numeric bounds and labels lists"
+            ) from None
+        if any(lower >= upper for lower, upper in zip(bounds, bounds[1:])):
+            raise ValueError(f"{source}: {name} bounds must be strictly ascending")
+        if len(labels) != len(bounds) + 1:
+            raise ValueError(f"{source}: {name} needs exactly one more label than bounds")
+        try:
+            lower = float(dimension.get("min", -math.inf)) * scale
+            upper = float(dimension.get("max", math.inf)) * scale
+        except (TypeError, ValueError):
+            raise ValueError(f"{source}: {name} min and max must be numeric") from None
+        if bounds and not (lower < bounds[0] and bounds[-1] < upper):
+            raise ValueError(f"{source}: {name} min and max must lie outside the bounds")
+        dimensions.append(
+            ChartDimension(
+                name=name,
+                measurement=f"{name}_cm",
+                bounds=bounds,
+                labels=labels,
+                lower=lower,
+                upper=upper,
+            )
+        )
+
+    label_format = spec.get("format") or "-".join(f"{{{name}}}" for name in raw_dimensions)
+    if not isinstance(label_format, str):
+        raise ValueError(f"{source}: format must be a string")
+    try:
+        label_format.format(**{name: "" for name in raw_dimensions})
+    except (KeyError, IndexError, ValueError) as exc:
+        raise ValueError(f"{source}: format references unknown dimension {exc}") from None
+
+    return SizeChart(
+        brand=brand,
+        category=category,
+        region=region,
+        version=str(spec.get("version", "1")),
+        dimensions=tuple(dimensions),
+        label_format=label_format,
+    )
+
+
+class SizeChartRegistry:
+    """Compiled charts keyed by ``(brand, category, region)``."""
+
+    def __init__(self, charts: Iterable[SizeChart] = ()) -> None:
+        self._charts: Dict[Tuple[str, str, str], SizeChart] = {}
+        for chart in charts:
+            self.add(chart)
+
+    def __len__(self) -> int:
+        return len(self._charts)
+
+    def add(self, chart: SizeChart) -> None:
+        self._charts[chart.key] = chart
+
+    def find(
+        self,
+        category: str,
+        brand: str = DEFAULT_BRAND,
+        region: str = DEFAULT_REGION,
+    ) -> Optional[SizeChart]:
+        """Best chart for the request, falling back to default region/brand."""
+
+        chart = self._charts.get((brand, category, region))
+        if chart is not None:
+            return chart
+        brand, category, region = _chart_key(brand, category, region)
+        for key in (
+            (brand, category, region),
+            (brand, category, DEFAULT_REGION),
+            (DEFAULT_BRAND, category, region),
+            (DEFAULT_BRAND, category, DEFAULT_REGION),
+        ):
+            chart = self._charts.get(key)
+            if chart is not None:
+                return chart
+        return None
+
+    def get(
+        self,
+        category: str,
+        brand: str = DEFAULT_BRAND,
+        region: str = DEFAULT_REGION,
+    ) -> SizeChart:
+        """Like ``find`` but raises ``KeyError`` when nothing matches."""
+
+        chart = self.find(category, brand, region)
+        if chart is None:
+            raise KeyError(f"no size chart for {brand}/{category}/{region}")
+        return chart
+
+
+def charts_from_document(document, source: str = "<charts>") -> List[SizeChart]:
+    """Compile one parsed chart file: a chart, a list or a ``charts`` bundle.
+
+    Raises:
+        ValueError: If the document or any chart in it is malformed
+    """
+
+    specs = document.get("charts", [document]) if isinstance(document, dict) else document
+    if not isinstance(specs, list):
+        raise ValueError(f"{source}: expected a chart, a list of charts or a charts bundle")
+    return [compile_chart(spec, source=source) for spec in specs]
+
+
+def load_size_charts(directory: Path | str) -> SizeChartRegistry:
+    """Compile every ``*.json`` chart file under ``directory``."""
+
+    registry = SizeChartRegistry()
+    for path in sorted(Path(directory).glob("**/*.json")):
+        for chart in charts_from_document(json.loads(path.read_text()), source=str(path)):
+            registry.add(chart)
+    return registry
+
@@ -1,3 +1,48 @@
+"""Calibration vendor measurements: the two-photo stub and the real API client.
+
+``VendorClient`` calls ``GET {VENDOR_API_URL}/v1/measurements/{session_id}``.
+Every vendor call is billed, so the client never requests a session twice:
+
+- A successful response is stored in ``measurements_vendor`` (one row per
+  session and vendor, with the ``cost_usd`` of the call), and later requests
+  for that session are served from the table.
+- Concurrent requests for the same session share one in-flight call.
+- Failed calls are not stored, so they are retried on the next request.
+
+All requests share one ``httpx.AsyncClient``, so keep-alive connections are
+reused. At most ``VENDOR_MAX_CONCURRENCY`` calls run at once. 429 and 5xx
+responses and transport errors are retried with backoff. The cost of a call
+is the vendor's ``X-Cost-USD`` header when present and numeric, otherwise
+``VENDOR_COST_PER_CALL_USD``.
+
+``fetch_many`` is for calibration runs. It looks up cached sessions with one
+query per chunk, then fetches the rest concurrently.
+``backend/app/services/fake_vendor.py`` serves stub payloads over the same API
+for local runs and tests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from backend.app.core.config import settings
+from backend.app.core.database import ConnectionPool, database
+
+
+logger = logging.getLogger(__name__)
+
+# Sessions per cache lookup, below SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 500
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
 def fetch_two_photo_stub(session_id: str) -> dict:
     return {
         "neck": {"value": 35.0}, "shoulder": {"value": 44.0},
@@ -12,17 +57,292 @@ def fetch_two_photo_stub(session_id: str) -> dict:
     }
 
 
-def fetch_real_vendor(session_id: str) -> dict:
-    """Placeholder for a real vendor client.
+class VendorError(Exception):
+    """Raised when the vendor rejects a request or stays unavailable."""
+
 
-    Returns a vendor-shaped payload with None values to indicate the integration
-    is not yet implemented. This avoids KeyError during normalization while
-    making it explicit the values are missing.
-    Replace this with a real HTTP client calling your vendor API and returning the
-    vendor-specific payload expected by `normalize_vendor`.
+class VendorResponseCache:
+    """Paid vendor responses per session, in ``measurements_vendor``.
+
+    Without a database pool, responses are kept in memory for the life of the
+    process.
     """
-    keys = [
-        "neck","shoulder","chest","underbust","waist","sleeve","bicep","forearm",
-        "hip_low","thigh","knee","calf","ankle","front_rise","back_rise","inseam","outseam"
-    ]
-    return {k: {"value": None} for k in keys} | {"source_version": "real-placeholder", "session_id": session_id}
+
+    def __init__(self, pool: Optional[ConnectionPool], vendor_name: str) -> None:
+        self.pool = pool
+        self.vendor_name = vendor_name
+        self._memory: Dict[str, dict] = {}
+
+    async def get_many(self, session_ids: List[str]) -> Dict[str, dict]:
+        """Stored payloads for whichever of ``session_ids`` were already paid for."""
+
+        if self.pool is None:
+            return {sid: self._memory[sid] for sid in session_ids if sid in self._memory}
+        p = self.pool.placeholder
+
+        def lookup(connection):
+            found = {}
+            cursor = connection.cursor()
+            for start in range(0, len(session_ids), _LOOKUP_CHUNK):
+                chunk = session_ids[start:start + _LOOKUP_CHUNK]
+                cursor.execute(
+                    "select session_id, measurements from measurements_vendor "
+                    f"where vendor_name = {p} and session_id in ({', '.join([p] * len(chunk))})",
+                    (self.vendor_name, *chunk),
+                )
+                for session_id, measurements in cursor.fetchall():
+                    # jsonb arrives decoded from psycopg2, as text from SQLite
+                    if isinstance(measurements, str):
+                        measurements = json.loads(measurements)
+                    found[session_id] = measurements
+            return found
+
+        return await self.pool.run(lookup)
+
+    async def put(self, session_id: str, payload: dict, cost_usd: float) -> None:
+        """Record a paid response; a session already stored is left as is."""
+
+        if self.pool is None:
+            self._memory.setdefault(session_id, payload)
+            return
+        p = self.pool.placeholder
+        confidence = payload.get("confidence")
+        row = (
+            session_id,
+            self.vendor_name,
+            payload.get("source_version"),
+            json.dumps(payload),
+            confidence if isinstance(confidence, (int, float)) else None,
+            cost_usd,
+        )
+
+        def insert(connection):
+            connection.cursor().execute(
+                "insert into measurements_vendor (session_id, vendor_name, vendor_version, "
+                f"measurements, confidence, cost_usd) values ({p}, {p}, {p}, {p}, {p}, {p}) "
+                "on conflict (session_id, vendor_name) do nothing",
+                row,
+            )
+
+        await self.pool.run(insert)
+
+
+@dataclass
+class VendorBatch:
+    """Outcome of ``VendorClient.fetch_many``."""
+
+    results: Dict[str, dict] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    cache_hits: int = 0
+    cost_usd: float = 0.0
+
+
+class VendorClient:
+    """Pooled, bounded and cached async client for the vendor measurement API."""
+
+    def __init__(
+        self,
+        base_url: str,
+        cache: VendorResponseCache,
+        api_key: str = "",
+        max_concurrency: int = 8,
+        timeout: float = 30.0,
+        cost_per_call_usd: float = 0.0,
+        retries: int = 2,
+        backoff_seconds: float = 0.5,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.cache = cache
+        self.api_key = api_key
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.cost_per_call_usd = cost_per_call_usd
+        self.retries = retries
+        self.backoff_seconds = backoff_seconds
+        self._transport = transport
+        self._http: Optional[httpx.AsyncClient] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.failures = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.cost_usd = 0.0
+
+    def _client(self) -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        # Created on first use so they bind to the running event loop.
+        if self._http is None:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+                transport=self._transport,
+            )
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._http, self._slots
+
+    async def fetch(self, session_id: str) -> dict:
+        """Vendor payload for ``session_id``, paying for it at most once.
+
+        Raises:
+            VendorError: If the vendor rejects the session or stays unavailable
+        """
+
+        async def load():
+            cached = (await self.cache.get_many([session_id])).get(session_id)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+            payload, _ = await self._purchase(session_id)
+            return payload
+
+        return await self._single_flight(session_id, load)
+
+    async def fetch_many(self, session_ids: Iterable[str]) -> VendorBatch:
+        """Fetch a calibration batch; failures are reported per session."""
+
+        batch = VendorBatch()
+        unique = list(dict.fromkeys(session_ids))
+        cached = await self.cache.get_many(unique)
+        batch.results.update(cached)
+        batch.cache_hits = len(cached)
+        self.cache_hits += len(cached)
+        missing = [sid for sid in unique if sid not in cached]
+
+        async def buy(session_id):
+            # A concurrent fetch may have paid for it since the bulk lookup.
+            stored = (await self.cache.get_many([session_id])).get(session_id)
+            if stored is not None:
+                self.cache_hits += 1
+                batch.cache_hits += 1
+                return stored
+            payload, cost = await self._purchase(session_id)
+            batch.cost_usd += cost
+            return payload
+
+        outcomes = await asyncio.gather(
+            *(self._single_flight(sid, lambda sid=sid: buy(sid)) for sid in missing),
+            return_exceptions=True,
+        )
+        for session_id, outcome in zip(missing, outcomes):
+            if isinstance(outcome, BaseException):
+                batch.errors[session_id] = f"{type(outcome).__name__}: {outcome}"
+            else:
+                batch.results[session_id] = outcome
+        return batch
+
+    async def _single_flight(self, session_id: str, load) -> dict:
+        inflight = self._inflight.get(session_id)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[session_id] = future
+        try:
+            payload = await load()
+        except BaseException as exc:
+            if isinstance(exc, Exception):
+                future.set_exception(exc)
+                future.exception()  # mark retrieved when nobody is waiting
+            else:
+                future.cancel()
+            raise
+        finally:
+            self._inflight.pop(session_id, None)
+        future.set_result(payload)
+        return payload
+
+    async def _purchase(self, session_id: str) -> Tuple[dict, float]:
+        http, slots = self._client()
+        async with slots:
+            response = await self._request(http, session_id)
+        try:
+            payload = response.json()
+        except ValueError as exc:
+            raise VendorError(f"vendor returned invalid JSON for {session_id}") from exc
+        cost = self._cost(session_id, response.headers.get("X-Cost-USD"))
+        self.calls += 1
+        self.cost_usd += cost
+        await self.cache.put(session_id, payload, cost)
+        return payload, cost
+
+    def _cost(self, session_id: str, header_cost: Optional[str]) -> float:
+        # The call is already paid for here, so a bad header must never stop
+        # the payload from being stored.
+        if header_cost:
+            try:
+                cost = float(header_cost)
+            except ValueError:
+                cost = math.nan
+            if math.isfinite(cost) and cost >= 0:
+                return cost
+            logger.warning(
+                "vendor sent X-Cost-USD %r for %s; using the configured cost",
+                header_cost,
+                session_id,
+            )
+        return self.cost_per_call_usd
+
+    async def _request(self, http: httpx.AsyncClient, session_id: str) -> httpx.Response:
+        for attempt in range(self.retries + 1):
+            try:
+                response = await http.get(f"/v1/measurements/{session_id}")
+            except httpx.TransportError as exc:
+                error = f"{type(exc).__name__}: {exc}"
+            else:
+                if response.status_code < 400:
+                    return response
+                error = f"HTTP {response.status_code}"
+                if response.status_code not in _RETRY_STATUSES:
+                    break
+            if attempt < self.retries:
+                logger.warning("vendor call for %s failed (%s); retrying", session_id, error)
+                await asyncio.sleep(self.backoff_seconds * 2 ** attempt)
+        self.failures += 1
+        raise VendorError(f"vendor call for {session_id} failed: {error}")
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+            "cost_usd": round(self.cost_usd, 4),
+        }
+
+
+vendor_client: Optional[VendorClient] = None
+if settings.vendor_api_url:
+    vendor_client = VendorClient(
+        settings.vendor_api_url,
+        VendorResponseCache(database, settings.vendor_name),
+        api_key=settings.vendor_api_key,
+        max_concurrency=settings.vendor_max_concurrency,
+        timeout=settings.vendor_timeout_seconds,
+        cost_per_call_usd=settings.vendor_cost_per_call_usd,
+    )
+
+
+async def fetch_real_vendor(session_id: str) -> dict:
+    """Vendor payload for ``session_id`` from the configured vendor API.
+
+    Raises:
+        VendorError: If ``VENDOR_API_URL`` is not set or the call fails
+    """
+
+    if vendor_client is None:
+        raise VendorError("VENDOR_API_URL is not configured")
+    return await vendor_client.fetch(session_id)
@@ -0,0 +1,25 @@
+-- Migration: Packed float32 landmark storage
+-- Description: Stores each view's 33 MediaPipe landmarks as 528 bytes of
+--              little-endian float32 (x, y, z, visibility per point) instead
+--              of 33 JSONB objects. The JSONB column stays for rows written
+--              before this migration until they are converted with
+--              `python -m backend.app.jobs.backfill_landmarks`.
+
+ALTER TABLE mediapipe_landmarks
+    ADD COLUMN IF NOT EXISTS landmarks_f32 BYTEA;
+
+ALTER TABLE mediapipe_landmarks
+    ALTER COLUMN landmarks DROP NOT NULL;
+
+ALTER TABLE mediapipe_landmarks
+    ADD CONSTRAINT mediapipe_landmarks_payload_present
+    CHECK (landmarks IS NOT NULL OR landmarks_f32 IS NOT NULL);
+
+ALTER TABLE mediapipe_landmarks
+    ADD CONSTRAINT mediapipe_landmarks_f32_whole_points
+    CHECK (landmarks_f32 IS NULL OR octet_length(landmarks_f32) % 16 = 0);
+
+COMMENT ON COLUMN mediapipe_landmarks.landmarks_f32 IS
+    'Packed little-endian float32 x, y, z, visibility per landmark (33 points, 528 bytes)';
+COMMENT ON COLUMN mediapipe_landmarks.landmarks IS
+    'Legacy JSON landmarks; NULL once backfilled into landmarks_f32';
@@ -0,0 +1,16 @@
+-- Migration: Measurement replay checkpoints
+-- Description: One row per replayed model version, advanced in the same
+--              transaction as each chunk of recomputed normalized_measurements
+--              so `python -m backend.app.jobs.replay_measurements` can resume
+--              after an interruption without writing a session twice.
+
+CREATE TABLE IF NOT EXISTS measurement_replays (
+    model_version TEXT PRIMARY KEY,
+    last_session_id TEXT NOT NULL,
+    sessions INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Replay scans landmarks in session order.
+CREATE INDEX IF NOT EXISTS idx_mediapipe_landmarks_session_created
+    ON mediapipe_landmarks (session_id, created_at);
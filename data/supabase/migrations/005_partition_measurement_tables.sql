@@ -0,0 +1,202 @@
+-- Migration: Monthly partitioning of measurement tables
+-- Description: Range-partitions measurement_sessions, mediapipe_landmarks and
+--              normalized_measurements by created_at, one partition per month
+--              named <table>_pYYYY_MM. Recent-session queries prune to the
+--              newest partitions, and months past retention are exported to
+--              Parquet and dropped by `python -m backend.app.jobs.archive_partitions`,
+--              which also pre-creates upcoming months through
+--              ensure_measurement_partitions().
+--
+-- Postgres requires the partition key in every primary key and unique
+-- constraint, and a foreign key cannot reference session_id alone on a
+-- partitioned table. So primary keys become (id, created_at), session
+-- uniqueness becomes (session_id, created_at), and the session foreign keys
+-- are dropped, including those from measurement_photos, measurements_mediapipe,
+-- measurements_vendor and size_recommendations (CASCADE below removes only
+-- those constraints and the policies that query the old table, not the
+-- tables or their rows). Row level security, every policy and the updated_at
+-- trigger are recreated at the end. The provenance writer inserts a session
+-- and its rows in one transaction and skips sessions that already exist. The
+-- archival job drops the same month from all three tables together.
+--
+-- Existing rows are copied into the new tables. Run during a quiet window:
+-- the copy holds locks on the old tables until it commits.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION ensure_measurement_partitions(from_month DATE, months_ahead INTEGER)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    parent TEXT;
+    month_start DATE;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY['measurement_sessions', 'mediapipe_landmarks', 'normalized_measurements'] LOOP
+        FOR month_offset IN 0..months_ahead LOOP
+            month_start := (date_trunc('month', from_month) + make_interval(months => month_offset))::DATE;
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                parent || '_p' || to_char(month_start, 'YYYY_MM'),
+                parent,
+                month_start,
+                (month_start + INTERVAL '1 month')::DATE
+            );
+        END LOOP;
+    END LOOP;
+END;
+$$;
+
+ALTER TABLE normalized_measurements RENAME TO normalized_measurements_unpartitioned;
+ALTER TABLE mediapipe_landmarks RENAME TO mediapipe_landmarks_unpartitioned;
+ALTER TABLE measurement_sessions RENAME TO measurement_sessions_unpartitioned;
+
+CREATE TABLE measurement_sessions (
+    LIKE measurement_sessions_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS
+) PARTITION BY RANGE (created_at);
+CREATE TABLE mediapipe_landmarks (
+    LIKE mediapipe_landmarks_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS
+) PARTITION BY RANGE (created_at);
+CREATE TABLE normalized_measurements (
+    LIKE normalized_measurements_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS
+) PARTITION BY RANGE (created_at);
+
+ALTER TABLE measurement_sessions ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE mediapipe_landmarks ALTER COLUMN created_at SET NOT NULL;
+ALTER TABLE normalized_measurements ALTER COLUMN created_at SET NOT NULL;
+
+-- Monthly partitions from the oldest stored row through three months past the
+-- newest row or today. There is deliberately no DEFAULT partition: rows in it
+-- would block creating their month's partition and would never be archived.
+-- The daily archival job keeps --months-ahead partitions ready instead.
+DO $$
+DECLARE
+    first_month DATE;
+    last_month DATE;
+BEGIN
+    SELECT date_trunc('month', coalesce(least(
+        (SELECT min(created_at) FROM measurement_sessions_unpartitioned),
+        (SELECT min(created_at) FROM mediapipe_landmarks_unpartitioned),
+        (SELECT min(created_at) FROM normalized_measurements_unpartitioned)
+    ), now()))::DATE INTO first_month;
+    SELECT date_trunc('month', greatest(
+        (SELECT max(created_at) FROM measurement_sessions_unpartitioned),
+        (SELECT max(created_at) FROM mediapipe_landmarks_unpartitioned),
+        (SELECT max(created_at) FROM normalized_measurements_unpartitioned),
+        now()
+    ))::DATE INTO last_month;
+    PERFORM ensure_measurement_partitions(
+        first_month,
+        ((extract(YEAR FROM last_month) - extract(YEAR FROM first_month)) * 12
+            + extract(MONTH FROM last_month) - extract(MONTH FROM first_month))::INTEGER + 3
+    );
+END;
+$$;
+
+INSERT INTO measurement_sessions SELECT * FROM measurement_sessions_unpartitioned;
+INSERT INTO mediapipe_landmarks SELECT * FROM mediapipe_landmarks_unpartitioned;
+INSERT INTO normalized_measurements SELECT * FROM normalized_measurements_unpartitioned;
+
+DROP TABLE normalized_measurements_unpartitioned;
+DROP TABLE mediapipe_landmarks_unpartitioned;
+DROP TABLE measurement_sessions_unpartitioned CASCADE;
+
+-- Keys and indexes are added after the old tables (and their identically
+-- named indexes) are gone.
+ALTER TABLE measurement_sessions ADD PRIMARY KEY (id, created_at);
+ALTER TABLE measurement_sessions ADD UNIQUE (session_id, created_at);
+ALTER TABLE mediapipe_landmarks ADD PRIMARY KEY (id, created_at);
+ALTER TABLE normalized_measurements ADD PRIMARY KEY (id, created_at);
+
+-- Indexes on the parent are created on every partition.
+CREATE INDEX idx_measurement_sessions_created_at ON measurement_sessions (created_at);
+CREATE INDEX idx_measurement_sessions_session ON measurement_sessions (session_id);
+CREATE INDEX idx_mediapipe_landmarks_session_view ON mediapipe_landmarks (session_id, view);
+CREATE INDEX idx_mediapipe_landmarks_session_created ON mediapipe_landmarks (session_id, created_at);
+CREATE INDEX idx_normalized_measurements_session ON normalized_measurements (session_id);
+CREATE INDEX idx_normalized_measurements_created_at ON normalized_measurements (created_at);
+
+-- LIKE copies neither row level security nor triggers, and dropping the old
+-- tables dropped their policies along with every policy on another table that
+-- queried measurement_sessions. Restore them all as defined in 002.
+ALTER TABLE measurement_sessions ENABLE ROW LEVEL SECURITY;
+ALTER TABLE mediapipe_landmarks ENABLE ROW LEVEL SECURITY;
+ALTER TABLE normalized_measurements ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view own sessions" ON measurement_sessions
+    FOR SELECT USING (auth.uid() = user_id);
+
+CREATE POLICY "Users can insert own sessions" ON measurement_sessions
+    FOR INSERT WITH CHECK (auth.uid() = user_id);
+
+CREATE POLICY "Users can view own landmarks" ON mediapipe_landmarks
+    FOR SELECT USING (
+        session_id IN (SELECT id FROM measurement_sessions WHERE user_id = auth.uid())
+    );
+
+CREATE POLICY "Users can insert own landmarks" ON mediapipe_landmarks
+    FOR INSERT WITH CHECK (
+        session_id IN (SELECT id FROM measurement_sessions WHERE user_id = auth.uid())
+    );
+
+CREATE POLICY "Users can view own normalized measurements" ON normalized_measurements
+    FOR SELECT USING (
+        session_id IN (SELECT session_id FROM measurement_sessions WHERE user_id = auth.uid())
+    );
+
+CREATE POLICY "Users can insert own normalized measurements" ON normalized_measurements
+    FOR INSERT WITH CHECK (
+        session_id IN (SELECT session_id FROM measurement_sessions WHERE user_id = auth.uid())
+    );
+
+CREATE POLICY "Service role full access sessions" ON measurement_sessions
+    FOR ALL USING (auth.jwt()->>'role' = 'service_role');
+
+CREATE POLICY "Service role full access landmarks" ON mediapipe_landmarks
+    FOR ALL USING (auth.jwt()->>'role' = 'service_role');
+
+CREATE POLICY "Service role full access normalized measurements" ON normalized_measurements
+    FOR ALL USING (auth.jwt()->>'role' = 'service_role');
+
+DROP POLICY IF EXISTS "Users can view own photos" ON measurement_photos;
+CREATE POLICY "Users can view own photos" ON measurement_photos
+    FOR SELECT USING (
+        session_id IN (SELECT id FROM measurement_sessions WHERE user_id = auth.uid())
+    );
+
+DROP POLICY IF EXISTS "Users can insert own photos" ON measurement_photos;
+CREATE POLICY "Users can insert own photos" ON measurement_photos
+    FOR INSERT WITH CHECK (
+        session_id IN (SELECT id FROM measurement_sessions WHERE user_id = auth.uid())
+    );
+
+DROP POLICY IF EXISTS "Users can view own measurements" ON measurements_mediapipe;
+CREATE POLICY "Users can view own measurements" ON measurements_mediapipe
+    FOR SELECT USING (
+        session_id IN (SELECT id FROM measurement_sessions WHERE user_id = auth.uid())
+    );
+
+DROP POLICY IF EXISTS "Users can insert own measurements" ON measurements_mediapipe;
+CREATE POLICY "Users can insert own measurements" ON measurements_mediapipe
+    FOR INSERT WITH CHECK (
+        session_id IN (SELECT id FROM measurement_sessions WHERE user_id = auth.uid())
+    );
+
+DROP POLICY IF EXISTS "Users can view own recommendations" ON size_recommendations;
+CREATE POLICY "Users can view own recommendations" ON size_recommendations
+    FOR SELECT USING (
+        session_id IN (SELECT id FROM measurement_sessions WHERE user_id = auth.uid())
+    );
+
+DROP POLICY IF EXISTS "Users can insert own recommendations" ON size_recommendations;
+CREATE POLICY "Users can insert own recommendations" ON size_recommendations
+    FOR INSERT WITH CHECK (
+        session_id IN (SELECT id FROM measurement_sessions WHERE user_id = auth.uid())
+    );
+
+CREATE TRIGGER update_measurement_sessions_updated_at
+    BEFORE UPDATE ON measurement_sessions
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+COMMIT;
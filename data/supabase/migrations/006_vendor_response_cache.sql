@@ -0,0 +1,25 @@
+-- Migration: Vendor response cache
+-- Description: measurements_vendor becomes the persistent per-session cache of
+--              paid vendor responses used by backend/app/services/vendor_client.py.
+--              Session ids are the API's text ids (as in normalized_measurements);
+--              the foreign key to measurement_sessions(id) was dropped when that
+--              table was partitioned in 005. One row per session and vendor, so
+--              a session is never paid for twice.
+
+BEGIN;
+
+ALTER TABLE measurements_vendor ALTER COLUMN session_id TYPE TEXT USING session_id::TEXT;
+ALTER TABLE measurements_vendor ALTER COLUMN session_id SET NOT NULL;
+
+-- Keep the latest response if a session was fetched more than once.
+DELETE FROM measurements_vendor older
+USING measurements_vendor newer
+WHERE older.session_id = newer.session_id
+  AND older.vendor_name = newer.vendor_name
+  AND (older.called_at, older.id) < (newer.called_at, newer.id);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_measurements_vendor_session_vendor
+    ON measurements_vendor (session_id, vendor_name);
+DROP INDEX IF EXISTS idx_vendor_session;
+
+COMMIT;
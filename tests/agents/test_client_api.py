@@ -2,7 +2,10 @@ from unittest.mock import patch
 from agents.client.api import dmaas_latest
 
 class _DummyResponse:
-    def __init__(self, payload): self._p = payload
+    def __init__(self, payload, status_code=200, etag=None):
+        self._p = payload
+        self.status_code = status_code
+        self.headers = {"ETag": etag} if etag else {}
     def json(self): return self._p
     def raise_for_status(self): return None
 
@@ -12,3 +15,12 @@ def test_dmaas_latest_returns_json(mock_get):
     data = dmaas_latest()
     assert "measurements" in data
     assert isinstance(data["measurements"], list)
+
+@patch("httpx.Client.get")
+def test_dmaas_latest_reuses_payload_when_not_modified(mock_get):
+    mock_get.return_value = _DummyResponse({"session_id": "s1"}, etag='"abc"')
+    first = dmaas_latest()
+    mock_get.return_value = _DummyResponse(None, status_code=304)
+    second = dmaas_latest()
+    assert second == first == {"session_id": "s1"}
+    assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"abc"'
@@ -0,0 +1,54 @@
+"""Tests for the measurement crew wiring."""
+
+import ast
+from pathlib import Path
+import sys
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+CREW_MODULE = PROJECT_ROOT / "agents" / "crew" / "measurement_crew.py"
+
+
+def _agent_tools(tree, role):
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "Agent":
+            keywords = {keyword.arg: keyword.value for keyword in node.keywords}
+            if ast.literal_eval(keywords["role"]) == role:
+                tools = keywords.get("tools")
+                return [element.id for element in tools.elts] if tools else []
+    raise AssertionError(f"no {role} agent")
+
+
+def test_crew_module_parses_and_defines_one_crew():
+    """The module compiles, with a single factory and entry point."""
+
+    tree = ast.parse(CREW_MODULE.read_text(), filename=str(CREW_MODULE))
+    functions = [node.name for node in tree.body if isinstance(node, ast.FunctionDef)]
+
+    assert functions == ["create_measurement_crew", "main"]
+
+
+def test_architect_validates_and_recommends_in_one_call():
+    """The architect holds the fused tool, with validate_measurements for repairs."""
+
+    tree = ast.parse(CREW_MODULE.read_text())
+
+    assert _agent_tools(tree, "Architect") == ["validate_and_recommend", "validate_measurements"]
+    assert _agent_tools(tree, "ML Engineer") == ["recommend_sizes"]
+
+
+def test_crew_builds_with_the_fused_tool(monkeypatch):
+    """With crewai installed, the crew imports and wires the tools."""
+
+    pytest.importorskip("crewai")
+    from agents.crew.measurement_crew import create_measurement_crew
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    crew = create_measurement_crew()
+
+    architect = next(agent for agent in crew.agents if agent.role == "Architect")
+    assert "validate_and_recommend" in [tool.name for tool in architect.tools]
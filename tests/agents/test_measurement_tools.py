@@ -21,7 +21,12 @@ with mocked backend responses to verify retry logic, circuit breaker, and error
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from agents.tools.measurement_tools import recommend_sizes, validate_measurements  # noqa: E402
+from agents.tools.measurement_tools import (  # noqa: E402
+    recommend_sizes,
+    validate_and_recommend,
+    validate_breaker,
+    validate_measurements,
+)
 
 
 def test_validate_measurements_success():
@@ -105,6 +110,23 @@ def test_validate_measurements_server_error_with_retry():
         assert mock_post.call_count == 2
 
 
+def test_retries_reuse_idempotency_key():
+    """Every attempt of one logical call carries the same Idempotency-Key."""
+
+    with patch("agents.tools.measurement_tools.requests.post") as mock_post:
+        mock_response = MagicMock()
+        mock_response.status_code = 502
+        mock_post.return_value = mock_response
+
+        validate_measurements({"waist_natural": 32, "unit": "in"})
+
+        first, retry = (
+            call.kwargs["headers"]["Idempotency-Key"] for call in mock_post.call_args_list
+        )
+        assert first == retry
+    validate_breaker.call_succeeded()
+
+
 def test_validate_measurements_rate_limit():
     """Rate limits should be surfaced without retry after the second attempt."""
 
@@ -187,3 +209,37 @@ def test_recommend_sizes_timeout():
         assert result["type"] == "timeout_error"
         assert mock_post.call_count == 2
 
+
+def test_validate_and_recommend_uses_the_fused_route():
+    """The fused tool makes one call and passes the combined payload through."""
+
+    with patch("agents.tools.measurement_tools.requests.post") as mock_post:
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "recommendations": [{"category": "tops", "size": "M", "confidence": 0.9}],
+            "processed_measurements": {"chest_cm": 100.0, "source": "user"},
+            "model_version": "v1.0-mediapipe",
+        }
+        mock_post.return_value = mock_response
+
+        result = validate_and_recommend({"chest": 100, "unit": "cm"})
+
+        assert mock_post.call_count == 1
+        assert mock_post.call_args.args[0].endswith("/measurements/validate-and-recommend")
+        assert result["processed_measurements"]["chest_cm"] == 100.0
+        assert result["recommendations"][0]["size"] == "M"
+
+
+def test_validate_and_recommend_422_error():
+    """Validation errors from the fused route reach the agent for repair."""
+
+    with patch("agents.tools.measurement_tools.requests.post") as mock_post:
+        mock_response = MagicMock()
+        mock_response.status_code = 422
+        mock_response.json.return_value = {"detail": {"code": "unknown_field"}}
+        mock_post.return_value = mock_response
+
+        result = validate_and_recommend({"waist_circ": 32, "unit": "in"})
+
+        assert result == {"error": {"code": "unknown_field"}, "status_code": 422}
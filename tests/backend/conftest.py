@@ -0,0 +1,45 @@
+"""Shared helpers for the backend tests."""
+
+from typing import Optional
+
+
+def landmark_view(
+    offset: float = 0.0,
+    *,
+    spread: float = 0.01,
+    count: int = 33,
+    visibility: float = 0.9,
+    timestamp: str = "2025-10-26T15:00:00Z",
+    image_width: int = 1080,
+    image_height: int = 1920,
+) -> dict:
+    """One ``MediaPipeLandmarks`` payload: a plausible, deterministic pose.
+
+    ``offset`` shifts every point horizontally and ``spread`` sets the gap
+    between consecutive points, so different values give different
+    measurements.
+    """
+
+    return {
+        "landmarks": [
+            {
+                "x": 0.3 + spread * i + offset,
+                "y": 0.05 + 0.028 * i,
+                "z": 0.002 * (i % 5),
+                "visibility": visibility,
+            }
+            for i in range(count)
+        ],
+        "timestamp": timestamp,
+        "image_width": image_width,
+        "image_height": image_height,
+    }
+
+
+def landmark_frame(offset: float = 0.0, side_offset: Optional[float] = None, **options) -> dict:
+    """Front and side views for ``/measurements/validate`` and the stream."""
+
+    return {
+        "front_landmarks": landmark_view(offset, **options),
+        "side_landmarks": landmark_view(offset if side_offset is None else side_offset, **options),
+    }
@@ -0,0 +1,143 @@
+"""Tests for the monthly Parquet archival job against a SQLite stand-in."""
+
+import datetime as dt
+from pathlib import Path
+import sqlite3
+import sys
+
+import numpy as np
+import pytest
+
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.database import connection_pool  # noqa: E402
+from backend.app.core.landmarks import landmarks_from_bytes  # noqa: E402
+from backend.app.core.provenance import ProvenanceWriter  # noqa: E402
+from backend.app.core.validation import normalize_and_validate  # noqa: E402
+from backend.app.jobs.archive_partitions import (  # noqa: E402
+    archive_partitions,
+    retention_cutoff,
+)
+from backend.app.schemas.measure_schema import MeasurementInput  # noqa: E402
+from tests.backend.conftest import landmark_frame, landmark_view  # noqa: E402
+
+
+TODAY = dt.date(2026, 10, 16)
+# Session id -> created_at; the "old-" sessions are past a 12 month retention.
+SESSIONS = {
+    "old-a": "2025-03-04 10:00:00",
+    "old-b": "2025-03-28 23:59:59",
+    "old-c": "2025-09-30 12:00:00",
+    "kept": "2025-10-01 00:00:00",
+    "recent": "2026-10-15 08:30:00",
+}
+TABLES = ("measurement_sessions", "mediapipe_landmarks", "normalized_measurements")
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Provenance database with sessions spread over several months."""
+
+    path = tmp_path / "provenance.db"
+    writer = ProvenanceWriter(connection_pool(f"sqlite:///{path}", 1))
+    for number, session_id in enumerate(SESSIONS):
+        input_data = MeasurementInput(
+            front_landmarks=landmark_view(0.01 * number),
+            side_landmarks=landmark_view(0.005 * number),
+            session_id=session_id,
+        )
+        writer.submit(input_data, normalize_and_validate(input_data))
+    writer.close()
+    with sqlite3.connect(path) as connection:
+        for session_id, created_at in SESSIONS.items():
+            for table in TABLES:
+                connection.execute(
+                    f"update {table} set created_at = ? where session_id = ?",
+                    (created_at, session_id),
+                )
+    return path
+
+
+def _session_ids(path, table):
+    with sqlite3.connect(path) as connection:
+        rows = connection.execute(f"select session_id from {table}").fetchall()
+    return sorted({session_id for (session_id,) in rows})
+
+
+def test_retention_cutoff_counts_whole_months():
+    """Twelve months of retention keep the same month of last year onwards."""
+
+    assert retention_cutoff(TODAY, 12) == dt.date(2025, 10, 1)
+    assert retention_cutoff(dt.date(2026, 1, 31), 1) == dt.date(2025, 12, 1)
+
+
+def test_archive_exports_and_drops_months_past_retention(database, tmp_path):
+    """Old months land in Parquet with their landmarks and leave the database."""
+
+    archive = tmp_path / "archive"
+    report = archive_partitions(
+        connection_pool(f"sqlite:///{database}", 1), archive, today=TODAY, fetch_size=1
+    )
+
+    assert report.months == ["2025-03", "2025-09"]
+    assert report.rows == {
+        "measurement_sessions": 3,
+        "mediapipe_landmarks": 6,
+        "normalized_measurements": 3,
+    }
+    assert report.bytes_written > 0
+    for table in TABLES:
+        assert _session_ids(database, table) == ["kept", "recent"]
+
+    march = pq.read_table(archive / "mediapipe_landmarks" / "mediapipe_landmarks_2025_03.parquet")
+    assert march.num_rows == 4
+    assert sorted(set(march.column("session_id").to_pylist())) == ["old-a", "old-b"]
+    packed = march.column("landmarks_f32").to_pylist()[0]
+    assert landmarks_from_bytes(packed).shape == (33, 4)
+    assert np.isfinite(landmarks_from_bytes(packed)).all()
+
+    sessions = pq.read_table(
+        archive / "measurement_sessions" / "measurement_sessions_2025_09.parquet"
+    )
+    assert sessions.column("session_id").to_pylist() == ["old-c"]
+    assert sessions.column("created_at").to_pylist()[0] == dt.datetime(
+        2025, 9, 30, 12, tzinfo=dt.timezone.utc
+    )
+    assert not list(archive.rglob("*.tmp"))
+
+
+def test_archive_rerun_and_dry_run_change_nothing(database, tmp_path):
+    """A dry run only lists months, and a second real run finds nothing left."""
+
+    pool = connection_pool(f"sqlite:///{database}", 1)
+    archive = tmp_path / "archive"
+
+    dry = archive_partitions(pool, archive, today=TODAY, dry_run=True)
+    assert dry.months == ["2025-03", "2025-09"]
+    assert not archive.exists()
+    assert len(_session_ids(database, "measurement_sessions")) == len(SESSIONS)
+
+    archive_partitions(pool, archive, today=TODAY)
+    again = archive_partitions(pool, archive, today=TODAY)
+    assert again.months == [] and again.rows == {}
+    assert _session_ids(database, "measurement_sessions") == ["kept", "recent"]
+
+
+def test_writer_skips_sessions_that_already_exist(tmp_path):
+    """Resubmitting a session adds measurements without a duplicate session row."""
+
+    path = tmp_path / "provenance.db"
+    writer = ProvenanceWriter(connection_pool(f"sqlite:///{path}", 1))
+    input_data = MeasurementInput(**landmark_frame(), session_id="twice")
+    writer.submit(input_data, normalize_and_validate(input_data))
+    writer.submit(input_data, normalize_and_validate(input_data))
+    writer.close()
+
+    with sqlite3.connect(path) as connection:
+        sessions = connection.execute("select count(*) from measurement_sessions").fetchone()[0]
+        results = connection.execute("select count(*) from normalized_measurements").fetchone()[0]
+    assert (sessions, results) == (1, 2)
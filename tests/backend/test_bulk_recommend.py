@@ -0,0 +1,146 @@
+"""Tests for the streamed NDJSON bulk recommendation endpoint."""
+
+import asyncio
+import json
+from pathlib import Path
+import sys
+
+from fastapi.testclient import TestClient
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.config import settings  # noqa: E402
+from backend.app.main import app  # noqa: E402
+from backend.app.routers.measurements import _ndjson_lines  # noqa: E402
+
+
+client = TestClient(app)
+API_HEADERS = {"X-API-Key": "staging-secret-key"}
+NDJSON_HEADERS = {**API_HEADERS, "Content-Type": "application/x-ndjson"}
+
+
+def _ndjson(rows):
+    return "\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows)
+
+
+def _post(body, **params):
+    response = client.post(
+        "/measurements/recommend/bulk", content=body, params=params, headers=NDJSON_HEADERS
+    )
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    return response, lines
+
+
+def test_bulk_lines_follow_the_recommend_contract():
+    """Each profile line matches what /measurements/recommend returns."""
+
+    profile = {"chest_cm": 101.0, "waist_natural_cm": 81.0, "session_id": "shopper-1"}
+    single = client.post(
+        "/measurements/recommend", json=profile, headers=API_HEADERS
+    ).json()
+
+    response, lines = _post(_ndjson([profile]))
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    first = lines[0]
+    assert first["index"] == 0 and first["status"] == "ok"
+    assert first["session_id"] == "shopper-1"
+    assert first["processed_measurements"] == single["processed_measurements"]
+    assert first["model_version"] == single["model_version"]
+    assert first["catalog_version"] == single["catalog_version"]
+    assert [r["category"] for r in first["recommendations"]] == [
+        r["category"] for r in single["recommendations"]
+    ]
+
+
+def test_bulk_streams_across_chunks_in_input_order(monkeypatch):
+    """Profiles spanning several chunks come back once each, in order."""
+
+    monkeypatch.setattr(settings, "recommend_bulk_chunk_size", 3)
+    profiles = [{"chest_cm": 90.0 + i, "session_id": f"s{i}"} for i in range(8)]
+
+    _, lines = _post(_ndjson(profiles) + "\n\n", top_k=2)
+
+    assert [line["index"] for line in lines[:-1]] == list(range(8))
+    assert [line["session_id"] for line in lines[:-1]] == [f"s{i}" for i in range(8)]
+    assert all(len(ranked) <= 2 for ranked in lines[0]["matches"].values())
+    assert lines[-1]["summary"]["succeeded"] == 8
+
+
+def test_invalid_lines_are_reported_without_stopping_the_run():
+    """Malformed lines get an error envelope; later lines are still scored."""
+
+    _, lines = _post(_ndjson([{"chest_cm": 100.0}, "{not json", {"chest_cm": "wide"}, {}]))
+
+    assert [line.get("status") for line in lines[:4]] == ["ok", "error", "error", "ok"]
+    assert lines[2]["error"]["code"] == "invalid_payload"
+    assert lines[2]["error"]["errors"][0]["field"] == "chest_cm"
+    assert lines[-1]["summary"] == {
+        "succeeded": 2,
+        "failed": 2,
+        "catalog_version": lines[0]["catalog_version"],
+        "model_version": lines[0]["model_version"],
+    }
+
+
+class _ChunkedBody:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def _split_lines(chunks, max_line_bytes):
+    async def collect():
+        return [line async for line in _ndjson_lines(_ChunkedBody(chunks), max_line_bytes)]
+
+    return asyncio.run(collect())
+
+
+def test_ndjson_lines_rejoin_lines_split_across_chunks():
+    """Pieces of a line spread over many chunks are joined; blank lines are skipped."""
+
+    body = b'{"a": 1}\n\n{"b": 22}\n  \n{"c": 333}'
+    chunks = [body[i:i + 3] for i in range(0, len(body), 3)]
+
+    assert _split_lines(chunks, 64) == [b'{"a": 1}', b'{"b": 22}', b'{"c": 333}']
+
+
+def test_ndjson_lines_report_overlong_lines_without_buffering_them():
+    """Lines over the limit, terminated or not, come back as ``None``."""
+
+    chunks = [b"ok\n" + b"x" * 6, b"x" * 6, b"\nfine\n", b"y" * 20]
+
+    assert _split_lines(chunks, 8) == [b"ok", None, b"fine", None]
+    assert _split_lines([b"12345678\n123456789\n"], 8) == [b"12345678", None]
+
+
+def test_overlong_lines_are_reported_and_the_run_continues(monkeypatch):
+    """An oversized line gets a line_too_long error; its neighbours are scored."""
+
+    monkeypatch.setattr(settings, "recommend_bulk_max_line_bytes", 64)
+    huge = json.dumps({"chest_cm": 100.0, "session_id": "s" * 200})
+
+    _, lines = _post(_ndjson([{"chest_cm": 100.0}, huge, {"chest_cm": 95.0}]))
+
+    assert [line.get("status") for line in lines[:3]] == ["ok", "error", "ok"]
+    assert lines[1]["index"] == 1
+    assert lines[1]["error"]["code"] == "line_too_long"
+    assert lines[-1]["summary"]["failed"] == 1
+
+
+def test_bulk_requires_api_key():
+    """The bulk endpoint uses the same API key check as recommend."""
+
+    response = client.post(
+        "/measurements/recommend/bulk",
+        content=_ndjson([{"chest_cm": 100.0}]),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 401
@@ -0,0 +1,152 @@
+"""Tests for vectorized catalog scoring and top-k recommendations."""
+
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.main import app  # noqa: E402
+from backend.app.services.catalog import (  # noqa: E402
+    TIGHT_PENALTY,
+    GarmentCatalog,
+)
+
+
+client = TestClient(app)
+API_HEADERS = {"X-API-Key": "staging-secret-key"}
+
+PROFILE = {
+    "chest_cm": 100.0,
+    "shoulder_cm": 45.0,
+    "sleeve_cm": 60.0,
+    "waist_natural_cm": 80.0,
+    "hip_low_cm": 100.0,
+    "thigh_cm": 55.0,
+    "inseam_cm": 76.0,
+}
+
+
+def _synthetic_catalog(count, seed=3):
+    rng = np.random.default_rng(seed)
+    skus = [
+        {
+            "sku": f"SKU-{i}",
+            "category": "tops",
+            "size": str(i),
+            "measurements": {
+                "chest": float(rng.uniform(80, 130)),
+                "sleeve": float(rng.uniform(55, 70)),
+            },
+        }
+        for i in range(count)
+    ]
+    return GarmentCatalog.from_document(
+        {
+            "version": "t1",
+            "categories": {
+                "tops": {
+                    "ease": {"chest": 10, "sleeve": 0},
+                    "tolerance": {"chest": 4, "sleeve": 2},
+                }
+            },
+            "skus": skus,
+        }
+    )
+
+
+def _reference_score(spec, body, ease, tolerance):
+    residuals = []
+    for name in spec:
+        if name in body:
+            residual = (spec[name] - body[name] - ease[name]) / tolerance[name]
+            residuals.append(residual * TIGHT_PENALTY if residual < 0 else residual)
+    return float(np.sqrt(np.mean(np.square(residuals))))
+
+
+def test_top_k_matches_per_sku_reference():
+    """Vectorized top-k equals scoring every SKU one at a time and sorting."""
+
+    catalog = _synthetic_catalog(5000)
+    body = {"chest": 100.0, "sleeve": 61.0}
+    matrix = catalog.categories["tops"]
+    reference = sorted(
+        (
+            _reference_score(
+                dict(zip(matrix.dimensions, row)),
+                body,
+                {"chest": 10, "sleeve": 0},
+                {"chest": 4, "sleeve": 2},
+            ),
+            sku,
+        )
+        for row, sku in zip(matrix.specs, matrix.skus)
+    )[:10]
+
+    ranked = catalog.match({"chest_cm": 100.0, "sleeve_cm": 61.0}, k=10)["tops"]
+
+    assert [match["sku"] for match in ranked] == [sku for _, sku in reference]
+    assert [match["fit_score"] for match in ranked] == pytest.approx(
+        [score for score, _ in reference], abs=1e-3
+    )
+
+
+def test_match_many_scores_profiles_independently():
+    """Batch matching returns the same ranking as single-profile matching."""
+
+    catalog = _synthetic_catalog(500)
+    profiles = [{"chest_cm": 90.0 + 5 * i, "sleeve_cm": 60.0} for i in range(4)]
+
+    batch = catalog.match_many(profiles, k=3)
+
+    assert batch == [catalog.match(profile, k=3) for profile in profiles]
+
+
+def test_missing_dimensions_are_ignored():
+    """Only dimensions the profile provides contribute to the score."""
+
+    catalog = _synthetic_catalog(50)
+
+    ranked = catalog.match({"chest_cm": 100.0}, k=1)["tops"]
+
+    assert ranked[0]["dimensions"] == ["chest"]
+    assert catalog.match({"waist_natural_cm": 80.0}, k=1) == {"tops": []}
+
+
+def test_unknown_category_is_rejected():
+    """SKUs must belong to a configured category."""
+
+    with pytest.raises(ValueError, match="unknown category"):
+        GarmentCatalog.from_document(
+            {
+                "categories": {},
+                "skus": [
+                    {"sku": "X", "category": "hats", "size": "M", "measurements": {"head": 57}}
+                ],
+            }
+        )
+
+
+def test_recommend_route_returns_top_k_per_category():
+    """The recommend route ranks sample catalog SKUs for each category."""
+
+    response = client.post(
+        "/measurements/recommend?top_k=3",
+        json={**PROFILE, "session_id": "catalog"},
+        headers=API_HEADERS,
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert {rec["category"] for rec in data["recommendations"]} == {"tops", "bottoms"}
+    assert [len(data["matches"][category]) for category in ("tops", "bottoms")] == [3, 3]
+    bottoms = data["matches"]["bottoms"]
+    assert bottoms[0]["size"] == "32x30"
+    assert [m["fit_score"] for m in bottoms] == sorted(m["fit_score"] for m in bottoms)
+    assert data["catalog_version"] == "2025.10"
+    assert data["session_id"] == "catalog"
@@ -0,0 +1,90 @@
+"""Tests for the bounded compute executor and its backpressure."""
+
+import asyncio
+from pathlib import Path
+import sys
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core import validation  # noqa: E402
+from backend.app.core.executor import BoundedExecutor, ExecutorSaturated  # noqa: E402
+from backend.app.main import app  # noqa: E402
+from backend.app.routers import measurements  # noqa: E402
+from tests.backend.conftest import landmark_frame  # noqa: E402
+
+
+client = TestClient(app)
+API_HEADERS = {"X-API-Key": "staging-secret-key"}
+
+
+def test_executor_rejects_when_queue_full():
+    """Work beyond workers + queue fails fast instead of waiting."""
+
+    executor = BoundedExecutor(kind="thread", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = [asyncio.create_task(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        stats = executor.stats()
+        with pytest.raises(ExecutorSaturated):
+            await executor.run(int)
+        release.set()
+        await asyncio.gather(*running)
+        return stats
+
+    stats = asyncio.run(scenario())
+    executor.shutdown()
+
+    assert stats["in_flight"] == 1
+    assert stats["queue_depth"] == 1
+    assert executor.stats()["rejected"] == 1
+    assert executor.stats()["completed"] == 2
+
+
+def test_process_pool_matches_inline_math():
+    """The pure landmark core gives identical results in a worker process."""
+
+    executor = BoundedExecutor(kind="process", max_workers=1, max_queue=0)
+    input_data = validation.MeasurementInput(**landmark_frame(0.0))
+    args = validation.landmark_core_args(input_data)
+
+    offloaded = asyncio.run(executor.run(validation.landmark_core, *args))
+    executor.shutdown()
+
+    assert offloaded == validation.landmark_core(*args)
+
+
+def test_saturated_pool_returns_503(monkeypatch):
+    """The validate route sheds load with 503 and Retry-After."""
+
+    executor = BoundedExecutor(kind="thread", max_workers=1, max_queue=0)
+    executor._pending = 1  # simulate a busy worker
+    monkeypatch.setattr(measurements, "compute_executor", executor)
+
+    response = client.post(
+        "/measurements/validate", json=landmark_frame(0.123), headers=API_HEADERS
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["detail"]["code"] == "overloaded"
+
+
+def test_metrics_report_executor_stats():
+    """Queue depth and wait time are exposed on /metrics."""
+
+    response = client.post(
+        "/measurements/validate", json=landmark_frame(0.321), headers=API_HEADERS
+    )
+    stats = client.get("/metrics").json()["compute_executor"]
+
+    assert response.status_code == 200
+    assert stats["completed"] >= 1
+    assert {"queue_depth", "wait_ms_avg", "wait_ms_max", "rejected"} <= set(stats)
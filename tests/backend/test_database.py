@@ -0,0 +1,141 @@
+"""Tests for the shared connection pool and the cached database health probe."""
+
+import asyncio
+from pathlib import Path
+import sqlite3
+import sys
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app import main as main_module  # noqa: E402
+from backend.app.core.database import (  # noqa: E402
+    DatabaseHealth,
+    PoolTimeout,
+    connection_pool,
+)
+from backend.app.main import app  # noqa: E402
+
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = connection_pool(f"sqlite:///{tmp_path / 'db.sqlite'}", 2, min_size=1)
+    yield pool
+    pool.close()
+
+
+def test_acquire_waits_are_bounded_and_reported(pool):
+    """A full pool times out callers and reports utilization and waits."""
+
+    first, second = pool.acquire(), pool.acquire()
+
+    with pytest.raises(PoolTimeout):
+        pool.acquire(timeout=0.05)
+    stats = pool.stats()
+    assert (stats["in_use"], stats["utilization"], stats["timeouts"]) == (2, 1.0, 1)
+
+    releaser = threading.Timer(0.05, pool.release, args=(first,))
+    releaser.start()
+    third = pool.acquire(timeout=2)
+    releaser.join()
+
+    assert third is first
+    assert pool.stats()["wait_max_ms"] >= 40
+    assert pool.stats()["open"] == 2
+    pool.release(second)
+    pool.release(third)
+
+
+def test_warm_opens_the_minimum_connections(pool):
+    """Minimum connections are opened ahead of the first request."""
+
+    assert pool.stats()["open"] == 0
+    pool.warm()
+    assert pool.stats()["open"] == 1
+    assert pool.acquire() is not None
+    assert pool.stats()["open"] == 1
+
+
+def test_async_run_commits_or_rolls_back(pool):
+    """``run`` executes on a worker thread in one transaction."""
+
+    def insert(connection, session_id):
+        connection.execute(
+            "insert into measurement_sessions (session_id) values (?)", (session_id,)
+        )
+
+    def insert_then_fail(connection):
+        insert(connection, "rolled-back")
+        raise RuntimeError("boom")
+
+    async def scenario():
+        await pool.run(lambda connection: insert(connection, "committed"))
+        with pytest.raises(RuntimeError):
+            await pool.run(insert_then_fail)
+        return await pool.run(
+            lambda connection: connection.execute(
+                "select session_id from measurement_sessions"
+            ).fetchall()
+        )
+
+    assert asyncio.run(scenario()) == [("committed",)]
+    assert pool.stats()["in_use"] == 0
+
+
+def test_health_check_reports_failures(pool):
+    """A failing probe is cached as unavailable with the error."""
+
+    health = DatabaseHealth(pool)
+    assert health.check() == "connected"
+
+    def refuse():
+        raise sqlite3.OperationalError("unable to open database file")
+
+    pool.close()
+    pool._connect = refuse
+
+    assert health.check() == "unavailable"
+    assert "unable to open" in health.snapshot()["error"]
+
+
+def test_health_endpoint_serves_the_cached_probe(pool, monkeypatch):
+    """/health reads the last check and never touches the pool itself."""
+
+    health = DatabaseHealth(pool)
+    monkeypatch.setattr(main_module, "database_health", health)
+    assert client.get("/health").json()["database"] == "unknown"
+
+    asyncio.run(asyncio.wait_for(_one_watch_round(health), timeout=5))
+    acquisitions = pool.stats()["acquisitions"]
+    responses = [client.get("/health").json() for _ in range(5)]
+
+    assert pool.stats()["acquisitions"] == acquisitions
+    assert {response["database"] for response in responses} == {"connected"}
+    assert responses[0]["status"] == "healthy"
+    assert responses[0]["database_check"]["latency_ms"] is not None
+
+
+async def _one_watch_round(health):
+    watcher = asyncio.create_task(health.watch(60))
+    while health.checked_at is None:
+        await asyncio.sleep(0.01)
+    watcher.cancel()
+
+
+def test_health_without_database_is_not_configured(monkeypatch):
+    """Deployments without DATABASE_URL report that instead of a fake status."""
+
+    monkeypatch.setattr(main_module, "database_health", DatabaseHealth(None))
+
+    body = client.get("/health").json()
+
+    assert body["database"] == "not_configured"
+    assert body["status"] == "healthy"
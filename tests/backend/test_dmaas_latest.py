@@ -0,0 +1,103 @@
+"""Tests for the in-memory /dmaas/latest endpoint and its ETags."""
+
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core import latest_results as latest_module  # noqa: E402
+from backend.app.core.latest_results import LatestResults  # noqa: E402
+from backend.app.main import app  # noqa: E402
+
+
+client = TestClient(app)
+API_HEADERS = {"X-API-Key": "staging-secret-key"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_results(monkeypatch):
+    """Give each test an empty store so results from other tests do not leak in."""
+
+    store = LatestResults(maxsize=3)
+    monkeypatch.setattr(latest_module.latest_results, "_entries", store._entries)
+    monkeypatch.setattr(latest_module.latest_results, "maxsize", 3)
+    return latest_module.latest_results
+
+
+def _validate(session_id, waist=32):
+    response = client.post(
+        "/measurements/validate",
+        json={"waist_natural": waist, "unit": "in", "session_id": session_id},
+        headers=API_HEADERS,
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_latest_serves_the_most_recent_validation():
+    """The newest result overall and per session is returned with an ETag."""
+
+    first = _validate("latest-a")
+    second = _validate("latest-b", waist=34)
+
+    newest = client.get("/dmaas/latest", headers=API_HEADERS)
+    by_session = client.get("/dmaas/latest?session_id=latest-a", headers=API_HEADERS)
+
+    assert newest.json() == second
+    assert by_session.json() == first
+    assert newest.headers["ETag"] != by_session.headers["ETag"]
+    assert newest.headers["Cache-Control"] == "no-cache"
+
+
+def test_if_none_match_returns_304_until_the_result_changes():
+    """Polling with the last ETag is a 304 until a new validation lands."""
+
+    _validate("latest-a")
+    etag = client.get("/dmaas/latest", headers=API_HEADERS).headers["ETag"]
+
+    unchanged = client.get(
+        "/dmaas/latest", headers={**API_HEADERS, "If-None-Match": f'W/{etag}, "other"'}
+    )
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["ETag"] == etag
+
+    _validate("latest-a", waist=33)
+    changed = client.get("/dmaas/latest", headers={**API_HEADERS, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_oldest_sessions_are_evicted_past_the_limit(fresh_results):
+    """Only the most recently written sessions are kept."""
+
+    for name in ("a", "b", "c", "d"):
+        _validate(f"evict-{name}")
+
+    evicted = client.get("/dmaas/latest?session_id=evict-a", headers=API_HEADERS)
+    kept = client.get("/dmaas/latest?session_id=evict-b", headers=API_HEADERS)
+
+    assert evicted.status_code == 404
+    assert evicted.json()["detail"]["code"] == "no_results"
+    assert kept.status_code == 200
+    assert len(fresh_results) == 3
+
+
+def test_latest_without_results_is_404():
+    """An empty store reports that nothing has been validated."""
+
+    response = client.get("/dmaas/latest", headers=API_HEADERS)
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["type"] == "not_found"
+
+
+def test_latest_requires_api_key():
+    """The endpoint is protected like the measurement routes."""
+
+    assert client.get("/dmaas/latest").status_code == 401
@@ -0,0 +1,242 @@
+"""Tests for the nearest-neighbor fit history index and neighbors recommend mode."""
+
+import json
+from pathlib import Path
+import sys
+import threading
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.landmarks import MEASUREMENT_KEYS  # noqa: E402
+from backend.app.main import app  # noqa: E402
+from backend.app.services.fit_index import (  # noqa: E402
+    DIMENSIONS,
+    FitHistory,
+    FitIndex,
+    KDTree,
+    fit_history,
+    load_fit_history,
+    profile_vector,
+)
+
+
+client = TestClient(app)
+API_HEADERS = {"X-API-Key": "staging-secret-key"}
+
+
+def _brute_force(points, point, k):
+    distances = np.sqrt(((points - point) ** 2).sum(axis=1))
+    return np.sort(distances)[:k]
+
+
+@pytest.mark.parametrize("leaf_size", [1, 8, 128])
+def test_kd_tree_matches_brute_force(leaf_size):
+    """Tree queries return exactly the brute-force nearest distances."""
+
+    rng = np.random.default_rng(11)
+    points = rng.normal(90, 15, size=(3000, DIMENSIONS))
+    tree = KDTree(points, leaf_size)
+
+    for point in rng.normal(90, 15, size=(20, DIMENSIONS)):
+        distances, rows = tree.query(point, 7)
+        assert np.sqrt(distances) == pytest.approx(_brute_force(points, point, 7))
+        assert np.allclose(((tree.points[rows] - point) ** 2).sum(axis=1), distances)
+
+
+def test_kd_tree_handles_empty_and_small_inputs():
+    """An empty tree yields no neighbors and k is capped at the point count."""
+
+    assert len(KDTree(np.empty((0, DIMENSIONS))).query(np.zeros(DIMENSIONS), 3)[0]) == 0
+    distances, _ = KDTree(np.ones((2, DIMENSIONS))).query(np.zeros(DIMENSIONS), 5)
+    assert len(distances) == 2
+
+
+def test_inserts_are_visible_before_and_after_compaction():
+    """Buffered profiles are searched immediately and survive the rebuild."""
+
+    rng = np.random.default_rng(5)
+    points = rng.normal(90, 15, size=(250, DIMENSIONS))
+    index = FitIndex(leaf_size=16, compact_threshold=100)
+
+    for row, point in enumerate(points):
+        index.insert(point, f"label-{row}")
+
+    assert index.stats() == {"indexed": 200, "buffered": 50, "compactions": 2}
+    for row in (3, 120, 240):
+        assert index.nearest(points[row], 1) == [(0.0, f"label-{row}")]
+
+    query = rng.normal(90, 15, size=DIMENSIONS)
+    index.compact()
+    assert index.stats()["buffered"] == 0
+    center, scale = index.center, index.scale
+    expected = _brute_force((points - center) / scale, (query - center) / scale, 5)
+    assert [d for d, _ in index.nearest(query, 5)] == pytest.approx(expected)
+
+
+def test_missing_measurements_are_imputed_from_history():
+    """NaN dimensions take the history mean instead of skewing distances."""
+
+    index = FitIndex(compact_threshold=2)
+    index.insert(np.full(DIMENSIONS, 80.0), "S")
+    index.insert(np.full(DIMENSIONS, 120.0), "L")
+    probe = np.full(DIMENSIONS, np.nan)
+    probe[0] = 82.0
+
+    assert index.nearest(probe, 1)[0][1] == "S"
+
+
+def test_missing_values_stay_missing_until_compaction():
+    """A gap buffered before any compaction takes the mean of the values present."""
+
+    index = FitIndex(compact_threshold=1000)
+    gap = np.full(DIMENSIONS, 100.0)
+    gap[0] = np.nan
+    index.insert(gap, "gap")
+    index.insert(np.full(DIMENSIONS, 90.0), "a")
+    index.insert(np.full(DIMENSIONS, 110.0), "b")
+    index.compact()
+
+    assert index.center[0] == pytest.approx(100.0)
+    probe = np.full(DIMENSIONS, 100.0)
+    assert index.nearest(probe, 1) == [(0.0, "gap")]
+
+
+def test_concurrent_inserts_and_compactions_keep_every_record():
+    """Compactions triggered from several threads never drop or duplicate profiles."""
+
+    index = FitIndex(leaf_size=8, compact_threshold=16)
+    rng = np.random.default_rng(3)
+    points = rng.normal(90, 15, size=(8, 200, DIMENSIONS))
+
+    def worker(thread):
+        for row, point in enumerate(points[thread]):
+            index.insert(point, f"{thread}-{row}")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    index.compact()
+
+    assert index.stats()["indexed"] == 1600 and index.stats()["buffered"] == 0
+    assert sorted(index._tree_labels) == sorted(f"{t}-{r}" for t in range(8) for r in range(200))
+    for thread, row in ((0, 0), (5, 123), (7, 199)):
+        assert index.nearest(points[thread][row], 1) == [(0.0, f"{thread}-{row}")]
+
+
+def test_neighbors_are_matched_on_build_not_just_height():
+    """Same height with a very different build loses to a close build at another height."""
+
+    rng = np.random.default_rng(9)
+    base = np.full(DIMENSIONS, 60.0)
+    height = MEASUREMENT_KEYS.index("height_cm")
+    population = rng.normal(base, 1.5, size=(500, DIMENSIONS))
+    population[:, height] = rng.normal(170.0, 12.0, size=500)
+    shopper = base.copy()
+    shopper[height] = 170.0
+    # 3 cm on every girth and length is two standard deviations of build;
+    # 20 cm of height is under two standard deviations of height.
+    broad, tall = shopper + 3.0, shopper.copy()
+    broad[height] = 170.0
+    tall[height] = 190.0
+
+    index = FitIndex(compact_threshold=10_000)
+    for point in population:
+        index.insert(point, "other")
+    index.insert(broad, "broad")
+    index.insert(tall, "tall")
+    index.compact()
+
+    assert index.nearest(shopper, 1)[0][1] == "tall"
+    assert index.scale[height] > 5 * index.scale[MEASUREMENT_KEYS.index("neck_cm")]
+
+
+def test_vote_is_weighted_toward_closer_neighbors():
+    """A single very close neighbor outweighs two distant ones."""
+
+    index = FitIndex()
+    index.insert(np.full(DIMENSIONS, 100.0), "M")
+    index.insert(np.full(DIMENSIONS, 110.0), "L")
+    index.insert(np.full(DIMENSIONS, 111.0), "L")
+
+    vote = index.vote(np.full(DIMENSIONS, 100.0), 3)
+
+    assert vote["size"] == "M"
+    assert vote["neighbors"] == 3
+    assert 0.5 < vote["confidence"] < 1.0
+
+
+def test_load_fit_history_reads_json_lines(tmp_path):
+    """Each line is one shopper keyed like ``MeasurementNormalized``."""
+
+    path = tmp_path / "history.jsonl"
+    path.write_text(
+        "\n".join(
+            json.dumps({"category": "tops", "size": size, "chest_cm": chest})
+            for size, chest in (("S", 88), ("M", 100), ("L", 112))
+        )
+        + "\n"
+    )
+
+    history = load_fit_history(path, FitHistory())
+
+    assert history.stats()["tops"]["indexed"] == 3
+    assert history.vote({"chest_cm": 99.0}, 1)["tops"]["size"] == "M"
+
+
+def test_profile_vector_uses_measurement_key_order():
+    """Vectors follow ``MEASUREMENT_KEYS`` with NaN for absent values."""
+
+    vector = profile_vector({"chest_cm": 100.0})
+
+    assert vector.shape == (len(MEASUREMENT_KEYS),)
+    assert vector[MEASUREMENT_KEYS.index("chest_cm")] == 100.0
+    assert np.isnan(vector).sum() == len(MEASUREMENT_KEYS) - 1
+
+
+def test_recorded_history_drives_neighbors_mode():
+    """Profiles posted to /fit-history answer ``mode=neighbors`` right away."""
+
+    category = "test-neighbors"
+    for chest, size in ((90.0, "S"), (91.0, "S"), (110.0, "L"), (111.0, "L")):
+        response = client.post(
+            "/measurements/fit-history",
+            json={"measurements": {"chest_cm": chest}, "category": category, "size": size},
+            headers=API_HEADERS,
+        )
+        assert response.status_code == 201
+    assert response.json()["buffered"] + response.json()["indexed"] == 4
+
+    response = client.post(
+        "/measurements/recommend?mode=neighbors",
+        json={"chest_cm": 108.0},
+        headers=API_HEADERS,
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["mode"] == "neighbors"
+    rec = next(r for r in body["recommendations"] if r["category"] == category)
+    assert rec["size"] == "L"
+    assert "nearest shoppers" in rec["rationale"]
+    assert "matches" not in body
+    assert category in client.get("/metrics").json()["fit_index"]
+    assert category in fit_history.categories()
+
+
+def test_catalog_mode_remains_the_default():
+    """Without ``mode`` the catalog matcher answers as before."""
+
+    response = client.post(
+        "/measurements/recommend", json={"chest_cm": 100.0}, headers=API_HEADERS
+    )
+
+    assert response.json()["mode"] == "catalog"
+    assert "matches" in response.json()
@@ -0,0 +1,165 @@
+"""Tests for the compiled declarative fit-note rules."""
+
+import json
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.landmarks import MEASUREMENT_KEYS  # noqa: E402
+from backend.app.main import app  # noqa: E402
+from backend.app.services.fit_notes import FitNoteRules, load_fit_notes  # noqa: E402
+from backend.app.services.fit_rules_bottoms import recommend_bottom  # noqa: E402
+from backend.app.services.reference_data import reference_data  # noqa: E402
+
+
+client = TestClient(app)
+API_HEADERS = {"X-API-Key": "staging-secret-key"}
+
+BOTTOMS = {
+    "waist_natural_cm": 81.28,
+    "hip_low_cm": 100.0,
+    "thigh_cm": 55.0,
+    "knee_cm": 38.0,
+    "inseam_cm": 76.2,
+}
+
+
+def _rules(*rules):
+    return FitNoteRules.from_document({"version": "t", "rules": list(rules)})
+
+
+@pytest.mark.parametrize(
+    "thigh_cm, knee_cm, expected",
+    [
+        (55.0, 38.0, []),
+        (60.0, 41.0, ["roomy thigh"]),
+        (55.0, 36.0, ["strong knee taper"]),
+        (60.0, 39.0, ["roomy thigh", "strong knee taper"]),
+    ],
+)
+def test_default_bottoms_rules_match_the_legacy_notes(thigh_cm, knee_cm, expected):
+    """The shipped rules reproduce the hand-written thigh and knee notes."""
+
+    result = recommend_bottom({**BOTTOMS, "thigh_cm": thigh_cm, "knee_cm": knee_cm})
+
+    assert result["fit_notes"] == expected
+    assert result["rationale"] == (", ".join(expected) or "standard ease")
+
+
+def test_default_bottoms_rules_add_no_notes_beyond_the_legacy_ones():
+    """A long front rise adds no note; the compiled rules change no output."""
+
+    result = recommend_bottom({**BOTTOMS, "front_rise_cm": 30.0})
+
+    assert result["fit_notes"] == []
+    assert result["rationale"] == "standard ease"
+
+
+@pytest.mark.parametrize(
+    "op, value, fires",
+    [("<", 80, False), ("<=", 80, True), (">", 80, False), (">=", 80, True), (">", 79, True)],
+)
+def test_operators_on_plain_and_derived_measures(op, value, fires):
+    """Values, ratios and differences compare with every supported operator."""
+
+    for measure, profile in (
+        ("waist_natural", {"waist_natural_cm": 80.0}),
+        ("chest / hip_low", {"chest_cm": 80.0, "hip_low_cm": 1.0}),
+        ("chest - hip_low", {"chest_cm": 100.0, "hip_low_cm": 20.0}),
+    ):
+        rules = _rules(
+            {"category": "tops", "note": "n", "measure": measure, "op": op, "value": value}
+        )
+        assert rules.notes(profile, "tops") == (["n"] if fires else [])
+        assert rules.notes_many([profile])[0]["tops"] == (["n"] if fires else [])
+
+
+def test_missing_inputs_and_zero_denominators_do_not_fire():
+    """Rules whose inputs are absent or divide by zero stay silent."""
+
+    rules = _rules(
+        {"category": "tops", "note": "n", "measure": "chest / underbust", "op": ">", "value": 0}
+    )
+
+    for profile in (
+        {"chest_cm": 100.0},
+        {"chest_cm": 100.0, "underbust_cm": None},
+        {"chest_cm": 100.0, "underbust_cm": 0.0},
+    ):
+        assert rules.notes(profile, "tops") == []
+        assert rules.notes_many([profile])[0]["tops"] == []
+
+
+@pytest.mark.parametrize(
+    "rule, message",
+    [
+        ({"category": "t", "note": "n", "measure": "chest", "op": "!=", "value": 1}, "op"),
+        ({"category": "t", "note": "n", "measure": "chest", "value": 1}, "'op'"),
+        ({"category": "t", "note": "n", "measure": "a / b / c", "op": ">", "value": 1}, "two"),
+        ({"category": "t", "note": "n", "measure": "waist", "op": ">", "value": 1}, "'waist'"),
+    ],
+)
+def test_malformed_rules_are_rejected(rule, message):
+    """Rule validation errors name the offending problem."""
+
+    with pytest.raises(ValueError, match=message):
+        _rules(rule)
+
+
+def test_batch_evaluation_matches_single_profiles_for_large_rule_sets():
+    """Hundreds of random rules give the same notes in batch and one at a time."""
+
+    rng = np.random.default_rng(4)
+    keys = [key[:-3] for key in MEASUREMENT_KEYS]
+    rules = _rules(
+        *(
+            {
+                "category": ["tops", "bottoms", "dresses"][i % 3],
+                "note": f"note-{i}",
+                "measure": f"{rng.choice(keys)} {['/', '-'][i % 2]} {rng.choice(keys)}",
+                "op": ["<", "<=", ">", ">="][i % 4],
+                "value": float(rng.normal(0.5 if i % 2 == 0 else 0, 10 if i % 2 else 0.3)),
+            }
+            for i in range(300)
+        )
+    )
+    profiles = [
+        {key: float(v) for key, v in zip(MEASUREMENT_KEYS, rng.uniform(20, 180, 18)) if v < 170}
+        for _ in range(200)
+    ]
+
+    batched = rules.notes_many(profiles)
+
+    assert len(rules) == 300
+    for profile, notes in zip(profiles, batched):
+        assert notes == {category: rules.notes(profile, category) for category in notes}
+
+
+def test_default_rules_cover_all_garment_categories(tmp_path):
+    """The shipped rule file compiles for tops, bottoms, dresses and outerwear."""
+
+    assert set(reference_data.current.fit_notes.categories) == {"tops", "bottoms", "dresses", "outerwear"}
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"version": "9", "rules": []}))
+    assert load_fit_notes(path).version == "9"
+
+
+def test_catalog_recommendations_carry_fit_notes():
+    """Each catalog recommendation lists the notes for its category."""
+
+    response = client.post(
+        "/measurements/recommend",
+        json={**BOTTOMS, "thigh_cm": 60.0, "knee_cm": 39.0, "chest_cm": 100.0},
+        headers=API_HEADERS,
+    )
+
+    recs = {rec["category"]: rec for rec in response.json()["recommendations"]}
+    assert recs["bottoms"]["fit_notes"] == ["roomy thigh", "strong knee taper"]
+    assert "fit_notes" in recs["tops"]
@@ -0,0 +1,132 @@
+"""Tests for Idempotency-Key replay and single-flight deduplication."""
+
+import asyncio
+from pathlib import Path
+import sys
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.idempotency import (  # noqa: E402
+    IdempotencyConflict,
+    IdempotencyStore,
+)
+from backend.app.main import app  # noqa: E402
+
+
+client = TestClient(app)
+API_HEADERS = {"X-API-Key": "staging-secret-key"}
+
+
+def _headers():
+    return {**API_HEADERS, "Idempotency-Key": str(uuid.uuid4())}
+
+
+def test_validate_replays_stored_response():
+    """A retried key returns the first response and flags the replay."""
+
+    headers = _headers()
+    payload = {"waist_natural": 32, "unit": "in", "session_id": "idem-validate"}
+
+    first = client.post("/measurements/validate", json=payload, headers=headers)
+    second = client.post("/measurements/validate", json=payload, headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.json() == first.json()
+
+
+def test_recommend_replays_stored_response():
+    """The recommend route honours Idempotency-Key the same way."""
+
+    headers = _headers()
+    payload = {"waist_natural_cm": 81.28, "chest_cm": 101.6}
+
+    first = client.post("/measurements/recommend", json=payload, headers=headers)
+    second = client.post("/measurements/recommend", json=payload, headers=headers)
+
+    assert first.status_code == second.status_code == 200
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.json() == first.json()
+
+
+def test_key_reused_with_different_payload_is_rejected():
+    """Reusing a key for another body is a 422, not a silent replay."""
+
+    headers = _headers()
+    client.post("/measurements/validate", json={"waist_natural": 32}, headers=headers)
+
+    response = client.post(
+        "/measurements/validate", json={"waist_natural": 34}, headers=headers
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["code"] == "idempotency_key_reused"
+
+
+def test_requests_without_key_are_not_stored():
+    """Omitting the header keeps the route stateless."""
+
+    payload = {"waist_natural": 32, "unit": "in"}
+    response = client.post("/measurements/validate", json=payload, headers=API_HEADERS)
+
+    assert response.status_code == 200
+    assert "Idempotent-Replayed" not in response.headers
+
+
+def test_store_coalesces_concurrent_requests():
+    """Concurrent callers sharing a key await a single computation."""
+
+    store = IdempotencyStore(maxsize=8, ttl_seconds=60)
+    calls = 0
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"value": 42}
+
+        tasks = [
+            asyncio.create_task(store.run("key", "fp", compute)) for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        assert store.stats()["in_flight"] == 1
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    outcomes = asyncio.run(scenario())
+
+    assert calls == 1
+    assert [value for value, _ in outcomes] == [{"value": 42}] * 5
+    assert sum(replayed for _, replayed in outcomes) == 4
+    assert store.stats()["coalesced"] == 4
+
+
+def test_store_does_not_keep_failures():
+    """A failed computation is retried on the next request."""
+
+    store = IdempotencyStore(maxsize=8, ttl_seconds=60)
+    attempts = []
+
+    async def compute():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+        return "ok"
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(store.run("key", "fp", compute))
+    value, replayed = asyncio.run(store.run("key", "fp", compute))
+
+    assert (value, replayed) == ("ok", False)
+    with pytest.raises(IdempotencyConflict):
+        asyncio.run(store.run("key", "other", compute))
@@ -0,0 +1,218 @@
+"""Tests for the array-backed landmark engine."""
+
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.landmarks import (  # noqa: E402
+    MEASUREMENT_KEYS,
+    compute_measurements,
+    denormalize,
+    pack_landmarks,
+)
+from backend.app.core.validation import (  # noqa: E402
+    calculate_measurements_from_landmarks,
+)
+from backend.app.main import app  # noqa: E402
+from backend.app.schemas.measure_schema import MediaPipeLandmarks  # noqa: E402
+
+
+client = TestClient(app)
+HEADERS = {"X-API-Key": "staging-secret-key"}
+
+
+# Standing pose: nose, shoulders, left elbow/wrist, hips, left knee, ankles.
+POSE = {
+    0: (0.5, 0.08, -0.1),
+    11: (0.4, 0.22, -0.05),
+    12: (0.6, 0.22, 0.05),
+    13: (0.36, 0.38, -0.04),
+    15: (0.34, 0.52, -0.02),
+    23: (0.45, 0.52, -0.04),
+    24: (0.55, 0.52, 0.04),
+    25: (0.45, 0.72, -0.02),
+    27: (0.45, 0.92, 0.0),
+    28: (0.55, 0.92, 0.0),
+}
+
+# Reference values produced by the original per-point dict implementation.
+EXPECTED = {
+    "height_cm": 170.0,
+    "neck_cm": 10.182095254686542,
+    "shoulder_cm": 25.455238136716353,
+    "chest_cm": 62.97636643647838,
+    "underbust_cm": 44.5956940028888,
+    "waist_natural_cm": 30.909305148550683,
+    "sleeve_cm": 61.1926606152212,
+    "bicep_cm": 29.447431005120627,
+    "forearm_cm": 24.238347051773665,
+    "hip_low_cm": 37.20538644227118,
+    "thigh_cm": 52.70222685261627,
+    "knee_cm": 36.89155879683139,
+    "calf_cm": 36.486157051811304,
+    "ankle_cm": 23.71600208367735,
+    "front_rise_cm": 30.357142857142854,
+    "back_rise_cm": 36.42857142857142,
+    "inseam_cm": 81.08034900402508,
+    "outseam_cm": 111.3095238095238,
+}
+
+
+def _view(width=1080, height=1920, flatten_z=False):
+    points = []
+    for index in range(33):
+        x, y, z = POSE.get(index, (0.5, 0.5, 0.0))
+        points.append(
+            {"x": x, "y": y, "z": 0.0 if flatten_z else z, "visibility": 0.95}
+        )
+    return MediaPipeLandmarks(
+        landmarks=points,
+        timestamp="2025-10-26T15:00:00Z",
+        image_width=width,
+        image_height=height,
+    )
+
+
+def test_measurements_match_reference_formulas():
+    """The vectorized engine reproduces the original per-point formulas."""
+
+    result = calculate_measurements_from_landmarks(_view(), _view())
+
+    assert list(result) == list(MEASUREMENT_KEYS)
+    for key, value in EXPECTED.items():
+        assert result[key] == pytest.approx(value, rel=1e-12)
+
+
+def test_flat_side_view_uses_width_fallbacks():
+    """Zero side-view depth falls back to width-derived chest/waist/hip depth."""
+
+    result = calculate_measurements_from_landmarks(_view(), _view(flatten_z=True))
+
+    shoulder = result["shoulder_cm"]
+    assert result["chest_cm"] == pytest.approx(np.pi * (shoulder * 1.05 * 1.5) / 2)
+    assert result["hip_low_cm"] < EXPECTED["hip_low_cm"]
+
+
+def test_batched_engine_matches_single_views():
+    """Leading batch dimensions evaluate each view independently."""
+
+    front = _view().points()
+    side = _view(flatten_z=True).points()
+    widths = np.array([1080.0, 720.0, 1920.0])
+    heights = np.array([1920.0, 1280.0, 1080.0])
+
+    batch = compute_measurements(
+        denormalize(np.stack([front] * 3), widths, heights),
+        denormalize(np.stack([side] * 3), widths, heights),
+    )
+
+    assert batch.shape == (3, len(MEASUREMENT_KEYS))
+    for row, (width, height) in enumerate(zip(widths, heights)):
+        single = compute_measurements(
+            denormalize(front, width, height), denormalize(side, width, height)
+        )
+        np.testing.assert_allclose(batch[row], single)
+
+
+def test_packed_landmarks_match_json_landmarks():
+    """Base64 float32 landmarks decode to the same measurements as JSON."""
+
+    json_view = _view()
+    packed_view = MediaPipeLandmarks(
+        landmarks_f32=pack_landmarks(json_view.points()),
+        timestamp=json_view.timestamp,
+        image_width=json_view.image_width,
+        image_height=json_view.image_height,
+    )
+
+    assert packed_view.points().shape == (33, 4)
+    packed = calculate_measurements_from_landmarks(packed_view, packed_view)
+    for key, value in EXPECTED.items():
+        assert packed[key] == pytest.approx(value, rel=1e-5)
+
+
+def test_validate_endpoint_accepts_packed_landmarks():
+    """The validate route accepts landmarks_f32 for either view."""
+
+    packed = pack_landmarks(_view().points())
+    view = {
+        "landmarks_f32": packed,
+        "timestamp": "2025-10-26T15:00:00Z",
+        "image_width": 1080,
+        "image_height": 1920,
+    }
+    payload = {"front_landmarks": view, "side_landmarks": view, "session_id": "f32"}
+
+    response = client.post("/measurements/validate", json=payload, headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["height_cm"] == pytest.approx(EXPECTED["height_cm"])
+
+
+@pytest.mark.parametrize(
+    "view",
+    [
+        {"landmarks_f32": "not base64!"},
+        {"landmarks_f32": "AAAA"},  # one float, not a whole point
+        {"landmarks_f32": "", "landmarks": []},
+    ],
+)
+def test_invalid_packed_landmarks_rejected(view):
+    """Malformed packed payloads fail schema validation with a 422."""
+
+    view.update(
+        {"timestamp": "2025-10-26T15:00:00Z", "image_width": 10, "image_height": 10}
+    )
+    payload = {"front_landmarks": view, "side_landmarks": view}
+
+    response = client.post("/measurements/validate", json=payload, headers=HEADERS)
+
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("count", [0, 20, 34])
+def test_wrong_landmark_count_is_early_422(count):
+    """Views without exactly 33 points are rejected by the schema."""
+
+    view = _view().model_dump()
+    view["landmarks"] = view["landmarks"][:1] * count
+    payload = {"front_landmarks": view, "side_landmarks": _view().model_dump()}
+
+    response = client.post("/measurements/validate", json=payload, headers=HEADERS)
+
+    assert response.status_code == 422
+    assert "33 landmarks" in response.text
+
+
+def test_landmark_array_rejects_non_finite_values():
+    """NaN or infinite coordinates never reach the measurement math."""
+
+    points = _view().points().copy()
+    points[11, 0] = np.nan
+
+    with pytest.raises(ValueError, match="finite"):
+        MediaPipeLandmarks(
+            landmarks=points, timestamp="t", image_width=10, image_height=10
+        )
+
+
+def test_landmark_array_round_trips_to_json_points():
+    """Serialization renders the array back as landmark dicts."""
+
+    dumped = _view().model_dump()
+
+    assert len(dumped["landmarks"]) == 33
+    assert dumped["landmarks"][0] == {
+        "x": 0.5,
+        "y": 0.08,
+        "z": -0.1,
+        "visibility": 0.95,
+    }
+    assert "landmarks_f32" not in dumped
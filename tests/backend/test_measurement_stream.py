@@ -0,0 +1,130 @@
+"""Tests for the streaming measurement WebSocket."""
+
+from pathlib import Path
+import sys
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.landmarks import MEASUREMENT_KEYS  # noqa: E402
+from backend.app.core.streaming import MeasurementStream, RunningStats  # noqa: E402
+from backend.app.main import app  # noqa: E402
+from tests.backend.conftest import landmark_frame, landmark_view  # noqa: E402
+
+
+client = TestClient(app)
+API_HEADERS = {"X-API-Key": "staging-secret-key"}
+
+
+def _frame(jitter=0.0):
+    return landmark_frame(spread=0.01 + jitter)
+
+
+def test_running_stats_match_numpy():
+    """Welford updates agree with a two-pass mean and variance."""
+
+    samples = np.random.default_rng(7).normal(50, 3, size=(200, 4))
+    stats = RunningStats(4)
+    for sample in samples:
+        stats.update(sample)
+
+    np.testing.assert_allclose(stats.mean, samples.mean(axis=0))
+    np.testing.assert_allclose(stats.variance, samples.var(axis=0, ddof=1))
+
+
+def test_measurements_near_zero_converge_under_the_absolute_floor():
+    """A steady value near 0 cm settles by the cm floor, not its relative error."""
+
+    def feed(stream):
+        for index in range(8):
+            wobble = 0.01 if index % 2 else -0.01
+            stream.add_frame({key: 50.0 for key in MEASUREMENT_KEYS} | {"ankle_cm": wobble}, 0.9)
+        return stream
+
+    floored = feed(MeasurementStream("s-1", min_frames=5, tolerance=0.01, floor_cm=0.05))
+    unfloored = feed(MeasurementStream("s-2", min_frames=5, tolerance=0.01, floor_cm=0.0))
+
+    assert floored.relative_error() > 0.01
+    assert floored.converged() and floored.estimate() is not None
+    assert not unfloored.converged()
+
+
+def test_stream_publishes_estimate_after_convergence():
+    """Progress messages precede a converged estimate matching /validate."""
+
+    validate = client.post(
+        "/measurements/validate", json=_frame(), headers=API_HEADERS
+    ).json()
+
+    with client.websocket_connect(
+        "/measurements/stream?session_id=live-1", headers=API_HEADERS
+    ) as websocket:
+        messages = []
+        for _ in range(5):
+            websocket.send_json(_frame())
+            messages.append(websocket.receive_json())
+
+    assert [m["type"] for m in messages] == ["progress"] * 4 + ["estimate"]
+    result = messages[-1]["result"]
+    assert messages[-1]["frames"] == 5
+    assert result["session_id"] == "live-1"
+    assert result["chest_cm"] == pytest.approx(validate["chest_cm"])
+    assert result["accuracy_estimate"] == validate["accuracy_estimate"]
+
+
+def test_noisy_stream_waits_for_tolerance():
+    """Frames that disagree widely keep the session in progress."""
+
+    with client.websocket_connect(
+        "/measurements/stream?api_key=staging-secret-key"
+    ) as websocket:
+        for index in range(6):
+            websocket.send_json(_frame(jitter=0.01 * (index % 2)))
+            message = websocket.receive_json()
+
+    assert message["type"] == "progress"
+    assert message["relative_error"] > 0.01
+
+
+def test_stream_reports_bad_frames_and_continues():
+    """A malformed frame yields an error message without closing the socket."""
+
+    with client.websocket_connect("/measurements/stream", headers=API_HEADERS) as websocket:
+        websocket.send_json({"front_landmarks": landmark_view()})
+        error = websocket.receive_json()
+        websocket.send_json(_frame())
+        progress = websocket.receive_json()
+
+    assert error["type"] == "error"
+    assert error["error"]["code"] == "invalid_payload"
+    assert progress == {"type": "progress", "frames": 1, "relative_error": None}
+
+
+def test_stream_reports_binary_frames_and_continues():
+    """A binary message yields an error message; the next text frame is processed."""
+
+    with client.websocket_connect("/measurements/stream", headers=API_HEADERS) as websocket:
+        websocket.send_bytes(b"abc")
+        error = websocket.receive_json()
+        websocket.send_json(_frame())
+        progress = websocket.receive_json()
+
+    assert error["type"] == "error"
+    assert error["error"]["code"] == "invalid_payload"
+    assert progress == {"type": "progress", "frames": 1, "relative_error": None}
+
+
+def test_stream_requires_api_key():
+    """Unauthenticated sockets are closed with a policy violation."""
+
+    with pytest.raises(WebSocketDisconnect) as excinfo:
+        with client.websocket_connect("/measurements/stream") as websocket:
+            websocket.receive_json()
+
+    assert excinfo.value.code == 1008
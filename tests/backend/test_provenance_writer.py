@@ -0,0 +1,245 @@
+"""Tests for the write-behind provenance writer against a SQLite stand-in."""
+
+from pathlib import Path
+import json
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core import provenance  # noqa: E402
+from backend.app.core.database import connection_pool  # noqa: E402
+from backend.app.core.provenance import (  # noqa: E402
+    ProvenanceWriter,
+    backfill_packed_landmarks,
+    decode_landmarks,
+)
+from backend.app.core.validation import normalize_and_validate  # noqa: E402
+from backend.app.main import app  # noqa: E402
+from backend.app.schemas.measure_schema import MeasurementInput  # noqa: E402
+from tests.backend.conftest import landmark_view  # noqa: E402
+
+
+client = TestClient(app)
+API_HEADERS = {"X-API-Key": "staging-secret-key"}
+
+
+def _payload(session_id):
+    return {
+        "front_landmarks": landmark_view(image_width=1920, image_height=1080),
+        "side_landmarks": landmark_view(
+            timestamp="2025-10-26T15:00:05Z", image_width=1920, image_height=1080
+        ),
+        "front_photo_url": "https://storage.fittwin.com/photos/test/front.jpg",
+        "session_id": session_id,
+    }
+
+
+def _record(session_id):
+    input_data = MeasurementInput(**_payload(session_id))
+    return input_data, normalize_and_validate(input_data)
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the writer"
+        time.sleep(0.01)
+
+
+def _count(path, table):
+    with sqlite3.connect(path) as connection:
+        return connection.execute(f"select count(*) from {table}").fetchone()[0]
+
+
+@pytest.fixture
+def database(tmp_path):
+    return tmp_path / "provenance.db"
+
+
+def _writer(database, **options):
+    return ProvenanceWriter(connection_pool(f"sqlite:///{database}", 2), **options)
+
+
+def test_full_batches_are_written_without_waiting_for_the_interval(database):
+    """Reaching the batch size flushes immediately, one transaction per batch."""
+
+    writer = _writer(database, batch_size=2, flush_interval_seconds=60)
+    for number in range(4):
+        assert writer.submit(*_record(f"size-{number}"))
+
+    _wait_for(lambda: writer.stats()["written"] == 4)
+
+    assert writer.stats()["batches"] == 2
+    assert _count(database, "measurement_sessions") == 4
+    assert _count(database, "mediapipe_landmarks") == 8
+    assert _count(database, "normalized_measurements") == 4
+    writer.close()
+
+
+def test_partial_batches_are_flushed_after_the_interval(database):
+    """A batch that never fills is written once the flush interval passes."""
+
+    writer = _writer(database, batch_size=100, flush_interval_seconds=0.05)
+    for number in range(3):
+        writer.submit(*_record(f"time-{number}"))
+
+    _wait_for(lambda: writer.stats()["written"] == 3)
+
+    assert writer.stats()["batches"] == 1
+    writer.close()
+
+
+def test_close_drains_queued_records(database):
+    """Records still queued at shutdown are written before close returns."""
+
+    writer = _writer(database, batch_size=100, flush_interval_seconds=60)
+    input_data, normalized = _record("drain-0")
+    writer.submit(input_data, normalized)
+    for number in range(1, 5):
+        writer.submit(*_record(f"drain-{number}"))
+
+    writer.close()
+
+    assert writer.stats()["written"] == 5
+    assert writer.stats()["queue_depth"] == 0
+    assert writer.submit(input_data, normalized) is False
+    with sqlite3.connect(database) as connection:
+        views = connection.execute(
+            "select id, view, image_width from mediapipe_landmarks where session_id = ?",
+            ("drain-0",),
+        ).fetchall()
+    assert sorted(views) == sorted(
+        [
+            (normalized.front_landmarks_id, "front", 1920),
+            (normalized.side_landmarks_id, "side", 1920),
+        ]
+    )
+
+
+def test_full_queue_drops_records_instead_of_blocking(database):
+    """Submitting never waits on a stalled database; overflow is counted."""
+
+    release = threading.Event()
+    sqlite_pool = connection_pool(f"sqlite:///{database}", 1)
+    connect = sqlite_pool._connect
+
+    def stalled_connect():
+        release.wait(5)
+        return connect()
+
+    sqlite_pool._connect = stalled_connect
+    writer = ProvenanceWriter(sqlite_pool, batch_size=1, flush_interval_seconds=60, max_queue=2)
+    records = [_record(f"full-{number}") for number in range(4)]
+
+    writer.submit(*records[0])
+    _wait_for(lambda: writer.stats()["queue_depth"] == 0)
+    started = time.perf_counter()
+    accepted = [writer.submit(*record) for record in records[1:]]
+    elapsed = time.perf_counter() - started
+    release.set()
+    writer.close()
+
+    assert accepted == [True, True, False]
+    assert elapsed < 0.5
+    assert writer.stats()["dropped"] == 1
+    assert writer.stats()["written"] == 3
+
+
+def test_validate_endpoint_queues_provenance(database, monkeypatch):
+    """/measurements/validate records the session it returns."""
+
+    writer = _writer(database, batch_size=100, flush_interval_seconds=60)
+    monkeypatch.setattr(provenance, "provenance_writer", writer)
+
+    response = client.post(
+        "/measurements/validate", json=_payload("endpoint-1"), headers=API_HEADERS
+    )
+    writer.close()
+
+    assert response.status_code == 200
+    data = response.json()
+    with sqlite3.connect(database) as connection:
+        session = connection.execute(
+            "select source_type, front_photo_url from measurement_sessions where session_id = ?",
+            ("endpoint-1",),
+        ).fetchone()
+        landmark_ids = {
+            row[0]
+            for row in connection.execute(
+                "select id from mediapipe_landmarks where session_id = ?", ("endpoint-1",)
+            )
+        }
+    assert session == ("mediapipe_web", _payload("endpoint-1")["front_photo_url"])
+    assert landmark_ids == {data["front_landmarks_id"], data["side_landmarks_id"]}
+    assert _count(database, "normalized_measurements") == 1
+
+
+def test_landmarks_are_stored_packed_and_decode_to_arrays(database):
+    """Each view is 528 bytes of float32 and decodes back to the input points."""
+
+    writer = _writer(database)
+    input_data, normalized = _record("packed-1")
+    writer.submit(input_data, normalized)
+    writer.close()
+
+    with sqlite3.connect(database) as connection:
+        rows = connection.execute(
+            "select landmarks_f32, landmarks from mediapipe_landmarks order by view"
+        ).fetchall()
+    points = decode_landmarks(rows)
+
+    assert [len(blob) for blob, document in rows] == [528, 528]
+    assert all(document is None for _, document in rows)
+    assert points.shape == (2, 33, 4)
+    np.testing.assert_allclose(points[0], input_data.front_landmarks.points(), rtol=1e-6)
+
+
+def test_backfill_converts_legacy_json_rows(database):
+    """JSON-only rows are re-encoded in batches; re-running is a no-op."""
+
+    pool = connection_pool(f"sqlite:///{database}", 1)
+    legacy = [
+        {"x": 0.01 * i, "y": 0.02 * i, "z": -0.01 * i, "visibility": 0.9} for i in range(33)
+    ]
+    connection = pool.acquire()
+    connection.execute("insert into measurement_sessions (session_id) values ('legacy')")
+    connection.executemany(
+        "insert into mediapipe_landmarks (id, session_id, view, landmarks) values (?, ?, ?, ?)",
+        [(f"row-{i}", "legacy", "front", json.dumps(legacy)) for i in range(5)],
+    )
+    connection.commit()
+    pool.release(connection)
+
+    assert backfill_packed_landmarks(pool, batch_size=2) == 5
+    assert backfill_packed_landmarks(pool, batch_size=2) == 0
+
+    connection = pool.acquire()
+    rows = connection.execute("select landmarks_f32, landmarks from mediapipe_landmarks").fetchall()
+    pool.release(connection)
+    pool.close()
+    expected = [[p["x"], p["y"], p["z"], p["visibility"]] for p in legacy]
+    assert all(document is None for _, document in rows)
+    np.testing.assert_allclose(decode_landmarks(rows), [expected] * 5, rtol=1e-6)
+
+
+def test_decoder_rejects_rows_without_landmarks():
+    """A row with neither encoding is reported rather than decoded as zeros."""
+
+    with pytest.raises(ValueError, match="neither"):
+        decode_landmarks([(None, None)])
+
+
+def test_unsupported_database_url_is_rejected():
+    """Only SQLite and Postgres URLs are accepted."""
+
+    with pytest.raises(ValueError, match="mysql"):
+        connection_pool("mysql://localhost/fittwin", 1)
@@ -0,0 +1,145 @@
+"""Tests for the quantized-measurement recommendation cache."""
+
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.main import app  # noqa: E402
+from backend.app.services.recommendation_cache import (  # noqa: E402
+    RecommendationCache,
+    recommendation_cache,
+)
+
+
+client = TestClient(app)
+API_HEADERS = {"X-API-Key": "staging-secret-key"}
+
+
+def _counting(calls):
+    def compute(bucket):
+        calls.append(bucket)
+        return ("result", len(calls))
+
+    return compute
+
+
+def test_profiles_in_one_bucket_share_an_entry():
+    """Values within half a step of a grid point compute once."""
+
+    cache = RecommendationCache(maxsize=10, step_cm=0.5)
+    calls = []
+
+    first = cache.get_or_compute({"chest_cm": 100.1}, "v1", 5, _counting(calls))
+    second = cache.get_or_compute({"chest_cm": 99.9}, "v1", 5, _counting(calls))
+
+    assert first == second
+    assert calls == [{"chest_cm": 100.0}]
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize(
+    "profile, variant",
+    [
+        ({"chest_cm": 100.5}, 5),
+        ({"chest_cm": 100.0, "waist_natural_cm": 80.0}, 5),
+        ({"chest_cm": 100.0}, 10),
+    ],
+)
+def test_other_buckets_and_variants_miss(profile, variant):
+    """Neighbouring grid points, extra dimensions and variants are distinct keys."""
+
+    cache = RecommendationCache(maxsize=10, step_cm=0.5)
+    calls = []
+    cache.get_or_compute({"chest_cm": 100.0}, "v1", 5, _counting(calls))
+
+    cache.get_or_compute(profile, "v1", variant, _counting(calls))
+
+    assert len(calls) == 2
+
+
+def test_version_change_clears_the_cache():
+    """A new data version drops every entry and counts an invalidation."""
+
+    cache = RecommendationCache(maxsize=10)
+    calls = []
+    cache.get_or_compute({"chest_cm": 100.0}, "v1", 5, _counting(calls))
+    cache.get_or_compute({"chest_cm": 90.0}, "v1", 5, _counting(calls))
+
+    cache.get_or_compute({"chest_cm": 100.0}, "v2", 5, _counting(calls))
+
+    assert len(calls) == 3
+    assert len(cache) == 1
+    assert cache.stats()["invalidations"] == 1
+    assert cache.stats()["version"] == "v2"
+
+
+def test_requests_on_the_previous_version_do_not_clear_the_cache():
+    """Old and new versions interleaving during a reload each keep their entries."""
+
+    cache = RecommendationCache(maxsize=10)
+    calls = []
+    cache.get_or_compute({"chest_cm": 100.0}, "v1", 5, _counting(calls))
+    cache.get_or_compute({"chest_cm": 100.0}, "v2", 5, _counting(calls))
+
+    for version in ("v1", "v2", "v1", "v2"):
+        cache.get_or_compute({"chest_cm": 100.0}, version, 5, _counting(calls))
+
+    assert len(calls) == 3
+    assert len(cache) == 2
+    assert cache.stats()["invalidations"] == 1
+    assert cache.stats()["version"] == "v2"
+
+
+def test_lru_bounds_memory():
+    """Buckets beyond ``maxsize`` evict the least recently used."""
+
+    cache = RecommendationCache(maxsize=2)
+    calls = []
+    for chest in (90.0, 100.0, 90.0, 110.0):
+        cache.get_or_compute({"chest_cm": chest}, "v1", 5, _counting(calls))
+
+    cache.get_or_compute({"chest_cm": 90.0}, "v1", 5, _counting(calls))
+
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+    assert len(calls) == 3
+
+
+def test_zero_step_keys_on_exact_values():
+    """A non-positive step disables quantization."""
+
+    cache = RecommendationCache(maxsize=10, step_cm=0)
+
+    assert cache.bucket({"chest_cm": 100.1, "neck_cm": None}) == (("chest_cm", 100.1),)
+
+
+def test_recommend_route_serves_repeat_buckets_from_cache():
+    """Shoppers in the same bucket get identical sizes and count as hits."""
+
+    recommendation_cache.clear()
+    before = recommendation_cache.stats()["hits"]
+
+    first = client.post(
+        "/measurements/recommend",
+        json={"chest_cm": 100.1, "waist_natural_cm": 80.2, "session_id": "a"},
+        headers=API_HEADERS,
+    ).json()
+    second = client.post(
+        "/measurements/recommend",
+        json={"chest_cm": 99.9, "waist_natural_cm": 79.8, "session_id": "b"},
+        headers=API_HEADERS,
+    ).json()
+
+    assert first["recommendations"] == second["recommendations"]
+    assert first["matches"] == second["matches"]
+    assert second["session_id"] == "b"
+    assert second["processed_measurements"]["chest_cm"] == 99.9
+    metrics = client.get("/metrics").json()["recommendation_cache"]
+    assert metrics["hits"] == before + 1
+    assert metrics["step_cm"] == 0.5
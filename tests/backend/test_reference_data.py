@@ -0,0 +1,237 @@
+"""Tests for hot-reloadable reference data snapshots."""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+import shutil
+import sys
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.main import app  # noqa: E402
+from backend.app.services import reference_data as reference_module  # noqa: E402
+from backend.app.services.catalog import DEFAULT_CATALOG_PATH  # noqa: E402
+from backend.app.services.fit_notes import DEFAULT_FIT_NOTES_PATH  # noqa: E402
+from backend.app.services.fit_rules_tops import recommend_top  # noqa: E402
+from backend.app.services.reference_data import ReferenceData  # noqa: E402
+from backend.app.services.size_charts import DEFAULT_CHART_DIR  # noqa: E402
+
+
+client = TestClient(app)
+API_HEADERS = {"X-API-Key": "staging-secret-key"}
+TOP = {"chest_cm": 100.0, "shoulder_cm": 45.0, "sleeve_cm": 60.0}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    shutil.copytree(DEFAULT_CHART_DIR, tmp_path / "charts")
+    shutil.copy(DEFAULT_CATALOG_PATH, tmp_path / "catalog.json")
+    shutil.copy(DEFAULT_FIT_NOTES_PATH, tmp_path / "notes.json")
+    return tmp_path
+
+
+@pytest.fixture
+def store(data_dir):
+    return ReferenceData(data_dir / "charts", data_dir / "catalog.json", data_dir / "notes.json")
+
+
+def _edit_tops_chart(data_dir, labels, version="2026.01"):
+    path = data_dir / "charts" / "default_tops_us.json"
+    chart = json.loads(path.read_text())
+    chart["dimensions"]["chest"]["labels"] = labels
+    chart["version"] = version
+    path.write_text(json.dumps(chart))
+    # Make the change visible even on filesystems with coarse mtimes.
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_reload_is_a_no_op_until_sources_change(store, data_dir):
+    """Unchanged files keep the snapshot; an edit swaps in a new one."""
+
+    first = store.current
+
+    assert store.reload() is False
+    assert store.current is first
+
+    _edit_tops_chart(data_dir, ["small", "medium", "large", "xlarge"])
+
+    assert store.reload() is True
+    assert store.current is not first
+    assert store.current.version != first.version
+    assert store.current.size_charts.get("tops").size_for({"chest_cm": 100.0}) == "medium"
+    assert first.size_charts.get("tops").size_for({"chest_cm": 100.0}) == "M"
+
+
+def test_invalid_update_keeps_serving_the_previous_snapshot(store, data_dir):
+    """A chart that fails validation is rejected and reported."""
+
+    before = store.current
+    _edit_tops_chart(data_dir, ["S", "M"])
+
+    with pytest.raises(ValueError, match="one more label"):
+        store.reload()
+
+    assert store.current is before
+    assert store.stats()["failures"] == 1
+    assert "one more label" in store.stats()["last_error"]
+
+
+def _write(path, document):
+    path.write_text(json.dumps(document))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.mark.parametrize(
+    "name, document",
+    [
+        ("charts/default_tops_us.json", {"brand": "x", "category": "tops", "dimensions": []}),
+        ("charts/default_tops_us.json", {"brand": "x", "category": "tops",
+                                         "dimensions": {"chest": {"bounds": 3, "labels": []}}}),
+        ("charts/default_tops_us.json", "not a chart"),
+        ("catalog.json", {"categories": {"tops": {}}, "skus": [{"sku": "A"}]}),
+        ("catalog.json", []),
+        ("notes.json", {"rules": [["bottoms"]]}),
+        ("notes.json", {"rules": [{"category": "bottoms", "note": "n", "measure": "thigh",
+                                   "op": ">", "value": {}}]}),
+    ],
+)
+def test_structurally_malformed_files_are_rejected_as_value_errors(
+    store, data_dir, name, document
+):
+    """Wrong JSON shapes fail validation instead of escaping as other errors."""
+
+    before = store.current
+    _write(data_dir / name, document)
+
+    with pytest.raises(ValueError):
+        store.reload()
+
+    assert store.current is before
+    assert store.stats()["failures"] == 1
+
+
+def test_watch_survives_a_malformed_file(store, data_dir):
+    """A bad file is logged and skipped; the poller picks up the later fix."""
+
+    path = data_dir / "charts" / "default_tops_us.json"
+    good = json.loads(path.read_text())
+
+    async def scenario():
+        watcher = asyncio.create_task(store.watch(0.01))
+        _write(path, {"brand": "x", "category": "tops", "dimensions": []})
+        for _ in range(200):
+            if store.failures:
+                break
+            await asyncio.sleep(0.01)
+        good["dimensions"]["chest"]["labels"] = ["a", "b", "c", "d"]
+        _write(path, good)
+        for _ in range(200):
+            if store.reloads:
+                break
+            await asyncio.sleep(0.01)
+        alive = not watcher.done()
+        watcher.cancel()
+        return alive
+
+    assert asyncio.run(scenario()) is True
+    assert store.failures >= 1 and store.reloads == 1
+    assert store.current.size_charts.get("tops").size_for({"chest_cm": 100.0}) == "b"
+
+
+def test_version_hashes_the_parsed_bytes(store, data_dir):
+    """The same content gives the same version; any byte change gives a new one."""
+
+    first = store.current.version
+    assert store.reload(force=True) and store.current.version == first
+
+    notes = data_dir / "notes.json"
+    _write(notes, json.loads(notes.read_text()) | {"comment": "edited"})
+    store.reload()
+    assert store.current.version != first
+
+
+def test_readers_see_whole_snapshots_during_reloads(store, data_dir):
+    """Concurrent readers always see a chart and version from one snapshot."""
+
+    stop = threading.Event()
+    mismatches = []
+
+    def read():
+        while not stop.is_set():
+            snapshot = store.current
+            chart = snapshot.size_charts.get("tops")
+            label = chart.size_for({"chest_cm": 100.0})
+            if (chart.version == "2025.10") != (label == "M"):
+                mismatches.append((chart.version, label))
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for round_ in range(20):
+        labels = ["a", "b", "c", "d"] if round_ % 2 == 0 else ["S", "M", "L", "XL"]
+        _edit_tops_chart(data_dir, labels, "2026.01" if round_ % 2 == 0 else "2025.10")
+        store.reload()
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert mismatches == []
+    assert store.reloads == 20
+
+
+def test_watch_picks_up_changes_in_the_background(store, data_dir):
+    """The polling task reloads without an explicit call."""
+
+    async def scenario():
+        watcher = asyncio.create_task(store.watch(0.01))
+        _edit_tops_chart(data_dir, ["a", "b", "c", "d"])
+        for _ in range(200):
+            if store.reloads:
+                break
+            await asyncio.sleep(0.01)
+        watcher.cancel()
+
+    asyncio.run(scenario())
+
+    assert store.reloads == 1
+
+
+def test_services_and_admin_route_use_the_current_snapshot(store, data_dir, monkeypatch):
+    """Fit rules, recommendations and /admin/reload read the swapped snapshot."""
+
+    live = reference_module.reference_data
+    for name in ("current", "chart_dir", "catalog_path", "fit_notes_path"):
+        monkeypatch.setattr(live, name, getattr(store, name))
+    for name in ("reloads", "failures", "last_error"):
+        monkeypatch.setattr(live, name, getattr(live, name))
+    _edit_tops_chart(data_dir, ["small", "medium", "large", "xlarge"])
+
+    response = client.post("/admin/reload", headers=API_HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["reloaded"] is True
+    assert recommend_top(TOP)["size"] == "medium"
+    assert recommend_top(TOP)["chart_version"] == "2026.01"
+    metrics = client.get("/metrics").json()["reference_data"]
+    assert metrics["version"] == live.current.version
+
+    _edit_tops_chart(data_dir, ["S"])
+    rejected = client.post("/admin/reload", headers=API_HEADERS)
+    assert rejected.status_code == 422
+    assert rejected.json()["detail"]["code"] == "invalid_reference_data"
+    assert recommend_top(TOP)["size"] == "medium"
+
+
+def test_admin_reload_requires_api_key():
+    """Reloading is protected by the API key."""
+
+    assert client.post("/admin/reload").status_code == 401
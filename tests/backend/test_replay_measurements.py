@@ -0,0 +1,120 @@
+"""Tests for the bulk measurement replay job against a SQLite stand-in."""
+
+import json
+from pathlib import Path
+import sqlite3
+import sys
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.database import connection_pool  # noqa: E402
+from backend.app.core.provenance import ProvenanceWriter  # noqa: E402
+from backend.app.core.validation import normalize_and_validate  # noqa: E402
+from backend.app.jobs import replay_measurements as replay_module  # noqa: E402
+from backend.app.jobs.replay_measurements import replay_measurements  # noqa: E402
+from backend.app.schemas.measure_schema import MeasurementInput  # noqa: E402
+from tests.backend.conftest import landmark_view  # noqa: E402
+
+
+SESSIONS = 5
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Provenance database holding SESSIONS complete sessions and one front-only."""
+
+    path = tmp_path / "provenance.db"
+    writer = ProvenanceWriter(connection_pool(f"sqlite:///{path}", 1))
+    expected = {}
+    for number in range(SESSIONS):
+        input_data = MeasurementInput(
+            front_landmarks=landmark_view(0.01 * number),
+            side_landmarks=landmark_view(0.005 * number, visibility=0.6),
+            session_id=f"replay-{number}",
+        )
+        normalized = normalize_and_validate(input_data)
+        expected[normalized.session_id] = normalized
+        writer.submit(input_data, normalized)
+    writer.close()
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "delete from mediapipe_landmarks where session_id = 'replay-0' and view = 'side'"
+        )
+    return path, expected
+
+
+def _replayed(path, model_version):
+    with sqlite3.connect(path) as connection:
+        rows = connection.execute(
+            "select session_id, payload from normalized_measurements "
+            "where model_version = ? order by session_id",
+            (model_version,),
+        ).fetchall()
+    return {session_id: json.loads(payload) for session_id, payload in rows}
+
+
+def test_replay_recomputes_every_complete_session(database):
+    """Each session with both views gets one row under the new model version."""
+
+    path, expected = database
+    pool = connection_pool(f"sqlite:///{path}", 2)
+
+    report = replay_measurements(pool, "v2-test", chunk_size=2)
+
+    replayed = _replayed(path, "v2-test")
+    assert sorted(replayed) == [f"replay-{n}" for n in range(1, SESSIONS)]
+    assert (report.sessions, report.chunks, report.skipped) == (SESSIONS - 1, 2, 1)
+    for session_id, payload in replayed.items():
+        original = expected[session_id]
+        assert payload["height_cm"] == pytest.approx(original.height_cm, rel=1e-5)
+        assert payload["accuracy_estimate"] == original.accuracy_estimate
+        assert payload["front_landmarks_id"] == original.front_landmarks_id
+        assert payload["model_version"] == "v2-test"
+    assert replay_measurements(pool, "v2-test").sessions == 0
+
+
+def test_interrupted_replay_resumes_without_duplicates(database, monkeypatch):
+    """A failure mid-run keeps committed chunks; the rerun finishes the rest."""
+
+    path, _ = database
+    pool = connection_pool(f"sqlite:///{path}", 2)
+    write_chunk = replay_module._write_chunk
+    calls = []
+
+    def failing_write(*args):
+        calls.append(args)
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        write_chunk(*args)
+
+    monkeypatch.setattr(replay_module, "_write_chunk", failing_write)
+    with pytest.raises(RuntimeError):
+        replay_measurements(pool, "v2-resume", chunk_size=2)
+    assert sorted(_replayed(path, "v2-resume")) == ["replay-1", "replay-2"]
+    monkeypatch.setattr(replay_module, "_write_chunk", write_chunk)
+
+    report = replay_measurements(pool, "v2-resume", chunk_size=2)
+
+    assert report.resumed_after == "replay-2"
+    assert report.sessions == 2
+    assert sorted(_replayed(path, "v2-resume")) == [f"replay-{n}" for n in range(1, SESSIONS)]
+
+
+def test_process_pool_matches_inline_replay(database):
+    """Worker processes produce the same rows as in-process evaluation."""
+
+    path, _ = database
+    pool = connection_pool(f"sqlite:///{path}", 2)
+
+    replay_measurements(pool, "inline", chunk_size=2)
+    report = replay_measurements(pool, "pooled", chunk_size=2, workers=2)
+
+    inline, pooled = _replayed(path, "inline"), _replayed(path, "pooled")
+    assert report.chunks == 2
+    assert {key: {**value, "model_version": None} for key, value in inline.items()} == {
+        key: {**value, "model_version": None} for key, value in pooled.items()
+    }
@@ -0,0 +1,128 @@
+"""Tests for the content-addressed normalize_and_validate result cache."""
+
+from pathlib import Path
+import sys
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core import validation  # noqa: E402
+from backend.app.core.cache import TTLCache  # noqa: E402
+from backend.app.schemas.measure_schema import MeasurementInput  # noqa: E402
+from tests.backend.conftest import landmark_frame  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _input(session_id, scale=1.0):
+    return MeasurementInput(**landmark_frame(spread=0.01 * scale), session_id=session_id)
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    cache = TTLCache(maxsize=8, ttl_seconds=60)
+    monkeypatch.setattr(validation, "result_cache", cache)
+    calls = []
+    compute = validation._compute_measurements
+
+    def counting_compute(input_data):
+        calls.append(input_data.session_id)
+        return compute(input_data)
+
+    monkeypatch.setattr(validation, "_compute_measurements", counting_compute)
+    return cache, calls
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Entries beyond maxsize drop the least recently used key."""
+
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries_and_reports_hit_ratio():
+    """Expired entries count as misses and hit ratio tracks lookups."""
+
+    clock = FakeClock()
+    cache = TTLCache(maxsize=4, ttl_seconds=10, clock=clock)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+    clock.now = 10.0
+    assert cache.get("key") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["expirations"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_identical_payload_skips_recomputation(fresh_cache):
+    """A resubmitted scan reuses measurements but keeps its own session id."""
+
+    cache, calls = fresh_cache
+
+    first = validation.normalize_and_validate(_input("first"))
+    second = validation.normalize_and_validate(_input("retry"))
+
+    assert calls == ["first"]
+    assert cache.hits == 1
+    assert second.session_id == "retry"
+    assert second.height_cm == first.height_cm
+    assert second.front_landmarks_id != first.front_landmarks_id
+
+
+def test_different_landmarks_miss(fresh_cache):
+    """Any change to the landmark arrays produces a different key."""
+
+    _, calls = fresh_cache
+
+    validation.normalize_and_validate(_input("a"))
+    validation.normalize_and_validate(_input("b", scale=1.01))
+
+    assert calls == ["a", "b"]
+
+
+def test_model_version_bump_never_serves_stale_results(fresh_cache, monkeypatch):
+    """Keys include the model version."""
+
+    _, calls = fresh_cache
+    validation.normalize_and_validate(_input("v1"))
+
+    monkeypatch.setattr(validation, "MODEL_VERSION", "v2.0-mediapipe")
+    result = validation.normalize_and_validate(_input("v2"))
+
+    assert calls == ["v1", "v2"]
+    assert result.model_version == "v2.0-mediapipe"
+
+
+def test_unit_is_part_of_the_key(fresh_cache):
+    """The same numbers in different units are cached separately."""
+
+    _, calls = fresh_cache
+    cm = validation.normalize_and_validate(
+        MeasurementInput(waist_natural=80, unit="cm", session_id="cm")
+    )
+    inches = validation.normalize_and_validate(
+        MeasurementInput(waist_natural=80, unit="in", session_id="in")
+    )
+
+    assert calls == ["cm", "in"]
+    assert inches.waist_natural_cm == pytest.approx(cm.waist_natural_cm * 2.54)
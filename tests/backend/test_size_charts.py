@@ -0,0 +1,192 @@
+"""Tests for the compiled size chart engine and the chart-backed fit rules."""
+
+import json
+from pathlib import Path
+import sys
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.services.fit_rules_bottoms import recommend_bottom  # noqa: E402
+from backend.app.services.fit_rules_tops import recommend_top  # noqa: E402
+from backend.app.services.size_charts import (  # noqa: E402
+    SizeChartRegistry,
+    compile_chart,
+    load_size_charts,
+)
+
+
+PROFILE = {
+    "chest_cm": 100.0,
+    "shoulder_cm": 45.0,
+    "sleeve_cm": 60.0,
+    "waist_natural_cm": 81.28,
+    "hip_low_cm": 100.0,
+    "thigh_cm": 55.0,
+    "knee_cm": 38.0,
+    "inseam_cm": 76.2,
+}
+
+
+def _chart(brand="acme", region="US", bounds=(90, 100), labels=("S", "M", "L")):
+    return {
+        "brand": brand,
+        "category": "tops",
+        "region": region,
+        "unit": "cm",
+        "version": "7",
+        "dimensions": {"chest": {"bounds": list(bounds), "labels": list(labels)}},
+    }
+
+
+@pytest.mark.parametrize(
+    "chest_cm, expected",
+    [(92.0, "S"), (92.7, "S"), (93.0, "M"), (102.8, "M"), (103.0, "L"), (130.0, "XL")],
+)
+def test_default_tops_chart_matches_whole_inch_sizing(chest_cm, expected):
+    """Chest rounded to the nearest inch maps S <= 36 < M <= 40 < L <= 44 < XL."""
+
+    result = recommend_top({**PROFILE, "chest_cm": chest_cm})
+
+    assert result["size"] == expected
+    assert result["chart_version"] == "2025.10"
+
+
+def test_default_bottoms_chart_formats_waist_and_inseam():
+    """Bottoms compose the per-dimension labels into waist x inseam."""
+
+    result = recommend_bottom(PROFILE)
+
+    assert result["size"] == "32x30"
+    assert result["rationale"] == "standard ease"
+
+
+@pytest.mark.parametrize("inches", [24.5 + step for step in range(24)])
+def test_default_bottoms_chart_sends_half_inches_to_the_smaller_size(inches):
+    """Exact half inches take the lower label for waist and inseam alike.
+
+    The legacy ``round()`` rules were inconsistent here (25.5 -> 25 but
+    29.5 -> 30); the chart's inclusive bounds replace that on purpose.
+    """
+
+    below, above = str(int(inches - 0.5)), str(int(inches + 0.5))
+    on_bound = recommend_bottom({**PROFILE, "waist_natural_cm": inches * 2.54})
+    past_bound = recommend_bottom({**PROFILE, "waist_natural_cm": inches * 2.54 + 0.01})
+
+    assert on_bound["size"] == f"{below}x30"
+    assert past_bound["size"] == f"{above}x30"
+    if 26.5 <= inches <= 37.5:
+        inseam = recommend_bottom({**PROFILE, "inseam_cm": inches * 2.54})
+        assert inseam["size"] == f"32x{below}"
+
+
+@pytest.mark.parametrize(
+    "overrides, outside",
+    [
+        ({"waist_natural_cm": 52 * 2.54, "inseam_cm": 40 * 2.54}, "waist_natural, inseam"),
+        ({"waist_natural_cm": 22 * 2.54}, "waist_natural"),
+        ({"inseam_cm": 24 * 2.54}, "inseam"),
+    ],
+)
+def test_default_bottoms_chart_flags_bodies_beyond_either_end(overrides, outside):
+    """Waists and inseams past the chart get no size, not the nearest end size."""
+
+    result = recommend_bottom({**PROFILE, **overrides})
+
+    assert result["size"] is None
+    assert result["rationale"] == f"outside the size chart: {outside}"
+
+
+def test_default_bottoms_chart_covers_its_end_sizes_up_to_the_limits():
+    """The first and last sizes still cover half an inch beyond their label."""
+
+    smallest = {**PROFILE, "waist_natural_cm": 23.5 * 2.54, "inseam_cm": 25.5 * 2.54}
+    largest = {**PROFILE, "waist_natural_cm": 48.5 * 2.54, "inseam_cm": 38.5 * 2.54}
+
+    assert recommend_bottom(smallest)["size"] == "24x26"
+    assert recommend_bottom(largest)["size"] == "48x38"
+
+
+def test_bounds_are_inclusive_and_clamped():
+    """Values on a bound take that bound's label; extremes clamp to the ends."""
+
+    chart = compile_chart(_chart())
+
+    assert [chart.size_for({"chest_cm": v}) for v in (50, 90, 90.1, 100, 500)] == [
+        "S",
+        "S",
+        "M",
+        "M",
+        "L",
+    ]
+
+
+def test_inch_charts_are_compiled_to_centimeters():
+    """Charts authored in inches are converted once at load time."""
+
+    spec = {**_chart(bounds=(36, 40)), "unit": "in"}
+
+    assert compile_chart(spec).dimensions[0].bounds == pytest.approx((91.44, 101.6))
+
+
+def test_registry_falls_back_to_default_region_and_brand():
+    """Unknown regions and brands fall back to the default chart."""
+
+    registry = SizeChartRegistry(
+        [
+            compile_chart(_chart(brand="default", labels=("d1", "d2", "d3"))),
+            compile_chart(_chart(brand="acme", region="EU", labels=("e1", "e2", "e3"))),
+        ]
+    )
+
+    assert registry.get("tops", "ACME", "eu").size_for({"chest_cm": 95}) == "e2"
+    assert registry.get("tops", "acme", "JP").size_for({"chest_cm": 95}) == "d2"
+    assert registry.find("dresses") is None
+    with pytest.raises(KeyError):
+        registry.get("dresses")
+
+
+def test_thousands_of_charts_resolve_independently():
+    """Each of many loaded charts is addressed by its own key."""
+
+    registry = SizeChartRegistry(
+        compile_chart(_chart(brand=f"brand-{i}", bounds=(i, i + 1))) for i in range(5000)
+    )
+
+    assert len(registry) == 5000
+    assert registry.get("tops", "brand-4321").size_for({"chest_cm": 4321.5}) == "M"
+
+
+@pytest.mark.parametrize(
+    "override, message",
+    [
+        ({"unit": "furlong"}, "unit"),
+        ({"dimensions": {"chest": {"bounds": [100, 90], "labels": ["S", "M", "L"]}}}, "ascending"),
+        ({"dimensions": {"chest": {"bounds": [90], "labels": ["S"]}}}, "one more label"),
+        ({"format": "{waist}"}, "unknown dimension"),
+        ({"dimensions": {"chest": {"bounds": [90], "labels": ["S", "M"], "min": 95}}}, "outside"),
+        ({"dimensions": {"chest": {"bounds": [90], "labels": ["S", "M"], "max": "x"}}}, "numeric"),
+    ],
+)
+def test_malformed_charts_are_rejected(override, message):
+    """Chart validation errors name the offending problem."""
+
+    with pytest.raises(ValueError, match=message):
+        compile_chart({**_chart(), **override})
+
+
+def test_load_size_charts_reads_bundles(tmp_path):
+    """A file may hold one chart or a ``charts`` bundle."""
+
+    (tmp_path / "single.json").write_text(json.dumps(_chart(brand="one")))
+    (tmp_path / "bundle.json").write_text(
+        json.dumps({"charts": [_chart(brand="two"), _chart(brand="three")]})
+    )
+
+    registry = load_size_charts(tmp_path)
+
+    assert len(registry) == 3
+    assert registry.get("tops", "three").version == "7"
@@ -0,0 +1,90 @@
+"""Tests for the batch validation endpoint."""
+
+from pathlib import Path
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.validation import normalize_and_validate  # noqa: E402
+from backend.app.main import app  # noqa: E402
+from backend.app.schemas.measure_schema import MeasurementInput  # noqa: E402
+from tests.backend.conftest import landmark_view  # noqa: E402
+
+
+client = TestClient(app)
+API_HEADERS = {"X-API-Key": "staging-secret-key"}
+
+
+def _mediapipe_item(session_id, offset=0.0, **overrides):
+    item = {
+        "front_landmarks": landmark_view(offset),
+        "side_landmarks": landmark_view(offset / 2, visibility=0.6),
+        "session_id": session_id,
+    }
+    item.update(overrides)
+    return item
+
+
+def test_batch_matches_single_validation():
+    """Tensorized batch results equal per-item normalize_and_validate."""
+
+    items = [_mediapipe_item(f"batch-{i}", offset=0.01 * i) for i in range(4)]
+    items.append({"waist_natural": 32, "unit": "in", "session_id": "batch-user"})
+
+    response = client.post(
+        "/measurements/validate/batch", json={"items": items}, headers=API_HEADERS
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["succeeded"] == 5
+    assert data["failed"] == 0
+    for item, outcome in zip(items, data["results"]):
+        expected = normalize_and_validate(MeasurementInput(**item)).model_dump()
+        result = outcome["result"]
+        assert outcome["status"] == "ok"
+        assert result["session_id"] == item["session_id"]
+        for key, value in expected.items():
+            if key.endswith("_cm") and value is not None:
+                assert result[key] == pytest.approx(value)
+        assert result["accuracy_estimate"] == expected["accuracy_estimate"]
+
+
+def test_batch_isolates_bad_items():
+    """Schema, unknown-field and landmark-shape errors stay per item."""
+
+    items = [
+        _mediapipe_item("ok-1"),
+        {"waist_natural": "not-a-number", "session_id": "bad-schema"},
+        {"waist_circ": 32, "unit": "in", "session_id": "bad-field"},
+        _mediapipe_item("bad-count", front_landmarks=landmark_view(count=20)),
+    ]
+
+    response = client.post(
+        "/measurements/validate/batch", json={"items": items}, headers=API_HEADERS
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["ok", "error", "error", "error"]
+    assert results[1]["error"]["code"] == "invalid_payload"
+    assert results[1]["error"]["session_id"] == "bad-schema"
+    assert results[2]["error"]["code"] == "unknown_field"
+    assert results[2]["error"]["errors"][0]["field"] == "waist_circ"
+    assert results[3]["error"]["code"] == "invalid_payload"
+    assert results[3]["error"]["errors"][0]["field"] == "front_landmarks.landmarks"
+
+
+def test_batch_requires_api_key():
+    """Batch validation enforces the API key like the single route."""
+
+    response = client.post(
+        "/measurements/validate/batch", json={"items": [{"waist_natural": 32}]}
+    )
+
+    assert response.status_code == 401
@@ -93,6 +93,41 @@ def test_validate_unknown_field_rejected():
     assert detail["errors"][0]["field"] == "waist_circ"
 
 
+def test_validate_malformed_json_is_422():
+    """Bodies that fail the single JSON parse surface FastAPI's 422 shape."""
+
+    response = client.post(
+        "/measurements/validate",
+        content=b'{"waist_natural": 32,',
+        headers={**API_HEADERS, "Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][0] == "body"
+
+
+def test_validate_schema_error_reports_body_location():
+    """Type errors keep the ``body`` prefix in their location."""
+
+    response = client.post(
+        "/measurements/validate",
+        json={"waist_natural": "wide"},
+        headers=API_HEADERS,
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "waist_natural"]
+
+
+def test_validate_openapi_documents_request_body():
+    """The manually parsed route still publishes its request schema."""
+
+    operation = app.openapi()["paths"]["/measurements/validate"]["post"]
+    schema = operation["requestBody"]["content"]["application/json"]["schema"]
+
+    assert "waist_natural" in schema["properties"]
+
+
 def test_validate_missing_api_key():
     """Requests without an API key should be rejected."""
 
@@ -170,3 +205,45 @@ def test_recommend_missing_api_key():
     detail = response.json()["detail"]
     assert detail["type"] == "authentication_error"
 
+
+
+def test_validate_and_recommend_matches_the_two_step_flow():
+    """The fused route returns what validate followed by recommend would."""
+
+    payload = {"waist_natural": 32, "hip_low": 40, "chest": 40, "unit": "in", "session_id": "f-1"}
+
+    validated = client.post("/measurements/validate", json=payload, headers=API_HEADERS).json()
+    two_step = client.post("/measurements/recommend", json=validated, headers=API_HEADERS).json()
+    fused = client.post(
+        "/measurements/validate-and-recommend", json=payload, headers=API_HEADERS
+    )
+
+    assert fused.status_code == 200
+    body = fused.json()
+    assert body["processed_measurements"] == {
+        key: value for key, value in validated.items() if value is not None
+    }
+    assert body["recommendations"] == two_step["recommendations"]
+    assert body["session_id"] == "f-1"
+    assert body["mode"] == "catalog"
+
+
+def test_validate_and_recommend_reports_validation_errors():
+    """Invalid input fails with the same 422 envelope as /validate."""
+
+    response = client.post(
+        "/measurements/validate-and-recommend",
+        json={"waist_circ": 32, "unit": "in"},
+        headers=API_HEADERS,
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["code"] == "unknown_field"
+
+
+def test_validate_and_recommend_requires_api_key():
+    """The fused route is protected like the routes it combines."""
+
+    response = client.post("/measurements/validate-and-recommend", json={"chest": 100})
+
+    assert response.status_code == 401
@@ -0,0 +1,189 @@
+"""Tests for the vendor client against the local fake vendor and a SQLite cache."""
+
+import asyncio
+from pathlib import Path
+import sqlite3
+import sys
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+import httpx
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.app.core.database import connection_pool  # noqa: E402
+from backend.app.services.fake_vendor import create_app  # noqa: E402
+from backend.app.services.vendor_client import (  # noqa: E402
+    VendorClient,
+    VendorError,
+    VendorResponseCache,
+    fetch_two_photo_stub,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "vendor.db"
+
+
+def _client(vendor, pool, **options):
+    return VendorClient(
+        "http://vendor.test",
+        VendorResponseCache(pool, "fake"),
+        backoff_seconds=0,
+        transport=httpx.ASGITransport(app=vendor),
+        **options,
+    )
+
+
+async def _with_client(client, scenario):
+    try:
+        return await scenario(client)
+    finally:
+        await client.aclose()
+
+
+def test_session_is_paid_once_and_survives_restart(db_path):
+    """Repeat fetches, even from a new client, are served from measurements_vendor."""
+
+    vendor = create_app(cost_usd=0.4)
+    pool = connection_pool(f"sqlite:///{db_path}", 2)
+
+    async def twice(client):
+        return [await client.fetch("s-1"), await client.fetch("s-1")]
+
+    first, second = asyncio.run(_with_client(_client(vendor, pool), twice))
+    restarted = _client(vendor, connection_pool(f"sqlite:///{db_path}", 1))
+    third = asyncio.run(_with_client(restarted, lambda client: client.fetch("s-1")))
+
+    expected = fetch_two_photo_stub("s-1") | {"session_id": "s-1"}
+    assert first == second == third == expected
+    assert vendor.state.calls["s-1"] == 1
+    assert restarted.stats()["cache_hits"] == 1 and restarted.stats()["calls"] == 0
+    with sqlite3.connect(db_path) as connection:
+        rows = connection.execute(
+            "select session_id, vendor_name, vendor_version, cost_usd from measurements_vendor"
+        ).fetchall()
+    assert rows == [("s-1", "fake", "stub-2photo", 0.4)]
+
+
+def test_concurrent_requests_for_one_session_share_a_call(db_path):
+    """Callers that race on a session wait for the single in-flight call."""
+
+    vendor = create_app(latency_seconds=0.05)
+    client = _client(vendor, connection_pool(f"sqlite:///{db_path}", 2))
+
+    async def race(client):
+        return await asyncio.gather(*(client.fetch("s-1") for _ in range(5)))
+
+    results = asyncio.run(_with_client(client, race))
+
+    assert len({id(result) for result in results}) == 1
+    assert vendor.state.calls["s-1"] == 1
+    assert client.stats()["coalesced"] == 4
+
+
+def test_fetch_many_bounds_concurrency_and_skips_paid_sessions(db_path):
+    """Batches respect the semaphore and only pay for sessions not yet cached."""
+
+    vendor = create_app(cost_usd=0.25, latency_seconds=0.02)
+    client = _client(vendor, connection_pool(f"sqlite:///{db_path}", 2), max_concurrency=4)
+
+    async def calibrate(client):
+        first = await client.fetch_many([f"s-{n}" for n in range(20)] + ["s-0"])
+        second = await client.fetch_many([f"s-{n}" for n in range(15, 25)])
+        return first, second
+
+    first, second = asyncio.run(_with_client(client, calibrate))
+
+    assert len(first.results) == 20 and not first.errors
+    assert first.cost_usd == pytest.approx(5.0) and first.cache_hits == 0
+    assert vendor.state.peak_concurrency <= 4
+    assert len(second.results) == 10 and second.cache_hits == 5
+    assert second.cost_usd == pytest.approx(1.25)
+    assert sum(vendor.state.calls.values()) == 25
+    assert client.stats()["cost_usd"] == pytest.approx(6.25)
+
+
+def test_transient_failures_are_retried_and_failed_sessions_not_cached(db_path):
+    """503s are retried; a session that never succeeds is reported, not stored."""
+
+    pool = connection_pool(f"sqlite:///{db_path}", 2)
+    flaky = _client(create_app(failures_per_session=1), pool, retries=1)
+    payload = asyncio.run(_with_client(flaky, lambda client: client.fetch("s-1")))
+    assert payload["source_version"] == "stub-2photo"
+    assert flaky.stats()["calls"] == 1
+
+    down = create_app(failures_per_session=10)
+    batch = asyncio.run(
+        _with_client(_client(down, pool, retries=1), lambda client: client.fetch_many(["s-2"]))
+    )
+    assert "HTTP 503" in batch.errors["s-2"] and not batch.results
+    assert down.state.calls["s-2"] == 2
+
+    with pytest.raises(VendorError):
+        asyncio.run(_with_client(_client(down, pool, retries=0), lambda c: c.fetch("s-2")))
+    with sqlite3.connect(db_path) as connection:
+        stored = connection.execute("select session_id from measurements_vendor").fetchall()
+    assert stored == [("s-1",)]
+
+
+def test_fetch_many_rechecks_the_cache_before_paying(db_path):
+    """A session paid for by a concurrent fetch after the bulk lookup is not bought again."""
+
+    vendor = create_app(cost_usd=0.5)
+    client = _client(vendor, connection_pool(f"sqlite:///{db_path}", 2))
+    bulk_lookup = client.cache.get_many
+
+    async def stale_lookup(session_ids):
+        found = await bulk_lookup(session_ids)
+        if len(session_ids) > 1:
+            # Another request pays for s-1 while the batch is between steps.
+            await client.fetch("s-1")
+        return found
+
+    client.cache.get_many = stale_lookup
+    batch = asyncio.run(_with_client(client, lambda c: c.fetch_many(["s-1", "s-2"])))
+
+    assert set(batch.results) == {"s-1", "s-2"} and not batch.errors
+    assert dict(vendor.state.calls) == {"s-1": 1, "s-2": 1}
+    assert batch.cache_hits == 1 and batch.cost_usd == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("header", ["free", "nan", "-1"])
+def test_malformed_cost_header_falls_back_and_still_stores_the_payload(db_path, header):
+    """A bad X-Cost-USD is billed at the configured cost; the paid payload is kept."""
+
+    vendor = FastAPI()
+
+    @vendor.get("/v1/measurements/{session_id}")
+    async def measurements(session_id: str):
+        return JSONResponse(fetch_two_photo_stub(session_id), headers={"X-Cost-USD": header})
+
+    client = _client(vendor, connection_pool(f"sqlite:///{db_path}", 2), cost_per_call_usd=0.3)
+    payload = asyncio.run(_with_client(client, lambda c: c.fetch("s-1")))
+
+    assert payload["source_version"] == "stub-2photo"
+    assert client.stats()["cost_usd"] == pytest.approx(0.3)
+    with sqlite3.connect(db_path) as connection:
+        rows = connection.execute("select session_id, cost_usd from measurements_vendor").fetchall()
+    assert rows == [("s-1", 0.3)]
+
+
+def test_cache_without_database_is_kept_in_memory():
+    """Without a pool, paid responses are reused for the life of the process."""
+
+    vendor = create_app()
+    client = _client(vendor, None)
+
+    async def twice(client):
+        await client.fetch("s-1")
+        return await client.fetch_many(["s-1", "s-2"])
+
+    batch = asyncio.run(_with_client(client, twice))
+
+    assert set(batch.results) == {"s-1", "s-2"} and batch.cache_hits == 1
+    assert dict(vendor.state.calls) == {"s-1": 1, "s-2": 1}
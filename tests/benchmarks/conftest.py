@@ -0,0 +1,101 @@
+"""Timing harness for the opt-in hot-path benchmarks.
+
+Benchmarks only run with ``RUN_BENCHMARKS=1`` because wall-clock numbers are
+machine dependent. Each case records median and p99 latency in microseconds
+and fails when either exceeds the stored baseline by more than
+``BENCHMARK_TOLERANCE`` (a ratio, default 1.5) and by at least
+``BENCHMARK_MIN_DELTA_US`` (default 5), so scheduler jitter on microsecond
+functions is not reported as a regression. ``BENCHMARK_UPDATE_BASELINE=1``
+rewrites ``baseline.json`` from the current run instead of comparing.
+"""
+
+import gc
+import json
+import os
+from pathlib import Path
+import sys
+import time
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+RUN_BENCHMARKS = os.getenv("RUN_BENCHMARKS") == "1"
+UPDATE_BASELINE = os.getenv("BENCHMARK_UPDATE_BASELINE") == "1"
+TOLERANCE = float(os.getenv("BENCHMARK_TOLERANCE", "1.5"))
+MIN_DELTA_US = float(os.getenv("BENCHMARK_MIN_DELTA_US", "5"))
+
+
+def pytest_collection_modifyitems(config, items):
+    if RUN_BENCHMARKS:
+        return
+    skip = pytest.mark.skip(reason="set RUN_BENCHMARKS=1 to run benchmarks")
+    benchmark_dir = Path(__file__).parent
+    for item in items:
+        if benchmark_dir in Path(str(item.fspath)).parents:
+            item.add_marker(skip)
+
+
+def measure(fn, rounds, warmup, inner=1):
+    """Median and p99 latency of ``fn()`` in microseconds.
+
+    Each sample times ``inner`` back-to-back calls so sub-microsecond
+    functions are not dominated by timer resolution. The garbage collector is
+    paused while timing, as ``timeit`` does.
+    """
+
+    for _ in range(warmup):
+        fn()
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in range(inner):
+                fn()
+            samples.append((time.perf_counter() - start) * 1e6 / inner)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    samples.sort()
+    return {
+        "median_us": round(samples[len(samples) // 2], 2),
+        "p99_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 2),
+    }
+
+
+class _Baseline:
+    def __init__(self):
+        self.stored = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+        self.current = {}
+
+    def check(self, name, fn, rounds=2000, warmup=200, inner=1):
+        """Time ``fn`` and compare it with the stored numbers for ``name``."""
+
+        result = measure(fn, rounds, warmup, inner)
+        self.current[name] = result
+        if UPDATE_BASELINE:
+            return result
+        expected = self.stored.get(name)
+        if expected is None:
+            pytest.fail(f"no baseline for {name}; run with BENCHMARK_UPDATE_BASELINE=1")
+        for stat in ("median_us", "p99_us"):
+            limit = max(expected[stat] * TOLERANCE, expected[stat] + MIN_DELTA_US)
+            assert result[stat] <= limit, (
+                f"{name} {stat} regressed: {result[stat]}us > {limit:.2f}us "
+                f"(baseline {expected[stat]}us x {TOLERANCE}, +{MIN_DELTA_US}us floor)"
+            )
+        return result
+
+
+@pytest.fixture(scope="session")
+def perf_baseline():
+    baseline = _Baseline()
+    yield baseline
+    if UPDATE_BASELINE and baseline.current:
+        merged = {**baseline.stored, **baseline.current}
+        BASELINE_PATH.write_text(json.dumps(merged, indent=2, sort_keys=True) + "\n")
@@ -0,0 +1,189 @@
+"""Latency benchmarks for the validation and recommendation hot paths.
+
+Run with ``RUN_BENCHMARKS=1 pytest tests/benchmarks``; see ``conftest.py``.
+"""
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.core import validation
+from backend.app.core.cache import TTLCache
+from backend.app.main import app
+from backend.app.schemas.measure_schema import MeasurementInput, MediaPipeLandmarks
+from backend.app.services.catalog import GarmentCatalog
+from backend.app.services.fit_index import DIMENSIONS, FitIndex
+from backend.app.services.fit_rules_bottoms import recommend_bottom
+from backend.app.services.fit_rules_tops import recommend_top
+from backend.app.services.reference_data import reference_data
+
+
+API_HEADERS = {"X-API-Key": "staging-secret-key"}
+
+
+def _synthetic_view(seed):
+    """Deterministic standing pose with per-point jitter and visibility."""
+
+    rng = np.random.default_rng(seed)
+    points = np.empty((33, 4))
+    points[:, 0] = 0.5 + rng.normal(0, 0.08, 33)
+    points[:, 1] = np.linspace(0.05, 0.95, 33) + rng.normal(0, 0.01, 33)
+    points[:, 2] = rng.normal(0, 0.05, 33)
+    points[:, 3] = rng.uniform(0.6, 1.0, 33)
+    return MediaPipeLandmarks(
+        landmarks=points,
+        timestamp="2025-10-26T15:00:00Z",
+        image_width=1080,
+        image_height=1920,
+    )
+
+
+FRONT = _synthetic_view(1)
+SIDE = _synthetic_view(2)
+MEASUREMENTS = validation.calculate_measurements_from_landmarks(FRONT, SIDE)
+MEDIAPIPE_PAYLOAD = {
+    "front_landmarks": FRONT.model_dump(),
+    "side_landmarks": SIDE.model_dump(),
+    "session_id": "bench",
+}
+RECOMMEND_PAYLOAD = {**MEASUREMENTS, "model_version": validation.MODEL_VERSION}
+
+
+@pytest.fixture
+def cold_cache(monkeypatch):
+    """Disable the result cache so every call runs the full computation."""
+
+    monkeypatch.setattr(validation, "result_cache", TTLCache(maxsize=0))
+
+
+def test_calculate_measurements_from_landmarks(perf_baseline):
+    perf_baseline.check(
+        "calculate_measurements_from_landmarks",
+        lambda: validation.calculate_measurements_from_landmarks(FRONT, SIDE),
+    )
+
+
+def test_estimate_accuracy(perf_baseline):
+    perf_baseline.check(
+        "estimate_accuracy",
+        lambda: validation.estimate_accuracy(MEASUREMENTS, FRONT, SIDE),
+        inner=20,
+    )
+
+
+def test_normalize_and_validate_cold(perf_baseline, cold_cache):
+    input_data = MeasurementInput(**MEDIAPIPE_PAYLOAD)
+    perf_baseline.check(
+        "normalize_and_validate_cold",
+        lambda: validation.normalize_and_validate(input_data),
+    )
+
+
+def test_normalize_and_validate_cached(perf_baseline):
+    input_data = MeasurementInput(**MEDIAPIPE_PAYLOAD)
+    perf_baseline.check(
+        "normalize_and_validate_cached",
+        lambda: validation.normalize_and_validate(input_data),
+    )
+
+
+def test_recommend_top(perf_baseline):
+    perf_baseline.check(
+        "recommend_top", lambda: recommend_top(MEASUREMENTS), rounds=500, inner=100
+    )
+
+
+def test_recommend_bottom(perf_baseline):
+    perf_baseline.check(
+        "recommend_bottom", lambda: recommend_bottom(MEASUREMENTS), rounds=500, inner=100
+    )
+
+
+def test_catalog_top_k_5000_skus(perf_baseline):
+    rng = np.random.default_rng(5)
+    catalog = GarmentCatalog.from_document(
+        {
+            "categories": {
+                "tops": {
+                    "ease": {"chest": 10, "shoulder": 1, "sleeve": 0},
+                    "tolerance": {"chest": 4, "shoulder": 2, "sleeve": 2.5},
+                }
+            },
+            "skus": [
+                {
+                    "sku": f"SKU-{i}",
+                    "category": "tops",
+                    "size": "M",
+                    "measurements": {
+                        "chest": float(rng.uniform(80, 130)),
+                        "shoulder": float(rng.uniform(38, 52)),
+                        "sleeve": float(rng.uniform(55, 70)),
+                    },
+                }
+                for i in range(5000)
+            ],
+        }
+    )
+    perf_baseline.check(
+        "catalog_top_k_5000_skus",
+        lambda: catalog.match(MEASUREMENTS, k=10),
+        rounds=500,
+        warmup=50,
+    )
+
+
+def test_fit_notes_batch_1000_profiles(perf_baseline):
+    profiles = [
+        {key: value * (1 + 0.0005 * i) for key, value in MEASUREMENTS.items()}
+        for i in range(1000)
+    ]
+    perf_baseline.check(
+        "fit_notes_batch_1000_profiles",
+        lambda: reference_data.current.fit_notes.notes_many(profiles),
+        rounds=200,
+        warmup=20,
+    )
+
+
+def test_fit_index_vote_100k_profiles(perf_baseline):
+    # Body measurements are strongly correlated, so profiles are drawn from a
+    # few latent body-shape factors plus per-measurement noise.
+    rng = np.random.default_rng(9)
+    loadings = rng.normal(0, 8, size=(3, DIMENSIONS))
+    profiles = 90 + rng.normal(size=(100_000, 3)) @ loadings
+    profiles += rng.normal(0, 1, size=profiles.shape)
+    index = FitIndex(compact_threshold=200_000)
+    for row, point in enumerate(profiles):
+        index.insert(point, "SML"[row % 3])
+    index.compact()
+    query = 90 + rng.normal(size=3) @ loadings
+    perf_baseline.check(
+        "fit_index_vote_100k_profiles",
+        lambda: index.vote(query, 15),
+        rounds=300,
+        warmup=30,
+    )
+
+
+def test_validate_route_round_trip(perf_baseline, cold_cache):
+    client = TestClient(app)
+    perf_baseline.check(
+        "asgi_validate",
+        lambda: client.post(
+            "/measurements/validate", json=MEDIAPIPE_PAYLOAD, headers=API_HEADERS
+        ).raise_for_status(),
+        rounds=1000,
+        warmup=100,
+    )
+
+
+def test_recommend_route_round_trip(perf_baseline):
+    client = TestClient(app)
+    perf_baseline.check(
+        "asgi_recommend",
+        lambda: client.post(
+            "/measurements/recommend", json=RECOMMEND_PAYLOAD, headers=API_HEADERS
+        ).raise_for_status(),
+        rounds=1000,
+        warmup=100,
+    )